@@ -0,0 +1,163 @@
+"""
+Run EXPLAIN on the queries behind the main `/v1/sale` endpoints and fail if any of them reads `sale` sequentially.
+
+Sales are seeded inside a transaction which is rolled back at the end, so it is safe to run against any database:
+    python -m benchmarks.explain_sale_queries --rows 1000000
+
+Rollup reads and the statistic cache are disabled for the run, so every statistic hits the `sale` table itself.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+from fastapi_pagination import Params, set_params
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.seed import seed_sales, seed_scoped_user
+from mspy_vendi.config import config, log
+from mspy_vendi.core.enums.date_range import DailyTimePeriodEnum, DateRangeEnum, TimePeriodEnum
+from mspy_vendi.db import User
+from mspy_vendi.db.engine import engine, get_db_session
+from mspy_vendi.domain.sales.filters import ExportSaleFilter, SaleFilter
+from mspy_vendi.domain.sales.manager import SaleManager
+
+CHECKED_RELATION: str = "sale"
+
+
+@dataclass
+class ExecutedQuery:
+    statement: str
+    parameters: Any
+
+
+def _generate_filter(filter_class: type[SaleFilter] = SaleFilter, **kwargs: Any) -> SaleFilter:
+    return filter_class(date_from=datetime.now() - timedelta(days=30), date_to=datetime.now(), product=None, **kwargs)
+
+
+def _generate_calls(manager: SaleManager) -> dict[str, Callable[[User], Awaitable[Any]]]:
+    return {
+        "quantity-by-products": lambda user: manager.get_sales_quantity_by_product(_generate_filter(), user),
+        "quantity-per-range": lambda user: manager.get_sales_quantity_per_range(
+            DateRangeEnum.DAY, _generate_filter(), user
+        ),
+        "average-sales": lambda user: manager.get_average_sales_across_machines(_generate_filter(), user),
+        "average-sales-per-range": lambda user: manager.get_average_sales_per_range(
+            DateRangeEnum.DAY, _generate_filter(), user
+        ),
+        "quantity-per-product": lambda user: manager.get_sales_quantity_per_category(_generate_filter(), user),
+        "quantity-per-category": lambda user: manager.get_sales_category_quantity(_generate_filter(), user),
+        "sales-revenue-per-time-period": lambda user: manager.get_sales_revenue_per_time_period(
+            TimePeriodEnum, _generate_filter(), user
+        ),
+        "units-sold-per-range": lambda user: manager.get_units_sold_per_range(
+            DateRangeEnum.DAY, _generate_filter(), user
+        ),
+        "units-sold-statistic": lambda user: manager.get_units_sold_statistic(_generate_filter(), user),
+        "quantity-per-geography": lambda user: manager.get_sales_quantity_per_geography(_generate_filter(), user),
+        "frequency-of-sales": lambda user: manager.get_sales_count_per_time_period(
+            DailyTimePeriodEnum, _generate_filter(), user
+        ),
+        "sales-quantity-by-venue": lambda user: manager.get_sales_by_venue_over_time(_generate_filter(), user),
+        "sales-quantity-by-category": lambda user: manager.get_sales_quantity_by_category(_generate_filter(), user),
+        "average-products-per-geography": lambda user: manager.get_average_products_count_per_geography(
+            _generate_filter(), user
+        ),
+        "products-quantity-by-venue": lambda user: manager.get_products_quantity_by_venue(_generate_filter(), user),
+        "export-raw-data": lambda user: manager.export(_generate_filter(ExportSaleFilter), user, raw_result=False),
+    }
+
+
+def _find_sequential_scans(plan: dict[str, Any]) -> list[str]:
+    """
+    Walk the JSON plan and collect relations read by a sequential scan.
+    """
+    relations: list[str] = []
+
+    if plan.get("Node Type") == "Seq Scan":
+        relations.append(plan["Relation Name"])
+
+    for child in plan.get("Plans", []):
+        relations.extend(_find_sequential_scans(child))
+
+    return relations
+
+
+async def explain(session: AsyncSession, query: ExecutedQuery) -> list[str]:
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {query.statement}", query.parameters)
+    plan = result.scalar_one()
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return _find_sequential_scans(plan[0]["Plan"])
+
+
+async def main(rows: int) -> bool:
+    config.sale_rollup_enabled = False
+    config.statistic_cache_enabled = False
+    executed: list[ExecutedQuery] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            executed.append(ExecutedQuery(statement=statement, parameters=parameters))
+
+    failures: list[str] = []
+
+    async with get_db_session() as session:
+        seeded = await seed_sales(session, rows)
+        users: dict[str, User] = {
+            # Transient superuser: it is never persisted, only its flags are used by the manager.
+            "superuser": User(id=0, is_superuser=True),
+            "scoped-user": await seed_scoped_user(session, seeded),
+        }
+        await log.ainfo("Seeded sales", sales=seeded.sales)
+
+        manager = SaleManager(session)
+
+        with set_params(Params(page=1, size=100)):
+            for user_name, user in users.items():
+                for endpoint, call in _generate_calls(manager).items():
+                    executed.clear()
+
+                    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+                    try:
+                        await call(user)
+                    finally:
+                        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+                    sequential_scans = [
+                        query for query in executed if CHECKED_RELATION in await explain(session, query)
+                    ]
+
+                    for query in sequential_scans:
+                        await log.aerror(
+                            "Sequential scan detected", endpoint=endpoint, user=user_name, query=query.statement
+                        )
+
+                    if sequential_scans:
+                        failures.append(f"{endpoint} ({user_name})")
+                    else:
+                        await log.ainfo("Index access confirmed", endpoint=endpoint, user=user_name)
+
+        await session.rollback()
+
+    if failures:
+        await log.aerror("EXPLAIN check failed", endpoints=failures)
+
+    return not failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Count of sales to seed.")
+
+    args = parser.parse_args()
+
+    sys.exit(0 if asyncio.run(main(rows=args.rows)) else 1)
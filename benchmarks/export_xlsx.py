@@ -0,0 +1,139 @@
+"""
+Compare peak RSS and wall time of the XLSX sales export: DataFrame rendering (previous implementation) with the
+constant memory writer fed by partitions of a streamed result.
+
+Rows are generated in the shape of the sales export, so no database is required:
+    python -m benchmarks.export_xlsx --rows 500000
+
+Every implementation runs in a fresh process, so the peak RSS of one doesn't affect the other.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import resource
+import time
+from datetime import date, timedelta
+from datetime import time as dt_time
+from typing import Any, AsyncIterator, Callable, Iterator
+
+import pandas as pd
+
+from mspy_vendi.config import log
+from mspy_vendi.domain.data_extractor import ExcelDataExtractor, StreamingExcelDataExtractor
+
+COLUMNS: list[str] = [
+    "Sale ID",
+    "Source system name",
+    "Geography",
+    "Product sold",
+    "Product ID",
+    "Machine ID",
+    "Machine Name",
+    "Date",
+    "Time",
+]
+
+
+def _generate_rows(count: int) -> Iterator[tuple[Any, ...]]:
+    start_date = date.today() - timedelta(days=365)
+
+    for number in range(count):
+        yield (
+            number + 1,
+            "Nayax",
+            f"Geography {number % 50}",
+            f"Product {number % 500}",
+            number % 500 + 1,
+            number % 200 + 1,
+            f"Machine {number % 200}",
+            start_date + timedelta(days=number % 365),
+            dt_time(hour=number % 24, minute=number % 60, second=number % 60),
+        )
+
+
+class SyntheticResult:
+    """
+    The part of `AsyncResult` used by the streaming writer: the keys and lazily generated partitions.
+    """
+
+    def __init__(self, rows: int, chunk_size: int):
+        self.rows = rows
+        self.chunk_size = chunk_size
+
+    def keys(self) -> list[str]:
+        return COLUMNS
+
+    async def partitions(self) -> AsyncIterator[list[tuple[Any, ...]]]:
+        partition: list[tuple[Any, ...]] = []
+
+        for row in _generate_rows(self.rows):
+            partition.append(row)
+
+            if len(partition) == self.chunk_size:
+                yield partition
+                partition = []
+
+        if partition:
+            yield partition
+
+
+async def dataframe_export(rows: int, chunk_size: int) -> int:
+    """
+    Previous implementation: `.mappings().all()`, a DataFrame and `DataFrame.to_excel` into a `BytesIO`.
+    """
+    entity_data = [dict(zip(COLUMNS, row)) for row in _generate_rows(rows)]
+    content = await ExcelDataExtractor().extract(pd.DataFrame(entity_data))
+
+    return content.getbuffer().nbytes
+
+
+async def streaming_export(rows: int, chunk_size: int) -> int:
+    with await StreamingExcelDataExtractor().extract(SyntheticResult(rows, chunk_size)) as file:
+        return file.seek(0, 2)
+
+
+IMPLEMENTATIONS: dict[str, Callable[[int, int], Any]] = {
+    "dataframe": dataframe_export,
+    "streaming": streaming_export,
+}
+
+
+def _measure(name: str, rows: int, chunk_size: int, results: Any) -> None:
+    baseline_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started: float = time.perf_counter()
+
+    size: int = asyncio.run(IMPLEMENTATIONS[name](rows, chunk_size))
+
+    results.put(
+        {
+            "implementation": name,
+            "seconds": round(time.perf_counter() - started, 2),
+            # Linux reports `ru_maxrss` in kilobytes.
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "peak_rss_growth_mb": round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss) / 1024, 1),
+            "file_mb": round(size / 1024 / 1024, 1),
+        }
+    )
+
+
+def main(rows: int, chunk_size: int) -> None:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+
+    for name in IMPLEMENTATIONS:
+        process = context.Process(target=_measure, args=(name, rows, chunk_size, results))
+        process.start()
+        process.join()
+
+        log.info("Export measured", rows=rows, **results.get())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000, help="Count of exported rows.")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per partition of the streamed result.")
+
+    args = parser.parse_args()
+
+    main(rows=args.rows, chunk_size=args.chunk_size)
@@ -0,0 +1,103 @@
+"""
+Compare the time-of-day bucketing of sales in Python (previous implementation) with the SQL one.
+
+Sales are seeded inside a transaction which is rolled back at the end, so it is safe to run against any database:
+    python -m benchmarks.sale_time_period_bucketing --rows 1000000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.seed import seed_sales
+from mspy_vendi.config import config, log
+from mspy_vendi.core.enums.date_range import DailyTimePeriodEnum
+from mspy_vendi.db import Sale, User
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.sales.filters import SaleFilter
+from mspy_vendi.domain.sales.manager import SaleManager
+
+
+def _generate_filter() -> SaleFilter:
+    return SaleFilter(date_from=datetime.now() - timedelta(days=365), date_to=datetime.now(), product=None)
+
+
+async def python_bucketing(session: AsyncSession, user: User) -> list[dict[str, Any]]:
+    """
+    Previous implementation: fetch every sale time and bucket it in Python.
+    """
+    time_periods = {period.name: (period.start, period.end) for period in DailyTimePeriodEnum}
+
+    stmt = _generate_filter().filter(select(Sale.sale_time))
+    sale_times = [row.sale_time for row in (await session.execute(stmt)).fetchall()]
+
+    sales_by_period = {period: 0 for period in time_periods.keys()}
+
+    for sale_time in sale_times:
+        for period_name, (start, end) in time_periods.items():
+            if start <= sale_time <= end:
+                sales_by_period[period_name] += 1
+                break
+
+    return [{"time_period": period, "sales": count} for period, count in sales_by_period.items()]
+
+
+async def sql_bucketing(session: AsyncSession, user: User) -> list[dict[str, Any]]:
+    return await SaleManager(session).get_sales_count_per_time_period(DailyTimePeriodEnum, _generate_filter(), user)
+
+
+async def measure(
+    name: str,
+    func: Callable[[AsyncSession, User], Awaitable[list[dict[str, Any]]]],
+    session: AsyncSession,
+    user: User,
+    repeat: int,
+) -> None:
+    timings: list[float] = []
+    result: list[dict[str, Any]] = []
+
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = await func(session, user)
+        timings.append(time.perf_counter() - started_at)
+
+    await log.ainfo(
+        "Benchmark result",
+        implementation=name,
+        median_seconds=round(statistics.median(timings), 4),
+        min_seconds=round(min(timings), 4),
+        result=result,
+    )
+
+
+async def main(rows: int, repeat: int) -> None:
+    # Every run must hit the database.
+    config.statistic_cache_enabled = False
+
+    async with get_db_session() as session:
+        seeded = await seed_sales(session, rows)
+        await log.ainfo("Seeded sales", sales=seeded.sales)
+
+        # Transient superuser: it is never persisted, only its flags are used by the manager.
+        user = User(id=0, is_superuser=True)
+
+        await measure("python", python_bucketing, session, user, repeat)
+        await measure("sql", sql_bucketing, session, user, repeat)
+
+        await session.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Count of sales to seed.")
+    parser.add_argument("--repeat", type=int, default=5, help="Count of runs per implementation.")
+
+    args = parser.parse_args()
+
+    asyncio.run(main(rows=args.rows, repeat=args.repeat))
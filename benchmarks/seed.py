@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mspy_vendi.db import Geography, Machine, MachineUser, Product, ProductCategory, ProductUser, User
+
+BENCHMARK_SOURCE_SYSTEM: str = "Benchmark"
+
+
+@dataclass
+class SeededData:
+    geography_id: int
+    machine_ids: list[int]
+    product_ids: list[int]
+    sales: int
+
+
+async def seed_sales(
+    session: AsyncSession,
+    rows: int,
+    machines: int = 50,
+    products: int = 100,
+    days: int = 365,
+) -> SeededData:
+    """
+    Seed synthetic sales inside the current transaction.
+    Callers are expected to roll the transaction back, so the seeded data never becomes visible.
+
+    :param session: Database session.
+    :param rows: Count of sales to generate.
+    :param machines: Count of machines to spread the sales across.
+    :param products: Count of products to spread the sales across.
+    :param days: Count of days (back from today) to spread the sales across.
+
+    :return: Identifiers of the seeded entities.
+    """
+    geography = Geography(name=f"{BENCHMARK_SOURCE_SYSTEM} geography", postcode="BM1")
+    product_category = ProductCategory(name=f"{BENCHMARK_SOURCE_SYSTEM} category")
+    session.add_all([geography, product_category])
+    await session.flush()
+
+    machine_objects = [
+        Machine(name=f"{BENCHMARK_SOURCE_SYSTEM} machine {index}", geography_id=geography.id)
+        for index in range(machines)
+    ]
+    product_objects = [
+        Product(
+            name=f"{BENCHMARK_SOURCE_SYSTEM} product {index}",
+            price=1 + index % 10,
+            product_category_id=product_category.id,
+        )
+        for index in range(products)
+    ]
+    session.add_all([*machine_objects, *product_objects])
+    await session.flush()
+
+    machine_ids = [machine.id for machine in machine_objects]
+    product_ids = [product.id for product in product_objects]
+
+    # Sales are generated on the DB side, to not send millions of rows over the wire.
+    await session.execute(
+        text(
+            """
+            INSERT INTO sale (sale_date, sale_time, quantity, source_system, source_system_id, product_id, machine_id)
+            SELECT current_date - (g % :days),
+                   time '00:00' + make_interval(secs => (g::BIGINT * 7919) % 86400),
+                   1 + g % 3,
+                   :source_system,
+                   g,
+                   (CAST(:product_ids AS BIGINT[]))[1 + g % :products],
+                   (CAST(:machine_ids AS BIGINT[]))[1 + (g / 7) % :machines]
+            FROM generate_series(1, :rows) AS g
+            """
+        ),
+        {
+            "days": days,
+            "rows": rows,
+            "source_system": BENCHMARK_SOURCE_SYSTEM,
+            "product_ids": product_ids,
+            "machine_ids": machine_ids,
+            "products": products,
+            "machines": machines,
+        },
+    )
+
+    # Seeded machines and products are new, so their rollup rows can't clash with the existing ones.
+    await session.execute(
+        text(
+            """
+            INSERT INTO sale_daily_rollup (sale_date, machine_id, product_id, quantity, transactions_count, revenue)
+            SELECT sale.sale_date, sale.machine_id, sale.product_id, SUM(sale.quantity), COUNT(*),
+                   SUM(sale.quantity * product.price)
+            FROM sale
+            JOIN product ON product.id = sale.product_id
+            WHERE sale.machine_id = ANY(CAST(:machine_ids AS BIGINT[]))
+            GROUP BY sale.sale_date, sale.machine_id, sale.product_id
+            """
+        ),
+        {"machine_ids": machine_ids},
+    )
+    await session.execute(text("ANALYZE sale"))
+
+    return SeededData(geography_id=geography.id, machine_ids=machine_ids, product_ids=product_ids, sales=rows)
+
+
+async def seed_scoped_user(session: AsyncSession, seeded: SeededData, machines: int = 5, products: int = 20) -> User:
+    """
+    Seed a regular user with access to a subset of the seeded machines and products, inside the current transaction.
+
+    :param session: Database session.
+    :param seeded: Result of `seed_sales`.
+    :param machines: Count of seeded machines assigned to the user.
+    :param products: Count of seeded products assigned to the user.
+
+    :return: Seeded user.
+    """
+    user = User(
+        email=f"{BENCHMARK_SOURCE_SYSTEM.lower()}@example.com",
+        hashed_password="",
+        firstname=BENCHMARK_SOURCE_SYSTEM,
+        lastname=BENCHMARK_SOURCE_SYSTEM,
+    )
+    session.add(user)
+    await session.flush()
+
+    session.add_all(
+        [
+            *(MachineUser(machine_id=machine_id, user_id=user.id) for machine_id in seeded.machine_ids[:machines]),
+            *(ProductUser(product_id=product_id, user_id=user.id) for product_id in seeded.product_ids[:products]),
+        ]
+    )
+    await session.flush()
+    await session.execute(text("ANALYZE machine_user"))
+    await session.execute(text("ANALYZE product_user"))
+    await session.refresh(user, ["is_superuser"])
+
+    return user
@@ -1,15 +1,16 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, UploadFile, status
+from fastapi import APIRouter, Depends, Query, Request, UploadFile, status
 from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi_filter import FilterDepends
 
 from mspy_vendi.config import config
 from mspy_vendi.core.api import CRUDApi, basic_endpoints, basic_permissions
-from mspy_vendi.core.enums import ApiTagEnum, ExportTypeEnum
+from mspy_vendi.core.enums import ApiTagEnum, CRUDEnum, ExportTypeEnum, ImpressionDashboardWidgetEnum
 from mspy_vendi.core.enums.date_range import DateRangeEnum, ScheduleEnum
 from mspy_vendi.core.enums.export import ExportEntityTypeEnum
-from mspy_vendi.core.pagination import Page
+from mspy_vendi.core.pagination import CursorPage, Page
+from mspy_vendi.core.schemas import DashboardSchema, ExportJobSchema
 from mspy_vendi.deps import get_db_session
 from mspy_vendi.domain.auth import get_current_user
 from mspy_vendi.domain.impressions.filters import ExportImpressionFilter, GeographyFilter, ImpressionFilter
@@ -37,6 +38,17 @@ from mspy_vendi.domain.user.services import UserService
 router = APIRouter(prefix="/impression", default_response_class=ORJSONResponse, tags=[ApiTagEnum.IMPRESSIONS])
 
 
+@router.get("/dashboard", response_model=DashboardSchema)
+async def get__dashboard(
+    widgets: Annotated[list[ImpressionDashboardWidgetEnum], Query(min_length=1)],
+    query_filter: Annotated[ImpressionFilter, FilterDepends(ImpressionFilter)],
+    impression_service: Annotated[ImpressionService, Depends()],
+    user: Annotated[User, Depends(get_current_user())],
+    time_frame: DateRangeEnum = DateRangeEnum.DAY,
+) -> DashboardSchema:
+    return await impression_service.get_dashboard(widgets, query_filter, user, time_frame)
+
+
 @router.get("/impressions-per-range", response_model=Page[TimeFrameImpressionsSchema])
 async def get__impressions_per_range(
     time_frame: DateRangeEnum,
@@ -154,6 +166,49 @@ async def post__export_impressions(
     )
 
 
+@router.post("/export/jobs", response_model=ExportJobSchema, status_code=status.HTTP_202_ACCEPTED)
+async def post__export_impressions_job(
+    export_type: ExportTypeEnum,
+    query_filter: Annotated[ExportImpressionFilter, FilterDepends(ExportImpressionFilter)],
+    impression_service: Annotated[ImpressionService, Depends()],
+    user: Annotated[User, Depends(get_current_user())],
+) -> ExportJobSchema:
+    """
+    The same export as `POST /export`, processed by the worker.
+    Track the job with `GET /export/jobs/{job_id}`, its `download_url` is set once the file is ready.
+    """
+    return await impression_service.create_export_job(
+        query_filter, export_type, user, entity=ExportEntityTypeEnum.IMPRESSION
+    )
+
+
+@router.get("/export/jobs/{job_id}", response_model=ExportJobSchema)
+async def get__export_impressions_job(
+    job_id: str,
+    request: Request,
+    impression_service: Annotated[ImpressionService, Depends()],
+    user: Annotated[User, Depends(get_current_user())],
+) -> ExportJobSchema:
+    return await impression_service.get_export_job(
+        job_id,
+        user,
+        request.url_for("get__export_impressions_job_download", job_id=job_id),
+        entity=ExportEntityTypeEnum.IMPRESSION,
+    )
+
+
+@router.get("/export/jobs/{job_id}/download", response_class=Response)
+async def get__export_impressions_job_download(
+    job_id: str,
+    token: str,
+    impression_service: Annotated[ImpressionService, Depends()],
+) -> Response:
+    """
+    The link is issued by `GET /export/jobs/{job_id}` and expires shortly, so it's not authenticated otherwise.
+    """
+    return await impression_service.download_export_job(job_id, token, entity=ExportEntityTypeEnum.IMPRESSION)
+
+
 @router.get("/export-raw-data", response_model=Page[ExportImpressionDetailSchema])
 async def get__impressions_export_raw_data(
     query_filter: Annotated[ExportImpressionFilter, FilterDepends(ExportImpressionFilter)],
@@ -163,6 +218,20 @@ async def get__impressions_export_raw_data(
     return await impression_service.get_export_data(query_filter, user)
 
 
+@router.get("/export-raw-data/cursor", response_model=CursorPage[ExportImpressionDetailSchema])
+async def get__impressions_export_raw_data_cursor(
+    query_filter: Annotated[ExportImpressionFilter, FilterDepends(ExportImpressionFilter)],
+    impression_service: Annotated[ImpressionService, Depends()],
+    user: Annotated[User, Depends(get_current_user())],
+) -> CursorPage[ExportImpressionDetailSchema]:
+    """
+    The same data as `/export-raw-data`, paginated by the `next_page` cursor of the previous response.
+    The cost of a page doesn't depend on its depth, the total count isn't calculated.
+    Only one `order_by` field is supported.
+    """
+    return await impression_service.get_export_data(query_filter, user)
+
+
 @router.post("/schedule", response_class=StreamingResponse)
 async def post__schedule_impressions(
     export_type: ExportTypeEnum,
@@ -220,7 +289,7 @@ class ImpressionAPI(CRUDApi):
     schema = ImpressionDetailSchema
     create_schema = ImpressionCreateSchema
     current_user_mapping = basic_permissions
-    endpoints = basic_endpoints
+    endpoints = (*basic_endpoints, CRUDEnum.CURSOR_LIST)
     get_db_session = Depends(get_db_session)
     pagination_schema = Page
     api_tags = (ApiTagEnum.IMPRESSIONS,)
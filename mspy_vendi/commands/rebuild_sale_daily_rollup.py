@@ -0,0 +1,29 @@
+import argparse
+import asyncio
+from datetime import date
+
+from mspy_vendi.config import log
+from mspy_vendi.core.cache import bump_data_version
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.sales.manager import SaleDailyRollupManager
+
+
+async def main(date_from: date | None = None, date_to: date | None = None) -> None:
+    await log.ainfo("Starting rebuild of the daily sales rollup", date_from=date_from, date_to=date_to)
+
+    async with get_db_session() as session:
+        rebuilt_rows: int = await SaleDailyRollupManager(session).rebuild(date_from=date_from, date_to=date_to)
+
+    await bump_data_version()
+
+    await log.ainfo("Daily sales rollup has been rebuilt", rebuilt_rows=rebuilt_rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild `sale_daily_rollup` from the `sale` table.")
+    parser.add_argument("--date-from", type=date.fromisoformat, default=None, help="First sale date, YYYY-MM-DD.")
+    parser.add_argument("--date-to", type=date.fromisoformat, default=None, help="Last sale date, YYYY-MM-DD.")
+
+    args = parser.parse_args()
+
+    asyncio.run(main(date_from=args.date_from, date_to=args.date_to))
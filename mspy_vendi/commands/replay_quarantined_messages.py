@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+
+from mspy_vendi.config import config, log
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.quarantined_message.manager import QuarantinedMessageManager
+from mspy_vendi.domain.quarantined_message.models import QuarantinedMessage
+from mspy_vendi.domain.sqs.manager import SQSManager
+
+
+async def main(message_ids: list[int] | None = None) -> None:
+    await log.ainfo("Starting replay of the quarantined messages", message_ids=message_ids)
+
+    async with get_db_session() as session:
+        manager = QuarantinedMessageManager(session)
+        messages: list[QuarantinedMessage] = await manager.get_pending(message_ids)
+
+        queues: dict[str, SQSManager] = {}
+        replayed: int = 0
+
+        for message in messages:
+            try:
+                if message.queue_name not in queues:
+                    queues[message.queue_name] = SQSManager(
+                        message.queue_name, endpoint_url=config.sqs.endpoint_url, logger=log
+                    )
+
+                # The message is sent as a new one, so it's retried `max_attempts` times again.
+                if not await asyncio.to_thread(queues[message.queue_name].send_message, message.body):
+                    continue
+
+            except Exception as exc:
+                await log.aerror("Failed to replay the quarantined message", message_id=message.id, exception=str(exc))
+                continue
+
+            # Marked right after the send, so the message isn't sent again if the command fails later.
+            await manager.mark_replayed([message.id])
+            replayed += 1
+
+    await log.ainfo("Quarantined messages have been replayed", replayed=replayed, failed=len(messages) - replayed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send the quarantined messages back to their SQS queues.")
+    parser.add_argument(
+        "--id", dest="message_ids", type=int, action="append", default=None, help="ID of the message, all by default."
+    )
+
+    args = parser.parse_args()
+
+    asyncio.run(main(message_ids=args.message_ids))
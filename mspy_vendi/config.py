@@ -1,9 +1,9 @@
 import os
 from functools import lru_cache
-from typing import Literal
+from typing import Literal, Self
 from urllib.parse import quote_plus
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings as PydanticBaseSettings
 from pydantic_settings import SettingsConfigDict
 
@@ -36,6 +36,22 @@ class RedisSettings(BaseSettings):
 
     schedule_queue_name: str = "vendi-schedule-queue"
 
+    entitlement_cache_ttl: int = 60 * 60  # 1 hour in seconds
+
+    statistic_cache_ttl: int = 5 * 60  # 5 minutes in seconds
+    statistic_cache_lock_timeout: float = 10.0  # in seconds
+    statistic_cache_poll_interval: float = 0.05  # in seconds
+
+    export_job_ttl: int = 24 * 60 * 60  # 1 day in seconds, the state of the job only
+    export_download_link_ttl: int = 5 * 60  # 5 minutes in seconds
+    export_file_chunk_size: int = 1024 * 1024  # 1 MiB per Redis value
+    # The files share the Redis of the task broker, so they're limited and kept only until they're downloaded.
+    export_file_ttl: int = 15 * 60  # 15 minutes in seconds
+    export_file_max_size: int = 50 * 1024 * 1024  # 50 MiB, larger exports fail
+
+    scheduled_report_ttl: int = 60 * 60  # 1 hour in seconds
+    scheduled_report_lock_timeout: float = 10 * 60  # in seconds
+
     ssl_cert_reqs: str | None = None
 
     @property
@@ -61,6 +77,10 @@ class DBSettings(BaseSettings):
     pool_size: int = 60
     max_overflow: int = 20
 
+    dashboard_concurrency: int = 4  # Widgets of one dashboard request computed at the same time, a connection each
+    export_chunk_size: int = 5000  # Rows fetched from the server-side cursor at once by streaming exports
+    import_chunk_size: int = 1000  # Rows written by one multi-row statement of the file imports
+
     @property
     def db_url(self) -> str:
         return f"postgresql+asyncpg://{self.user}:{quote_plus(self.password)}@{self.host}:{self.port}/{self.name}"
@@ -74,10 +94,33 @@ class SQSSettings(BaseSettings):
     access_key: str = str()
 
     queue_name: str = "VendiTech_Nayax_Integration"
+    endpoint_url: str | None = None  # SQS compatible service instead of AWS, e.g. ElasticMQ for local runs
     max_number_of_messages: int = 10
     visibility_timeout: int = 60 * 60  # 1 hour
     long_poll_time: int = 20
-    auto_ack: bool = False
+    auto_ack: bool = False  # Delete failed messages as well, processed messages are always deleted
+    max_in_flight: int | None = None  # Messages processed at the same time, a DB session each. SQS_WORKERS if not set
+    batch_mode: bool = False  # One transaction per receive call, set max_in_flight to max_number_of_messages or more
+    metrics_interval: int = 60  # Consumer metrics are logged every N seconds
+    dlq_enabled: bool = False  # The queue has a redrive policy, messages are left to it instead of the quarantine
+    max_attempts: int = 5  # Failed messages are quarantined after N receives
+    retry_base_delay: int = 30  # Seconds before the first retry, doubled on every next one
+    retry_max_delay: int = 15 * 60  # 15 minutes
+    workers: int = 1  # Workers the messages are partitioned between by machine, each processes one message at a time
+    pool_size: int | None = None  # DB connections shared by all workers of the consumer, DATABASE_POOL_SIZE if not set
+
+    @model_validator(mode="after")
+    def validate_max_in_flight(self) -> Self:
+        """
+        Every worker processes one message at a time, so fewer messages in flight than workers leave some of them idle.
+        """
+        if self.max_in_flight is None:
+            self.max_in_flight = self.workers
+
+        elif self.max_in_flight < self.workers:
+            raise ValueError(f"max_in_flight ({self.max_in_flight}) must not be less than workers ({self.workers})")
+
+        return self
 
 
 class WebSettings(BaseSettings):
@@ -195,6 +238,16 @@ class Settings(BaseSettings):
     token_lifetime: int = 3600  # 1 hour in seconds
 
     nayax_consumer_enabled: bool = True
+    # Geographies, machines, product categories and products cached by every Nayax consumer process, 0 disables it
+    nayax_entity_cache_size: int = 10_000
+    nayax_entity_cache_ttl: int = 10 * 60  # 10 minutes in seconds
+
+    sale_rollup_enabled: bool = True  # Read day-or-coarser sale statistics from `sale_daily_rollup`
+
+    statistic_cache_enabled: bool = True  # Cache results of the statistic endpoints in Redis
+
+    render_process_pool_size: int = 2  # Processes rendering and parsing export/import files
+    render_concurrency: int = 2  # Files rendered or parsed at the same time by one server or worker process
 
     email_sender: str = "no-reply@vendi.com"
 
@@ -2,16 +2,29 @@ import asyncio
 
 from mspy_vendi.config import config
 from mspy_vendi.core.sentry import setup_sentry
+from mspy_vendi.db.engine import configure_pool
 from mspy_vendi.domain.sqs.consumer import SQSConsumer
 
 
 async def main():
+    if config.sqs.pool_size:
+        configure_pool(config.sqs.pool_size, config.db.max_overflow)
+
     sqs_consumer = SQSConsumer(
         sqs_queue_name=config.sqs.queue_name,
         sqs_max_number_of_messages=config.sqs.max_number_of_messages,
         sqs_visibility_timeout=config.sqs.visibility_timeout,
         sqs_long_poll_time=config.sqs.long_poll_time,
+        sqs_dlq_enabled=config.sqs.dlq_enabled,
         sqs_auto_ack=config.sqs.auto_ack,
+        sqs_endpoint_url=config.sqs.endpoint_url,
+        max_in_flight=config.sqs.max_in_flight,
+        batch_mode=config.sqs.batch_mode,
+        metrics_interval=config.sqs.metrics_interval,
+        max_attempts=config.sqs.max_attempts,
+        retry_base_delay=config.sqs.retry_base_delay,
+        retry_max_delay=config.sqs.retry_max_delay,
+        workers=config.sqs.workers,
         is_enabled=config.nayax_consumer_enabled,
     )
 
@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from mspy_vendi.core.enums import ApiTagEnum, CRUDEnum
-from mspy_vendi.core.pagination import Page
+from mspy_vendi.core.pagination import CursorPage, Page
 from mspy_vendi.core.service import CRUDService
 from mspy_vendi.db import User
 from mspy_vendi.domain.auth import get_current_user
@@ -30,6 +30,7 @@ basic_permissions: dict[CRUDEnum, Callable] = {
     CRUDEnum.DELETE: Depends(get_current_user(is_superuser=True)),
     CRUDEnum.GET: Depends(get_current_user(permissions=[PermissionEnum.READ])),
     CRUDEnum.LIST: Depends(get_current_user(permissions=[PermissionEnum.READ])),
+    CRUDEnum.CURSOR_LIST: Depends(get_current_user(permissions=[PermissionEnum.READ])),
 }
 
 admin_permissions: dict[CRUDEnum, Callable] = {
@@ -38,6 +39,7 @@ admin_permissions: dict[CRUDEnum, Callable] = {
     CRUDEnum.DELETE: Depends(get_current_user(is_superuser=True)),
     CRUDEnum.GET: Depends(get_current_user(is_superuser=True)),
     CRUDEnum.LIST: Depends(get_current_user(is_superuser=True)),
+    CRUDEnum.CURSOR_LIST: Depends(get_current_user(is_superuser=True)),
 }
 
 basic_endpoints = (CRUDEnum.CREATE, CRUDEnum.UPDATE, CRUDEnum.DELETE, CRUDEnum.GET, CRUDEnum.LIST)
@@ -79,6 +81,9 @@ class CRUDApi(
     pagination_schema: PageSchema
     "The schema used for pagination responses."
 
+    cursor_pagination_schema: PageSchema = CursorPage
+    "The schema used for cursor pagination responses of the `CURSOR_LIST` operation."
+
     api_tags: list[ApiTagEnum] = []
     "List of tags for API documentation. Defaults to an empty list."
 
@@ -127,6 +132,19 @@ class CRUDApi(
                 include_in_schema=CRUDEnum.LIST not in self.exclude_from_schema,
             )
 
+        if CRUDEnum.CURSOR_LIST in self.endpoints:
+            self._fix_method_signature(method_name="cursor_list", crud_method=CRUDEnum.CURSOR_LIST)
+            self.api_router.add_api_route(
+                "/cursor",
+                self.cursor_list,
+                methods=["GET"],
+                response_model=self.cursor_pagination_schema[self.schema],
+                summary="Get all objects with cursor pagination",
+                tags=self.api_tags,
+                description=self.cursor_list.__doc__,
+                include_in_schema=CRUDEnum.CURSOR_LIST not in self.exclude_from_schema,
+            )
+
         if CRUDEnum.GET in self.endpoints:
             self._fix_method_signature(method_name="get", crud_method=CRUDEnum.GET)
             self.api_router.add_api_route(
@@ -239,6 +257,14 @@ class CRUDApi(
 
         return await self.service(db_session).get_all(query_filter, user=user)
 
+    async def cursor_list(self, db_session: AsyncSession, query_filter: FilterClass, user: User) -> CursorPage[Schema]:
+        """
+        Get all objects page by page using the `next_page` cursor of the previous response.
+        The cost of a page doesn't depend on its depth, the total count isn't calculated.
+        """
+
+        return await self.service(db_session).get_all(query_filter, user=user)
+
     async def get(self, db_session: AsyncSession, user: User, **path_param: Any) -> Schema:
         """
         Get a single object
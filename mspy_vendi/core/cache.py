@@ -0,0 +1,352 @@
+__all__ = [
+    "redis_client",
+    "binary_redis_client",
+    "cached_statistic",
+    "bump_data_version",
+    "bump_entity_version",
+    "get_entity_version",
+    "LocalCache",
+    "compute_shared_value",
+    "generate_scoped_key",
+]
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+from fastapi_pagination.api import resolve_params
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from redis.asyncio import Redis
+from redis.asyncio.lock import Lock
+from redis.exceptions import LockNotOwnedError, RedisError
+
+from mspy_vendi.config import config, log
+
+# Shared client for application-level caches. The connection pool is created lazily on the first command.
+redis_client: Redis = Redis.from_url(config.redis.url, decode_responses=True)
+# Client for binary values, e.g. files of the export jobs.
+binary_redis_client: Redis = Redis.from_url(config.redis.url)
+
+ReturnType = TypeVar("ReturnType")
+Key = TypeVar("Key", bound=Hashable)
+Value = TypeVar("Value")
+
+DATA_VERSION_KEY: str = "statistic:data-version"
+ENTITY_VERSION_KEY: str = "entity:version"
+STATISTIC_KEY_TEMPLATE: str = "statistic:{version}:{name}:{scope}:{arguments}"
+
+
+async def bump_data_version() -> None:
+    """
+    Invalidate every cached statistic.
+    It must be called by the ingestion paths after new data is committed.
+    """
+    try:
+        await redis_client.incr(DATA_VERSION_KEY)
+
+    except RedisError as exc:
+        log.error("Failed to bump the statistic data version", exception=str(exc))
+
+
+async def bump_entity_version() -> int | None:
+    """
+    Invalidate the in-process caches of machines, geographies, product categories and products, see `LocalCache`.
+    It must be called after these entities are edited and the changes are committed.
+
+    :return: The new version, or None if it's unknown.
+    """
+    try:
+        return await redis_client.incr(ENTITY_VERSION_KEY)
+
+    except RedisError as exc:
+        log.error("Failed to bump the entity version", exception=str(exc))
+        return None
+
+
+async def get_entity_version() -> str | None:
+    """
+    Get the current version of the machines, geographies, product categories and products.
+
+    :return: The version, or None if it's unknown, i.e. the cached entities can't be trusted.
+    """
+    try:
+        return await redis_client.get(ENTITY_VERSION_KEY) or "0"
+
+    except RedisError as exc:
+        log.warning("Failed to get the entity version", exception=str(exc))
+        return None
+
+
+class LocalCache(Generic[Key, Value]):
+    """
+    Bounded in-process cache: the least recently used value is evicted when the cache is full,
+    and every value expires `ttl` seconds after it's stored.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._values: OrderedDict[Key, tuple[float, Value]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: Key) -> Value | None:
+        """
+        Get the value and mark it as recently used.
+
+        :param key: Key of the value.
+
+        :return: The value, or None if it's missing or expired.
+        """
+        if (item := self._values.get(key)) is None:
+            return None
+
+        expires_at, value = item
+
+        if expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+
+        self._values.move_to_end(key)
+
+        return value
+
+    def set(self, key: Key, value: Value) -> None:
+        """
+        Store the value, evicting the least recently used one if the cache is full.
+
+        :param key: Key of the value.
+        :param value: The value.
+        """
+        if self.max_size <= 0:
+            return
+
+        self._values[key] = (time.monotonic() + self.ttl, value)
+        self._values.move_to_end(key)
+
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+def _normalize(value: Any) -> Any:
+    """
+    Convert an argument of a statistic method into a JSON-compatible value, independent of the order of IN filters.
+    """
+    if isinstance(value, BaseModel):
+        return {
+            field: sorted(field_value) if field.endswith("__in") and field_value else _normalize(field_value)
+            for field, field_value in value.model_dump(mode="json").items()
+        }
+
+    if isinstance(value, Enum):
+        return value.value
+
+    if isinstance(value, type):
+        return value.__name__
+
+    return value
+
+
+async def _generate_scope(manager: Any, user: Any) -> str:
+    """
+    Generate the part of the key describing which data the user can see.
+    Users with the same entitlement share cached results.
+    """
+    if user.is_superuser:
+        return "all"
+
+    entitlement = await manager.entitlement_manager.get_user_entitlement(user)
+
+    return hashlib.sha256(
+        json.dumps([sorted(entitlement.machine_ids), sorted(entitlement.product_ids)]).encode()
+    ).hexdigest()
+
+
+def _generate_arguments_hash(arguments: dict[str, Any]) -> str:
+    try:
+        # Paginated statistics depend on the requested page as well.
+        arguments["pagination"] = resolve_params().model_dump(mode="json")
+
+    except RuntimeError:
+        pass
+
+    return hashlib.sha256(json.dumps(arguments, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _create_lock(client: Redis, key: str, timeout: float) -> Lock:
+    """
+    Create the lock of the computation of the key's value, it expires after `timeout` seconds.
+    The lock holds a unique token and is released only while the token matches, so a lock which has expired
+    during a long computation and has been taken by another caller isn't released by the first one.
+    """
+    return client.lock(f"{key}:lock", timeout=timeout, blocking=False, thread_local=False)
+
+
+async def _release_lock(lock: Lock) -> None:
+    try:
+        await lock.release()
+
+    except LockNotOwnedError:
+        log.warning("The lock has expired before the value was computed", key=lock.name)
+
+    except RedisError:
+        pass
+
+
+async def _wait_for_value(key: str, client: Redis = redis_client, timeout: float | None = None) -> Any:
+    """
+    Wait for the value computed by the process holding the lock of the key.
+    """
+    deadline: float = time.monotonic() + (timeout or config.redis.statistic_cache_lock_timeout)
+
+    while time.monotonic() < deadline:
+        if (value := await client.get(key)) is not None:
+            return value
+
+        await asyncio.sleep(config.redis.statistic_cache_poll_interval)
+
+    return None
+
+
+def cached_statistic(
+    func: Callable[..., Awaitable[ReturnType]],
+) -> Callable[..., Awaitable[ReturnType]]:
+    """
+    Cache the result of a manager statistic method in Redis.
+
+    The key consists of the current data version, the method name, the entitlement scope of the `user` argument
+    and the normalized remaining arguments (filter, time frame, pagination params).
+    Ingestion paths call `bump_data_version`, so results computed before new data arrived are never read again.
+
+    To protect the database from a cache stampede, only the request holding the lock of the key computes the result,
+    concurrent requests wait for it to appear.
+    The result is (de)serialized with the return annotation of the method.
+    If Redis is unavailable, the method is called directly.
+    """
+    signature: inspect.Signature = inspect.signature(func)
+    adapter: TypeAdapter = TypeAdapter(signature.return_annotation)
+
+    @functools.wraps(func)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> ReturnType:
+        if not config.statistic_cache_enabled:
+            return await func(self, *args, **kwargs)
+
+        arguments: dict[str, Any] = signature.bind(self, *args, **kwargs).arguments
+        arguments.pop("self")
+        user = arguments.pop("user")
+
+        try:
+            key: str = STATISTIC_KEY_TEMPLATE.format(
+                version=await redis_client.get(DATA_VERSION_KEY) or 0,
+                name=f"{type(self).__name__}.{func.__name__}",
+                scope=await _generate_scope(self, user),
+                arguments=_generate_arguments_hash({name: _normalize(value) for name, value in arguments.items()}),
+            )
+
+            if (cached_value := await redis_client.get(key)) is not None:
+                return adapter.validate_json(cached_value)
+
+            lock: Lock = _create_lock(redis_client, key, config.redis.statistic_cache_lock_timeout)
+
+            if not await lock.acquire():
+                if (cached_value := await _wait_for_value(key)) is not None:
+                    return adapter.validate_json(cached_value)
+
+                return await func(self, *args, **kwargs)
+
+        except RedisError as exc:
+            log.warning("Statistic cache is unavailable", method=func.__name__, exception=str(exc))
+            return await func(self, *args, **kwargs)
+
+        try:
+            result: ReturnType = await func(self, *args, **kwargs)
+
+            try:
+                value: bytes = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+                await redis_client.set(key, value, ex=config.redis.statistic_cache_ttl)
+
+            except (RedisError, ValidationError) as exc:
+                log.warning("Failed to cache the statistic", method=func.__name__, exception=str(exc))
+
+            return result
+
+        finally:
+            await _release_lock(lock)
+
+    return wrapper
+
+
+async def generate_scoped_key(name: str, manager: Any, user: Any, **arguments: Any) -> str:
+    """
+    Generate the key of a value shared by the users with the same entitlement.
+
+    :param name: Name of the value.
+    :param manager: Manager with the `entitlement_manager`.
+    :param user: User the value is computed for.
+    :param arguments: Arguments the value depends on, filters are normalized like in `cached_statistic`.
+
+    :return: The key.
+    """
+    arguments_hash: str = hashlib.sha256(
+        json.dumps({key: _normalize(value) for key, value in arguments.items()}, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+    return f"{name}:{await _generate_scope(manager, user)}:{arguments_hash}"
+
+
+async def compute_shared_value(
+    key: str, compute: Callable[[], Awaitable[bytes]], ttl: int, lock_timeout: float
+) -> bytes:
+    """
+    Compute the binary value once for all callers using the same key and share it for `ttl` seconds.
+
+    The same locking as `cached_statistic` uses: only the caller holding the lock of the key computes the value,
+    concurrent callers wait for it to appear. If the value doesn't appear within `lock_timeout` or Redis is
+    unavailable, the value is computed by the caller itself.
+
+    :param key: Key of the value.
+    :param compute: Function computing the value.
+    :param ttl: Lifetime of the value in seconds.
+    :param lock_timeout: Maximum time of the computation in seconds.
+
+    :return: The value.
+    """
+    lock: Lock = _create_lock(binary_redis_client, key, lock_timeout)
+
+    try:
+        if (value := await binary_redis_client.get(key)) is not None:
+            return value
+
+        if not await lock.acquire():
+            if (value := await _wait_for_value(key, binary_redis_client, lock_timeout)) is not None:
+                return value
+
+            return await compute()
+
+    except RedisError as exc:
+        log.warning("Shared value storage is unavailable", key=key, exception=str(exc))
+        return await compute()
+
+    try:
+        value = await compute()
+
+        try:
+            await binary_redis_client.set(key, value, ex=ttl)
+
+        except RedisError as exc:
+            log.warning("Failed to share the value", key=key, exception=str(exc))
+
+        return value
+
+    finally:
+        await _release_lock(lock)
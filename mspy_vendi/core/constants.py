@@ -5,6 +5,7 @@ from mspy_vendi.core.enums.date_range import ScheduleEnum
 
 MAX_NUMBER_OF_CHARACTERS: int = 100
 DEFAULT_SOURCE_SYSTEM: str = "Nayax"
+CSV_SOURCE_SYSTEM: str = "CSV"
 
 # DataJam API constants
 DEFAULT_PROJECT_NAME: str = "Vendi Tech"
@@ -38,6 +39,16 @@ DEFAULT_SCHEDULE_TIMEDELTA: dict[ScheduleEnum, timedelta] = {
     ScheduleEnum.ANNUALLY: timedelta(days=365),  # 1 year (ignoring leap years for simplicity)
 }
 
+# Scheduled exports of one cron tick may run minutes apart, so their windows are aligned to the tick.
+# It allows computing the report once for all users with the same filter and entitlement.
+DEFAULT_SCHEDULE_RESOLUTION: dict[ScheduleEnum, timedelta] = {
+    ScheduleEnum.MINUTELY: timedelta(minutes=1),
+    ScheduleEnum.MONTHLY: timedelta(hours=1),
+    ScheduleEnum.QUARTERLY: timedelta(hours=1),
+    ScheduleEnum.BI_ANNUALLY: timedelta(hours=1),
+    ScheduleEnum.ANNUALLY: timedelta(hours=1),
+}
+
 DEFAULT_EXPORT_TYPES: dict[ExportTypeEnum, dict] = {
     ExportTypeEnum.CSV: {"file_type": "text/csv", "file_extension": "csv"},
     ExportTypeEnum.EXCEL: {
@@ -1,7 +1,9 @@
+from .dashboard import ImpressionDashboardWidgetEnum, SaleDashboardWidgetEnum
+from .data_import import ImportSkipReasonEnum
 from .date_range import DailyTimePeriodEnum, DateRangeEnum, ScheduleEnum, TimePeriodEnum
 from .db import PGErrorCodeEnum
 from .environment import AppEnvEnum
-from .export import ExportEntityTypeEnum, ExportTypeEnum
+from .export import ExportEntityTypeEnum, ExportJobStatusEnum, ExportTypeEnum
 from .request_method import RequestMethodEnum
 from .status import CRUDEnum, HealthCheckStatusEnum
 from .tags import ApiTagEnum
@@ -12,11 +14,15 @@ __all__ = (
     "CRUDEnum",
     "ExportTypeEnum",
     "ExportEntityTypeEnum",
+    "ExportJobStatusEnum",
     "HealthCheckStatusEnum",
+    "ImportSkipReasonEnum",
     "PGErrorCodeEnum",
     "RequestMethodEnum",
     "TimePeriodEnum",
     "DateRangeEnum",
     "DailyTimePeriodEnum",
     "ScheduleEnum",
+    "SaleDashboardWidgetEnum",
+    "ImpressionDashboardWidgetEnum",
 )
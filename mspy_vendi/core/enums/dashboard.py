@@ -0,0 +1,33 @@
+from enum import StrEnum
+
+
+class SaleDashboardWidgetEnum(StrEnum):
+    QUANTITY_BY_PRODUCTS = "quantity-by-products"
+    QUANTITY_PER_RANGE = "quantity-per-range"
+    AVERAGE_SALES = "average-sales"
+    AVERAGE_SALES_PER_RANGE = "average-sales-per-range"
+    QUANTITY_PER_PRODUCT = "quantity-per-product"
+    QUANTITY_PER_CATEGORY = "quantity-per-category"
+    SALES_REVENUE_PER_TIME_PERIOD = "sales-revenue-per-time-period"
+    UNITS_SOLD_PER_RANGE = "units-sold-per-range"
+    UNITS_SOLD_STATISTIC = "units-sold-statistic"
+    QUANTITY_PER_GEOGRAPHY = "quantity-per-geography"
+    CONVERSION_RATE = "conversion-rate"
+    FREQUENCY_OF_SALES = "frequency-of-sales"
+    SALES_QUANTITY_BY_VENUE = "sales-quantity-by-venue"
+    SALES_QUANTITY_BY_CATEGORY = "sales-quantity-by-category"
+    AVERAGE_PRODUCTS_PER_GEOGRAPHY = "average-products-per-geography"
+    PRODUCTS_QUANTITY_BY_VENUE = "products-quantity-by-venue"
+
+
+class ImpressionDashboardWidgetEnum(StrEnum):
+    IMPRESSIONS_PER_RANGE = "impressions-per-range"
+    IMPRESSIONS_PER_GEOGRAPHY = "impressions-per-geography"
+    EXPOSURE = "exposure"
+    EXPOSURE_PER_RANGE = "exposure-per-range"
+    AVERAGE_IMPRESSIONS = "average-impressions"
+    ADVERT_PLAYOUTS_PER_RANGE = "advert-playouts-per-range"
+    ADVERT_PLAYOUTS = "advert-playouts"
+    AVERAGE_EXPOSURE = "average-exposure"
+    IMPRESSIONS_BY_VENUE_PER_RANGE = "impressions-by-venue-per-range"
+    MONTH_ON_MONTH_SUMMARY = "month-on-month-summary"
@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class ImportSkipReasonEnum(StrEnum):
+    INVALID = "invalid"
+    UNKNOWN_MACHINE = "unknown_machine"
+    UNKNOWN_PRODUCT = "unknown_product"
+    DUPLICATE = "duplicate"
@@ -10,3 +10,11 @@ class ExportEntityTypeEnum(StrEnum):
     ACTIVITY_LOG = "activity_log"
     SALE = "sale"
     IMPRESSION = "impression"
+
+
+class ExportJobStatusEnum(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    EXPIRED = "expired"
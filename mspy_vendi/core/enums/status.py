@@ -13,6 +13,7 @@ class CRUDEnum(IntEnum):
     LIST = 2
     UPDATE = 3
     DELETE = 4
+    CURSOR_LIST = 5
 
 
 class HealthCheckStatusEnum(StrEnum):
@@ -1,6 +1,13 @@
 from mspy_vendi.core.enums import ExportTypeEnum
 from mspy_vendi.core.exceptions.base_exception import BadRequestError
-from mspy_vendi.domain.data_extractor import BaseDataExtractorClient, CSVDataExtractor, ExcelDataExtractor
+from mspy_vendi.domain.data_extractor import (
+    BaseDataExtractorClient,
+    BaseStreamingDataExtractorClient,
+    CSVDataExtractor,
+    ExcelDataExtractor,
+    StreamingCSVDataExtractor,
+    StreamingExcelDataExtractor,
+)
 
 
 class DataExportFactory:
@@ -15,3 +22,15 @@ class DataExportFactory:
 
             case _:
                 raise BadRequestError(f"Provided {file_type=} didn't acceptable yet.")
+
+    @staticmethod
+    def stream(file_type: ExportTypeEnum) -> BaseStreamingDataExtractorClient:
+        match file_type:
+            case ExportTypeEnum.CSV:
+                return StreamingCSVDataExtractor()
+
+            case ExportTypeEnum.EXCEL:
+                return StreamingExcelDataExtractor()
+
+            case _:
+                raise BadRequestError(f"Provided {file_type=} didn't acceptable yet.")
@@ -1,6 +1,6 @@
 from collections import defaultdict
 from datetime import date, datetime, timedelta
-from typing import Any, cast
+from typing import Any, Iterable, cast
 
 from fastapi import Query as QueryParameter
 from fastapi_filter.contrib.sqlalchemy import Filter
@@ -223,7 +223,7 @@ class BaseFilter(Filter, extra="allow"):  # type: ignore
 
         return field_names
 
-    def filter(self, query: Query | Select, autojoin: bool = True):
+    def filter(self, query: Query | Select, autojoin: bool = True, exclude_fields: Iterable[str] | None = None):
         """
         NOTE: The most part of the code is copied from the original implementation.
         The difference is as follows:
@@ -231,16 +231,22 @@ class BaseFilter(Filter, extra="allow"):  # type: ignore
             - implementation of nested filter logic.
             - ability to filter by date (if `datetime` annotation).
             - implementation of compound search logic.
+            - ability to skip fields which are already applied by the caller.
 
         That's why, be careful when updating current implementation.
 
         :param query: Query object or actual SQL query.
         :param autojoin: Flag which specifies if we need to do implicit join, pass False if you have a complex query
                          with joins on your side.
+        :param exclude_fields: Fields to skip without modifying the filter object.
+                               The date range is skipped if all date range fields are excluded.
 
         :return: Implicitly modified query object which we executed in the caller function.
         """
-        if (range_fields := self.Constants.date_range_fields) and self.filtering_fields:
+        exclude_fields = set(exclude_fields or [])
+        range_fields = self.Constants.date_range_fields
+
+        if range_fields and self.filtering_fields and not exclude_fields.issuperset(range_fields):
             date_from_field, date_to_field = range_fields
 
             date_from: datetime = getattr(self, date_from_field) or datetime.min
@@ -252,7 +258,9 @@ class BaseFilter(Filter, extra="allow"):  # type: ignore
 
         # We get rid of range fields, because we've been already construct the query above
         filtering_fields_without_range_fields: list[tuple[str, Any]] = [
-            (key, value) for key, value in self.filtering_fields if key not in (range_fields or [])
+            (key, value)
+            for key, value in self.filtering_fields
+            if key not in (range_fields or []) and key not in exclude_fields
         ]
 
         for field_name, value in filtering_fields_without_range_fields:
@@ -1,17 +1,22 @@
 from .case_helpers import to_title_case
 from .db_helpers import get_columns_for_model, is_join_present, pascal_to_snake
 from .env_helpers import boolify
+from .excel_helpers import iter_excel_rows, read_excel_batches
 from .logging_helpers import get_described_user_info
 from .password_helpers import generate_random_password
-from .time_helpers import set_end_of_day_time
+from .time_helpers import get_previous_month_range, set_end_of_day_time, truncate_datetime
 
 __all__ = [
     "pascal_to_snake",
     "is_join_present",
     "get_columns_for_model",
     "set_end_of_day_time",
+    "get_previous_month_range",
+    "truncate_datetime",
     "get_described_user_info",
     "to_title_case",
     "boolify",
+    "iter_excel_rows",
+    "read_excel_batches",
     "generate_random_password",
 ]
@@ -0,0 +1,84 @@
+import io
+from typing import Any, AsyncIterator, Collection, Generator, Iterator
+
+from openpyxl import load_workbook
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
+from mspy_vendi.config import config
+from mspy_vendi.core.process_pool import iterate_in_subprocess
+
+
+def iter_excel_rows(
+    content: bytes, columns: Collection[str], header_row: int = 1, chunk_size: int | None = None
+) -> Generator[list[dict[str, Any]], None, None]:
+    """
+    Read the first worksheet of the Excel file in batches of rows.
+
+    The workbook is opened in the read-only mode, so the worksheet is parsed row by row from the archive
+    and only one batch of rows is kept in memory.
+    Only the requested columns are read, the columns missing in the header are skipped.
+    Empty rows are skipped as well, empty cells are returned as None.
+
+    :param content: Excel file as raw bytes.
+    :param columns: Names of the columns to read, as they are written in the header.
+    :param header_row: Number of the header row, starting from 1. The rows after it contain the data.
+    :param chunk_size: Rows per batch, `config.db.import_chunk_size` by default.
+
+    :return: Iterator over the batches of rows, every row maps the column names to the cell values.
+    """
+    chunk_size = chunk_size or config.db.import_chunk_size
+    workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+
+    try:
+        worksheet: ReadOnlyWorksheet = workbook.worksheets[0]
+        rows: Iterator[tuple[Any, ...]] = worksheet.iter_rows(min_row=header_row, values_only=True)
+
+        header: tuple[Any, ...] = next(rows, ())
+        positions: dict[str, int] = {
+            name: position for position, name in enumerate(header) if isinstance(name, str) and name in columns
+        }
+
+        batch: list[dict[str, Any]] = []
+
+        for row in rows:
+            values: dict[str, Any] = {
+                name: row[position] if position < len(row) else None for name, position in positions.items()
+            }
+
+            if all(value is None for value in values.values()):
+                continue
+
+            batch.append(values)
+
+            if len(batch) == chunk_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    finally:
+        workbook.close()
+
+
+async def read_excel_batches(
+    content: bytes, columns: Collection[str], header_row: int = 1, chunk_size: int | None = None
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Read the Excel file in batches of rows in a separate process, see `iter_excel_rows`.
+
+    openpyxl holds the GIL while it parses the file, so a thread doesn't keep the event loop responsive.
+    The next batch is parsed only when the previous one has been consumed, so the caller can persist every batch
+    before the rest of the file is read.
+
+    :param content: Excel file as raw bytes.
+    :param columns: Names of the columns to read, as they are written in the header.
+    :param header_row: Number of the header row, starting from 1.
+    :param chunk_size: Rows per batch, `config.db.import_chunk_size` by default.
+
+    :return: Asynchronous iterator over the batches of rows.
+    """
+    async for batch in iterate_in_subprocess(
+        iter_excel_rows, content, list(columns), header_row, chunk_size or config.db.import_chunk_size
+    ):
+        yield batch
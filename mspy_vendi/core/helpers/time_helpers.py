@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 def is_time_provided(dt: datetime) -> bool:
@@ -22,3 +22,27 @@ def set_end_of_day_time(dt: datetime) -> datetime:
         return dt.replace(hour=23, minute=59, second=59)
 
     return dt
+
+
+def get_previous_month_range(dt: datetime) -> tuple[datetime, datetime]:
+    """
+    Returns the first and the last day of the month preceding the given datetime.
+    The time part of the given datetime is preserved.
+
+    :param dt: The datetime object to start from.
+    :return: The first and the last day of the previous month.
+    """
+    last_day_of_previous_month = dt.replace(day=1) - timedelta(days=1)
+
+    return last_day_of_previous_month.replace(day=1), last_day_of_previous_month
+
+
+def truncate_datetime(dt: datetime, resolution: timedelta) -> datetime:
+    """
+    Truncates the datetime to the start of the period of the given resolution, e.g. to the start of the hour.
+
+    :param dt: The datetime object to truncate.
+    :param resolution: The length of the period.
+    :return: The start of the period containing the given datetime.
+    """
+    return datetime.min + (dt - datetime.min) // resolution * resolution
@@ -1,18 +1,36 @@
 from abc import ABC
-from typing import Any, Generic, Optional, Sequence, TypeVar
+from typing import Any, Awaitable, Callable, Generic, Mapping, Optional, Sequence, TypeVar
 
 from fastapi_filter.contrib.sqlalchemy import Filter
 from fastapi_pagination import Page
-from fastapi_pagination.ext.sqlalchemy import paginate
 from pydantic import BaseModel
-from sqlalchemy import Select, delete, inspect, select, update
+from sqlalchemy import (
+    Boolean,
+    ColumnElement,
+    RowMapping,
+    Select,
+    and_,
+    column,
+    delete,
+    func,
+    inspect,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import DBAPIError, NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.sql.roles import ColumnsClauseRole
 
+from mspy_vendi.config import config
 from mspy_vendi.core.exceptions.base_exception import BadRequestError, NotFoundError, raise_db_error
+from mspy_vendi.core.pagination import is_cursor_pagination, paginate, paginate_by_cursor
+from mspy_vendi.core.schemas import BulkUpsertResultSchema
 
 Model = TypeVar("Model", bound=type[DeclarativeBase])
 CreateSchema = TypeVar("CreateSchema", BaseModel, dict)
@@ -72,7 +90,54 @@ class CRUDManager(ABC, Generic[Model, Schema, CreateSchema, UpdateSchema, PageSc
 
             return (await self.session.scalars(stmt)).all()  # type: ignore
 
-        return await paginate(self.session, stmt)
+        return await self.get_page(stmt, query_filter.order_by if query_filter else None)
+
+    async def get_page(
+        self,
+        stmt: Select,
+        order_by: list[str] | None = None,
+        column_mapping: dict[str, ColumnElement] | None = None,
+    ) -> Page[Schema]:
+        """
+        Paginate the statement according to the pagination type of the current endpoint.
+
+        Endpoints responding with `CursorPage` are paginated by the keyset of the first `order_by` field and the ID,
+        other endpoints use the regular offset pagination.
+
+        :param stmt: Statement to paginate.
+        :param order_by: Ordering of the filter, e.g. `["-sale_date"]`. The rows are sorted by ID if it's empty.
+        :param column_mapping: Columns of the ordering fields which aren't attributes of the model.
+
+        :return: Paginated result.
+
+        :raises BadRequestError: If cursor pagination is requested with more than one ordering field.
+        """
+        if not is_cursor_pagination():
+            return await paginate(self.session, stmt)
+
+        order_by = order_by or []
+
+        if len(order_by) > 1:
+            raise BadRequestError("Cursor pagination supports ordering by a single field")
+
+        field_name_with_direction: str = order_by[0] if order_by else "id"
+        field_name: str = field_name_with_direction.replace("-", "").replace("+", "")
+        column_mapping = column_mapping or {}
+        sort_column: ColumnElement | None = None
+
+        if field_name in column_mapping:
+            sort_column = column_mapping[field_name]
+
+        elif field_name != "id":
+            sort_column = getattr(self.sql_model, field_name)
+
+        return await paginate_by_cursor(
+            self.session,
+            stmt,
+            id_column=self.sql_model.id,
+            sort_column=sort_column,
+            descending=field_name_with_direction.startswith("-"),
+        )
 
     async def get(self, obj_id: int, *, raise_error: bool = True, **_: Any) -> Model | None:
         """
@@ -197,6 +262,110 @@ class CRUDManager(ABC, Generic[Model, Schema, CreateSchema, UpdateSchema, PageSc
 
         return await self._apply_changes(stmt=stmt, obj_id=obj_id, autocommit=autocommit, is_unique=is_unique)
 
+    def _get_conflict_columns(self, conflict_target: str | Sequence[str]) -> list[str]:
+        if not isinstance(conflict_target, str):
+            return list(conflict_target)
+
+        for constraint in self.sql_model.__table__.constraints:
+            if constraint.name == conflict_target:
+                return [column.name for column in constraint.columns]
+
+        raise ValueError(f"{self.sql_model.__name__} has no {conflict_target} constraint")
+
+    @staticmethod
+    def _deduplicate_rows(rows: list[dict[str, Any]], columns: Sequence[str]) -> list[dict[str, Any]]:
+        unique_rows: dict[Any, dict[str, Any]] = {}
+
+        for position, row in enumerate(rows):
+            key: tuple[Any, ...] = tuple(row.get(column) for column in columns)
+            # NULLs are never equal, so such rows don't conflict with each other.
+            unique_rows[key if None not in key else position] = row
+
+        return list(unique_rows.values())
+
+    async def bulk_upsert(
+        self,
+        rows: Sequence[BaseModel | dict[str, Any]],
+        conflict_target: str | Sequence[str],
+        update_columns: Sequence[str] | None = None,
+        chunk_size: int | None = None,
+        *,
+        returning: Sequence[ColumnElement] = (),
+        on_chunk: Callable[[Sequence[RowMapping]], Awaitable[Any]] | None = None,
+        autocommit: bool = True,
+    ) -> BulkUpsertResultSchema:
+        """
+        Insert the rows by chunked multi-row `INSERT ... ON CONFLICT` statements within one transaction.
+
+        Rows conflicting with existing ones are skipped, or updated with the new values of `update_columns`.
+        Inserted and updated rows are told apart by `RETURNING (xmax = 0)`, the rest of the chunk is skipped.
+        One statement can't update the same row twice, so on update only the last of the rows with the same
+        conflict key within a chunk is kept, the others are counted as skipped.
+
+        :param rows: Rows to insert, schemas or dictionaries.
+        :param conflict_target: Name of the unique constraint or the columns of the unique index.
+        :param update_columns: Columns to update on conflict. If None, conflicting rows are skipped.
+        :param chunk_size: Rows per statement, `config.db.import_chunk_size` by default.
+        :param returning: Additional columns returned for every inserted or updated row.
+        :param on_chunk: Coroutine function called with the returned rows of every chunk within the transaction,
+                         e.g. to maintain derived data. The rows have the `inserted` flag and the `returning` columns.
+        :param autocommit: If True, commit changes at the end, otherwise flush changes.
+
+        :return: Count of created, updated and skipped records.
+        """
+        chunk_size = chunk_size or config.db.import_chunk_size
+        conflict_columns: list[str] = self._get_conflict_columns(conflict_target)
+        conflict_arguments: dict[str, Any] = (
+            {"constraint": conflict_target}
+            if isinstance(conflict_target, str)
+            else {"index_elements": conflict_columns}
+        )
+        values: list[dict[str, Any]] = [row.model_dump() if isinstance(row, BaseModel) else row for row in rows]
+        result = BulkUpsertResultSchema()
+
+        try:
+            for start in range(0, len(values), chunk_size):
+                chunk: list[dict[str, Any]] = values[start : start + chunk_size]
+
+                if update_columns:
+                    chunk = self._deduplicate_rows(chunk, conflict_columns)
+
+                stmt = insert(self.sql_model).values(chunk)
+
+                if update_columns:
+                    set_: dict[str, Any] = {column: stmt.excluded[column] for column in update_columns}
+
+                    if hasattr(self.sql_model, "updated_at"):
+                        set_.setdefault("updated_at", func.current_timestamp())
+
+                    stmt = stmt.on_conflict_do_update(**conflict_arguments, set_=set_)
+
+                else:
+                    stmt = stmt.on_conflict_do_nothing(**conflict_arguments)
+
+                stmt = stmt.returning(literal_column("xmax = 0", Boolean).label("inserted"), *returning)
+                returned_rows: Sequence[RowMapping] = (await self.session.execute(stmt)).mappings().all()
+
+                if on_chunk is not None:
+                    await on_chunk(returned_rows)
+
+                created_records: int = sum(row["inserted"] for row in returned_rows)
+
+                result.created_records += created_records
+                result.updated_records += len(returned_rows) - created_records
+                result.skipped_records += min(chunk_size, len(values) - start) - len(returned_rows)
+
+            if autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+
+        except DBAPIError as ex:
+            await self.session.rollback()
+            raise_db_error(ex)
+
+        return result
+
     async def delete(self, obj_id: int, autocommit: bool = True, **_: Any) -> None:
         """
         Delete an object.
@@ -276,3 +445,131 @@ class CRUDManager(ABC, Generic[Model, Schema, CreateSchema, UpdateSchema, PageSc
             return result, updated_result, True
 
         return await self.create(obj, obj_id=obj_id), None, False
+
+    async def bulk_update_or_create(
+        self,
+        rows: Sequence[BaseModel | dict[str, Any]],
+        conflict_target: str | Sequence[str] = ("id",),
+        *,
+        autocommit: bool = True,
+    ) -> list[tuple[dict[str, Any], dict[str, Any] | None, bool]]:
+        """
+        Update or create several entities with chunked `INSERT ... ON CONFLICT DO UPDATE` statements,
+        the bulk counterpart of `update_or_create`.
+
+        Every provided column except the conflict ones is updated on conflict, but only if any of them differs,
+        so unchanged rows aren't written at all.
+        Every chunk is written by one statement:
+            - the `previous` CTE selects the existing rows `FOR UPDATE`, so their previous states can't change
+              until the commit. It's evaluated before anything is written, as the rows modified by the same
+              statement can't be locked anymore;
+            - the upsert updates only the locked rows and creates the missing ones;
+            - the locked rows are joined to the `RETURNING` of the upsert.
+        So the previous state of every updated row is the one it's updated from, even with concurrent writers.
+        A row inserted by another transaction after the statement has started isn't visible to the `previous` CTE,
+        such rows are left untouched and written by a repeated statement, which sees them.
+        Rows with the same conflict key are merged, the last one wins.
+
+        :param rows: Rows to store, schemas or dictionaries including the conflict columns.
+        :param conflict_target: Name of the unique constraint or the columns of the unique index.
+        :param autocommit: If True, commit changes at the end, otherwise flush changes.
+
+        :return: The current state, the previous state and whether the entity is written, for every entity.
+                 The previous state is None for created entities, and equal to the current one for unchanged entities.
+        """
+        conflict_columns: list[str] = self._get_conflict_columns(conflict_target)
+        conflict_arguments: dict[str, Any] = (
+            {"constraint": conflict_target}
+            if isinstance(conflict_target, str)
+            else {"index_elements": conflict_columns}
+        )
+        unique_rows: list[dict[str, Any]] = self._deduplicate_rows(
+            [row.model_dump() if isinstance(row, BaseModel) else row for row in rows], conflict_columns
+        )
+
+        if not unique_rows:
+            return []
+
+        table = self.sql_model.__table__
+        columns: list[str] = list(unique_rows[0])
+        update_columns: list[str] = [column for column in columns if column not in conflict_columns]
+        states: list[tuple[dict[str, Any], dict[str, Any] | None, bool]] = []
+
+        def _get_key(row: Mapping[str, Any]) -> tuple[Any, ...]:
+            return tuple(row[column] for column in conflict_columns)
+
+        def _get_key_column(source: Any) -> ColumnElement:
+            return (
+                tuple_(*(source.c[column] for column in conflict_columns))
+                if len(conflict_columns) > 1
+                else source.c[conflict_columns[0]]
+            )
+
+        def _build_statement(chunk: list[dict[str, Any]]) -> Select:
+            keys: list[Any] = [key if len(key) > 1 else key[0] for key in map(_get_key, chunk) if None not in key]
+            previous = select(table).where(_get_key_column(table).in_(keys)).with_for_update().cte("previous")
+            new_rows = values(*(column(name, table.c[name].type) for name in columns), name="new_rows").data(
+                [tuple(row[name] for name in columns) for row in chunk]
+            )
+            insert_stmt = insert(table).from_select(
+                columns,
+                # The scalar subquery is computed once before the first row is inserted, so every row is locked by then.
+                select(new_rows).where(select(func.count()).select_from(previous).scalar_subquery() >= 0),
+            )
+            set_: dict[str, Any] = {name: insert_stmt.excluded[name] for name in update_columns}
+
+            if "updated_at" in table.c:
+                set_.setdefault("updated_at", func.current_timestamp())
+
+            upserted = (
+                insert_stmt.on_conflict_do_update(
+                    **conflict_arguments,
+                    set_=set_,
+                    where=and_(
+                        _get_key_column(table).in_(select(*(previous.c[name] for name in conflict_columns))),
+                        or_(*(table.c[name].is_distinct_from(insert_stmt.excluded[name]) for name in update_columns)),
+                    ),
+                )
+                .returning(*table.c, literal_column("xmax = 0", Boolean).label("inserted"))
+                .cte("upserted")
+            )
+
+            return select(*upserted.c, *previous.c).select_from(
+                previous.join(upserted, _get_key_column(previous) == _get_key_column(upserted), full=True)
+            )
+
+        try:
+            for start in range(0, len(unique_rows), config.db.import_chunk_size):
+                pending_rows: list[dict[str, Any]] = unique_rows[start : start + config.db.import_chunk_size]
+
+                while pending_rows:
+                    result = await self.session.execute(_build_statement(pending_rows))
+                    stored_keys: set[tuple[Any, ...]] = set()
+
+                    for row in result.tuples():
+                        current_state: dict[str, Any] = dict(zip(table.c.keys(), row[: len(table.c)]))
+                        is_inserted: bool | None = row[len(table.c)]
+                        previous_state: dict[str, Any] = dict(zip(table.c.keys(), row[len(table.c) + 1 :]))
+
+                        if is_inserted is None:
+                            stored_keys.add(_get_key(previous_state))
+                            states.append((previous_state, previous_state, False))
+                        else:
+                            stored_keys.add(_get_key(current_state))
+                            states.append((current_state, None if is_inserted else previous_state, True))
+
+                    # Inserted by another transaction meanwhile, they're locked and updated by the next statement.
+                    pending_rows = [
+                        row for row in pending_rows if None not in _get_key(row) and _get_key(row) not in stored_keys
+                    ]
+
+            if autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+
+        except DBAPIError as ex:
+            await self.session.rollback()
+            raise_db_error(ex)
+
+        return states
@@ -0,0 +1,98 @@
+import asyncio
+import inspect
+from enum import StrEnum
+from typing import Any, ClassVar, Protocol
+
+import sentry_sdk
+from fastapi_pagination import set_params
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mspy_vendi.config import config, log
+from mspy_vendi.core.enums.date_range import DateRangeEnum
+from mspy_vendi.core.exceptions.base_exception import BaseError
+from mspy_vendi.core.filter import BaseFilter
+from mspy_vendi.core.pagination import Page
+from mspy_vendi.core.schemas import DashboardSchema, DashboardWidgetSchema
+from mspy_vendi.db.engine import AsyncSessionLocal
+from mspy_vendi.domain.user.models import User
+
+
+class DashboardProtocol(Protocol):
+    def __init__(self, db_session: AsyncSession): ...
+
+
+class DashboardMixin(DashboardProtocol):
+    """
+    Compute several statistic widgets within one request.
+
+    Every widget is mapped to a method of the service in `dashboard_widgets`.
+    Widgets run concurrently, each on its own service instance and DB session, at most
+    `config.db.dashboard_concurrency` at a time. A failed widget doesn't fail the whole dashboard,
+    its error is reported in the response instead.
+    """
+
+    dashboard_widgets: ClassVar[dict[StrEnum, str]]
+
+    async def _compute_widget(
+        self,
+        widget: StrEnum,
+        query_filter: BaseFilter,
+        user: User,
+        time_frame: DateRangeEnum,
+        semaphore: asyncio.Semaphore,
+    ) -> DashboardWidgetSchema:
+        async with semaphore, AsyncSessionLocal() as session:
+            method = getattr(type(self)(db_session=session), self.dashboard_widgets[widget])
+            signature: inspect.Signature = inspect.signature(method)
+
+            # Managers may modify the filter object, so every widget gets its own copy.
+            kwargs: dict[str, Any] = {"query_filter": query_filter.model_copy(deep=True), "user": user}
+
+            if "time_frame" in signature.parameters:
+                kwargs["time_frame"] = time_frame
+
+            try:
+                result: Any = await method(**kwargs)
+
+                adapter: TypeAdapter = TypeAdapter(signature.return_annotation)
+                data: Any = adapter.dump_python(adapter.validate_python(result, from_attributes=True), mode="json")
+
+            except BaseError as exc:
+                return DashboardWidgetSchema(error=exc.content["detail"])
+
+            except Exception as exc:
+                log.error("Failed to compute the dashboard widget", widget=widget, error=str(exc))
+                sentry_sdk.capture_exception(exc)
+
+                return DashboardWidgetSchema(error="Failed to compute the widget")
+
+        return DashboardWidgetSchema(data=data)
+
+    async def get_dashboard(
+        self,
+        widgets: list[StrEnum],
+        query_filter: BaseFilter,
+        user: User,
+        time_frame: DateRangeEnum = DateRangeEnum.DAY,
+    ) -> DashboardSchema:
+        """
+        Compute the requested widgets concurrently.
+
+        :param widgets: Widgets to compute. Duplicates are computed once.
+        :param query_filter: Filter applied to every widget.
+        :param user: Current user.
+        :param time_frame: Time frame of the widgets grouped by range.
+
+        :return: Result or error of every widget.
+        """
+        unique_widgets: list[StrEnum] = list(dict.fromkeys(widgets))
+        semaphore = asyncio.Semaphore(config.db.dashboard_concurrency)
+
+        # Paginated widgets return the first page of the default size.
+        with set_params(Page.__params_type__()):
+            results: list[DashboardWidgetSchema] = await asyncio.gather(
+                *(self._compute_widget(widget, query_filter, user, time_frame, semaphore) for widget in unique_widgets)
+            )
+
+        return DashboardSchema(widgets=dict(zip(unique_widgets, results)))
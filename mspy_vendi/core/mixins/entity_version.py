@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+from mspy_vendi.core.cache import bump_entity_version
+
+# Bumps scheduled after commits, the references keep the tasks from being garbage collected.
+_pending_bumps: set[asyncio.Task] = set()
+# Key of `Session.info` set while the transaction of the session has changed the entities.
+BUMP_PENDING_KEY: str = "entity_version_bump_pending"
+
+
+def _schedule_bump(session: Session) -> None:
+    # Savepoints are committed within the transaction, the changes are visible to others after the outermost commit.
+    if session.in_nested_transaction() or not session.info.pop(BUMP_PENDING_KEY, False):
+        return
+
+    task: asyncio.Task = asyncio.get_running_loop().create_task(bump_entity_version())
+    _pending_bumps.add(task)
+    task.add_done_callback(_pending_bumps.discard)
+
+
+def _discard_bump(session: Session, transaction: SessionTransaction) -> None:
+    # The outermost transaction has ended without a commit, e.g. it's rolled back, so the next one starts clean.
+    if transaction.parent is None:
+        session.info.pop(BUMP_PENDING_KEY, None)
+
+
+class EntityVersionMixin:
+    """
+    Invalidate the in-process entity caches of the consumers, e.g. `NayaxEntityCache`, after every change
+    of the service entities.
+    It must precede `CRUDService` in the bases.
+    The version is bumped only after the changes are committed, otherwise a consumer could cache the old states
+    again between the bump and the commit. With `autocommit=False` it's bumped after the caller commits,
+    and not at all if the transaction is rolled back.
+    """
+
+    async def _bump_entity_version(self, autocommit: bool) -> None:
+        if autocommit:
+            await bump_entity_version()
+            return
+
+        session: Session = self.db_session.sync_session
+        session.info[BUMP_PENDING_KEY] = True
+
+        if not event.contains(session, "after_commit", _schedule_bump):
+            event.listen(session, "after_commit", _schedule_bump)
+            event.listen(session, "after_transaction_end", _discard_bump)
+
+    async def create(self, *args: Any, autocommit: bool = True, **kwargs: Any) -> Any:
+        result: Any = await super().create(*args, autocommit=autocommit, **kwargs)
+        await self._bump_entity_version(autocommit)
+
+        return result
+
+    async def update(self, *args: Any, autocommit: bool = True, **kwargs: Any) -> Any:
+        result: Any = await super().update(*args, autocommit=autocommit, **kwargs)
+        await self._bump_entity_version(autocommit)
+
+        return result
+
+    async def delete(self, *args: Any, autocommit: bool = True, **kwargs: Any) -> None:
+        await super().delete(*args, autocommit=autocommit, **kwargs)
+        await self._bump_entity_version(autocommit)
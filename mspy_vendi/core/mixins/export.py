@@ -1,28 +1,49 @@
+import csv
+import functools
 import io
-from typing import Any
+import secrets
+from datetime import datetime
+from importlib import import_module
+from typing import IO, Any, AsyncIterator, Awaitable, Callable, Iterator
+from uuid import uuid4
 
 import pandas as pd
 from asyncpg.protocol import Protocol
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import URL
 from starlette.responses import StreamingResponse
 
-from mspy_vendi.config import log
+from mspy_vendi.config import config, log
+from mspy_vendi.core.cache import binary_redis_client, compute_shared_value, generate_scoped_key, redis_client
 from mspy_vendi.core.constants import CSS_STYLE, DEFAULT_EXPORT_TYPES, MESSAGE_FOOTER
 from mspy_vendi.core.email import EmailService
-from mspy_vendi.core.enums import ExportTypeEnum
+from mspy_vendi.core.enums import ExportJobStatusEnum, ExportTypeEnum
 from mspy_vendi.core.enums.date_range import ScheduleEnum
 from mspy_vendi.core.enums.export import ExportEntityTypeEnum
+from mspy_vendi.core.exceptions.base_exception import NotFoundError
 from mspy_vendi.core.factory import DataExportFactory
 from mspy_vendi.core.filter import BaseFilter
 from mspy_vendi.core.pagination import Page
-from mspy_vendi.core.schemas import BaseSchema
+from mspy_vendi.core.schemas import BaseSchema, ExportJobSchema
 from mspy_vendi.db.base import Base
+from mspy_vendi.db.engine import AsyncSessionLocal
 from mspy_vendi.domain.user.models import User
 from mspy_vendi.domain.user.schemas import UserScheduleSchema
 
+EXPORT_JOB_KEY_TEMPLATE: str = "export-job:{job_id}"
+EXPORT_JOB_FILE_KEY_TEMPLATE: str = "export-job:{job_id}:file"
+EXPORT_DOWNLOAD_KEY_TEMPLATE: str = "export-download:{token}"
+SCHEDULED_REPORT_KEY_PREFIX: str = "scheduled-report"
+
 
 class ExportManager(Protocol):
+    session: AsyncSession
+
     async def export(self, query_filter: BaseFilter, user: Base, **kwargs: Any) -> Any: ...
 
+    async def get_export_query(self, query_filter: BaseFilter, user: Base) -> Select: ...
+
 
 class ExportProtocol(Protocol):
     email_service: EmailService
@@ -76,6 +97,106 @@ class ExportMixin(ExportProtocol):
 
         log.info("Sent export message was completed.")
 
+    @staticmethod
+    def _generate_file_name(query_filter: BaseFilter, export_type: ExportTypeEnum, entity: ExportEntityTypeEnum) -> str:
+        file_extension: str = DEFAULT_EXPORT_TYPES[export_type].get("file_extension")
+
+        return (
+            f"{entity.capitalize()} Report Start-date: {query_filter.date_from.date()}"
+            f" End-date: {query_filter.date_to.date()}.{file_extension}"
+        )
+
+    @staticmethod
+    def _generate_file_headers(file_name: str) -> dict[str, str]:
+        return {
+            "Access-Control-Expose-Headers": "Content-Disposition",
+            "Content-Disposition": f"""attachment; filename={file_name}""",
+        }
+
+    @staticmethod
+    async def stream_csv(stmt: Select) -> AsyncIterator[bytes]:
+        """
+        Execute the statement on a server-side cursor and yield the CSV file chunk by chunk,
+        so only one chunk of rows is held in memory regardless of the size of the export.
+
+        The response is streamed after the request dependencies are closed, so a separate session is used.
+
+        :param stmt: Export statement.
+
+        :return: Encoded chunks of the CSV file, the first one starts with the header.
+        """
+        buffer = io.StringIO()
+        # The same format as `DataFrame.to_csv`, which is used for the other exports.
+        writer = csv.writer(buffer, lineterminator="\n")
+
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(stmt.execution_options(yield_per=config.db.export_chunk_size))
+            writer.writerow(result.keys())
+
+            async for rows in result.partitions():
+                writer.writerows(rows)
+
+                yield buffer.getvalue().encode()
+
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    async def render_file(
+        self,
+        stmt: Select,
+        export_type: ExportTypeEnum,
+        on_progress: Callable[[int], Awaitable[Any]] | None = None,
+    ) -> IO[bytes]:
+        """
+        Execute the statement on a server-side cursor and write the rows into the file chunk by chunk.
+
+        :param stmt: Export statement.
+        :param export_type: The type of the file.
+        :param on_progress: Callback receiving the count of written rows after every chunk.
+
+        :return: Temporary file with the export. The caller must close it, e.g. with `iterate_file`.
+        """
+        result = await self.manager.session.stream(stmt.execution_options(yield_per=config.db.export_chunk_size))
+
+        return await DataExportFactory.stream(export_type).extract(result, on_progress)
+
+    @staticmethod
+    def iterate_file(file: IO[bytes], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Read the file chunk by chunk and close it afterward.
+
+        :param file: File to read.
+        :param chunk_size: Size of the chunk in bytes.
+
+        :return: Chunks of the file.
+        """
+        with file:
+            while chunk := file.read(chunk_size):
+                yield chunk
+
+    async def render_report(
+        self, query_filter: BaseFilter, export_type: ExportTypeEnum, user: UserScheduleSchema | User
+    ) -> bytes:
+        """
+        Render the report file attached to the scheduled emails.
+
+        :param query_filter: The filter to use for the export.
+        :param export_type: The type of export to use.
+        :param user: The user to send the report to.
+
+        :return: Content of the file.
+        """
+        entity_data: list[dict] = await self.manager.export(query_filter, user, raw_result=True)
+
+        df = pd.DataFrame(entity_data)
+
+        content: io.BytesIO = await DataExportFactory.transform(export_type).extract(df)
+
+        return content.getvalue()
+
     async def export(
         self,
         query_filter: BaseFilter,
@@ -103,34 +224,37 @@ class ExportMixin(ExportProtocol):
 
         :return: The StreamingResponse or None.
         """
-        entity_data: list[dict] | Page[BaseSchema] = await self.manager.export(
-            query_filter, user, raw_result=raw_result
-        )
-
         if not raw_result:
-            return entity_data
+            return await self.manager.export(query_filter, user, raw_result=False)
 
-        file_extension: str = DEFAULT_EXPORT_TYPES[export_type].get("file_extension")
-        file_content_type: str = DEFAULT_EXPORT_TYPES[export_type].get("content_type")
+        file_content_type: str = DEFAULT_EXPORT_TYPES[export_type].get("file_type")
+        file_name: str = self._generate_file_name(query_filter, export_type, entity)
+        headers: dict[str, str] = self._generate_file_headers(file_name)
 
-        file_name: str = (
-            f"{entity.capitalize()} Report Start-date: {query_filter.date_from.date()}"
-            f" End-date: {query_filter.date_to.date()}.{file_extension}"
-        )
+        if sync:
+            # The statement is built within the request, so invalid filters are reported before the response starts.
+            stmt: Select = await self.manager.get_export_query(query_filter, user)
 
-        df = pd.DataFrame(entity_data)
+            if export_type == ExportTypeEnum.CSV:
+                file_content: AsyncIterator[bytes] | Iterator[bytes] = self.stream_csv(stmt)
+            else:
+                file_content = self.iterate_file(await self.render_file(stmt, export_type))
 
-        content: io.BytesIO = await DataExportFactory.transform(export_type).extract(df)
+            return StreamingResponse(content=file_content, headers=headers, media_type=file_content_type)
 
-        if sync:
-            return StreamingResponse(
-                content=content,
-                headers={
-                    "Access-Control-Expose-Headers": "Content-Disposition",
-                    "Content-Disposition": f"""attachment; filename={file_name}""",
-                },
-                media_type=file_content_type,
+        # Users with the same filter and entitlement get the same report, so it's rendered once per schedule tick.
+        # The window of the report is closed before the tick, so the data ingested meanwhile doesn't change it.
+        report_key: str = await generate_scoped_key(
+            SCHEDULED_REPORT_KEY_PREFIX, self.manager, user, entity=entity, export_type=export_type, filter=query_filter
+        )
+        content = io.BytesIO(
+            await compute_shared_value(
+                report_key,
+                functools.partial(self.render_report, query_filter.model_copy(deep=True), export_type, user),
+                ttl=config.redis.scheduled_report_ttl,
+                lock_timeout=config.redis.scheduled_report_lock_timeout,
             )
+        )
 
         return await self.send_report(
             query_filter=query_filter,
@@ -140,3 +264,205 @@ class ExportMixin(ExportProtocol):
             schedule=schedule,
             entity=entity,
         )
+
+    @staticmethod
+    async def _save_export_job(job: ExportJobSchema) -> None:
+        await redis_client.set(
+            EXPORT_JOB_KEY_TEMPLATE.format(job_id=job.job_id), job.model_dump_json(), ex=config.redis.export_job_ttl
+        )
+
+    @staticmethod
+    async def _get_export_job(job_id: str, entity: ExportEntityTypeEnum) -> ExportJobSchema:
+        if not (value := await redis_client.get(EXPORT_JOB_KEY_TEMPLATE.format(job_id=job_id))):
+            raise NotFoundError("Export job doesn't exist or has expired.")
+
+        job: ExportJobSchema = ExportJobSchema.model_validate_json(value)
+
+        if job.entity != entity:
+            raise NotFoundError("Export job doesn't exist or has expired.")
+
+        return job
+
+    async def create_export_job(
+        self,
+        query_filter: BaseFilter,
+        export_type: ExportTypeEnum,
+        user: User,
+        *,
+        entity: ExportEntityTypeEnum,
+    ) -> ExportJobSchema:
+        """
+        Enqueue the export to the worker instead of rendering the file within the request.
+        The job is processed by the `export_<entity>_job_task` task of the entity.
+
+        :param query_filter: The filter to use for the export.
+        :param export_type: The type of export to use.
+        :param user: Current user.
+        :param entity: The entity to export.
+
+        :return: The pending job.
+        """
+        # The statement is built within the request, so invalid filters are reported before the job is enqueued.
+        await self.manager.get_export_query(query_filter.model_copy(deep=True), user)
+
+        job = ExportJobSchema(
+            job_id=uuid4().hex,
+            user_id=user.id,
+            entity=entity,
+            export_type=export_type,
+            status=ExportJobStatusEnum.PENDING,
+            file_name=self._generate_file_name(query_filter, export_type, entity),
+            created_at=datetime.now(),
+        )
+        await self._save_export_job(job)
+
+        entity_task = getattr(import_module(f"mspy_vendi.domain.{entity}s.tasks"), f"export_{entity}_job_task")
+        await entity_task.kiq(
+            job_id=job.job_id,
+            query_filter=query_filter,
+            user=UserScheduleSchema.model_validate(user),
+        )
+
+        log.info("Export job was enqueued", job_id=job.job_id, entity=entity, user_id=user.id)
+
+        return job
+
+    async def run_export_job(
+        self,
+        job_id: str,
+        query_filter: BaseFilter,
+        user: UserScheduleSchema,
+        *,
+        entity: ExportEntityTypeEnum,
+    ) -> None:
+        """
+        Render the file of the export job and store it for the download.
+        The count of processed rows is saved after every chunk, so the client can track the progress.
+        The file is stored as a Redis list of chunks of `config.redis.export_file_chunk_size` bytes,
+        so neither the worker nor the API holds the whole file in memory.
+        It shares the Redis of the task broker, so files larger than `config.redis.export_file_max_size` aren't stored
+        and fail the job, and the stored ones expire in `config.redis.export_file_ttl`.
+
+        :param job_id: ID of the job.
+        :param query_filter: The filter to use for the export.
+        :param user: The user who requested the export.
+        :param entity: The entity to export.
+        """
+        job: ExportJobSchema = await self._get_export_job(job_id, entity)
+        job.status = ExportJobStatusEnum.RUNNING
+        await self._save_export_job(job)
+
+        async def save_progress(processed_rows: int) -> None:
+            job.processed_rows = processed_rows
+            await self._save_export_job(job)
+
+        try:
+            stmt: Select = await self.manager.get_export_query(query_filter, user)
+
+            file: IO[bytes] = await self.render_file(stmt, job.export_type, save_progress)
+            file_key: str = EXPORT_JOB_FILE_KEY_TEMPLATE.format(job_id=job_id)
+
+            if (file_size := file.seek(0, io.SEEK_END)) > config.redis.export_file_max_size:
+                file.close()
+
+                log.warning("Export file is too large", job_id=job_id, file_size=file_size)
+
+                job.status = ExportJobStatusEnum.FAILED
+                job.error = "The export is too large, narrow down the filter"
+                return
+
+            file.seek(0)
+
+            # A retried job mustn't append to the chunks of the previous attempt.
+            await binary_redis_client.delete(file_key)
+
+            for chunk in self.iterate_file(file, config.redis.export_file_chunk_size):
+                await binary_redis_client.rpush(file_key, chunk)
+
+            await binary_redis_client.expire(file_key, config.redis.export_file_ttl)
+
+            job.status = ExportJobStatusEnum.COMPLETED
+
+        except Exception:
+            job.status = ExportJobStatusEnum.FAILED
+            job.error = "Failed to export the data"
+            raise
+
+        finally:
+            job.finished_at = datetime.now()
+            await self._save_export_job(job)
+
+    async def get_export_job(
+        self,
+        job_id: str,
+        user: User,
+        download_url: URL,
+        *,
+        entity: ExportEntityTypeEnum,
+    ) -> ExportJobSchema:
+        """
+        Get the state of the export job.
+        If the job is completed, a one-off download link is issued.
+        It expires in `config.redis.export_download_link_ttl`.
+        If the file has expired meanwhile, the job is expired, see `run_export_job`.
+
+        :param job_id: ID of the job.
+        :param user: Current user.
+        :param download_url: URL of the download endpoint of the job, the token is added to its query.
+        :param entity: The entity of the job.
+
+        :return: State of the job.
+        """
+        job: ExportJobSchema = await self._get_export_job(job_id, entity)
+
+        if job.user_id != user.id and not user.is_superuser:
+            raise NotFoundError("Export job doesn't exist or has expired.")
+
+        if job.status == ExportJobStatusEnum.COMPLETED and not await binary_redis_client.exists(
+            EXPORT_JOB_FILE_KEY_TEMPLATE.format(job_id=job_id)
+        ):
+            job.status = ExportJobStatusEnum.EXPIRED
+            await self._save_export_job(job)
+
+        if job.status == ExportJobStatusEnum.COMPLETED:
+            token: str = secrets.token_urlsafe()
+            await redis_client.set(
+                EXPORT_DOWNLOAD_KEY_TEMPLATE.format(token=token), job_id, ex=config.redis.export_download_link_ttl
+            )
+            job.download_url = str(download_url.include_query_params(token=token))
+
+        return job
+
+    async def download_export_job(self, job_id: str, token: str, *, entity: ExportEntityTypeEnum) -> StreamingResponse:
+        """
+        Download the file of the completed export job by the link issued with its state.
+        The link is one-off: the token is deleted by the first download.
+
+        :param job_id: ID of the job.
+        :param token: Token of the download link.
+        :param entity: The entity of the job.
+
+        :return: Response streaming the chunks of the file.
+        """
+        if await redis_client.getdel(EXPORT_DOWNLOAD_KEY_TEMPLATE.format(token=token)) != job_id:
+            raise NotFoundError("Download link is invalid or has expired.")
+
+        job: ExportJobSchema = await self._get_export_job(job_id, entity)
+        file_key: str = EXPORT_JOB_FILE_KEY_TEMPLATE.format(job_id=job_id)
+
+        if not (chunks_count := await binary_redis_client.llen(file_key)):
+            raise NotFoundError("Export file has expired.")
+
+        async def iterate_chunks() -> AsyncIterator[bytes]:
+            for index in range(chunks_count):
+                if (chunk := await binary_redis_client.lindex(file_key, index)) is None:
+                    log.error("Export file has expired during the download", job_id=job_id)
+                    return
+
+                yield chunk
+
+        return StreamingResponse(
+            iterate_chunks(),
+            headers=self._generate_file_headers(job.file_name),
+            media_type=DEFAULT_EXPORT_TYPES[job.export_type].get("file_type"),
+        )
@@ -1,10 +1,39 @@
+import json
+from typing import Any, Sequence
+
 from fastapi import Query
 from fastapi_pagination import Page as FastAPIPaginationPage
-from fastapi_pagination.customization import CustomizedPage, UseParamsFields
-from pydantic import NonNegativeInt
+from fastapi_pagination import Params as FastAPIPaginationParams
+from fastapi_pagination import create_page
+from fastapi_pagination.api import resolve_params
+from fastapi_pagination.bases import AbstractPage, RawParams
+from fastapi_pagination.cursor import CursorPage as FastAPIPaginationCursorPage
+from fastapi_pagination.cursor import CursorParams
+from fastapi_pagination.customization import CustomizedPage, UseParams, UseParamsFields
+from fastapi_pagination.ext.sqlalchemy import paginate as paginate_with_count_query
+from pydantic import NonNegativeInt, TypeAdapter, ValidationError
+from pydantic_core import to_jsonable_python
+from sqlalchemy import ColumnElement, Row, Select, and_, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mspy_vendi.core.exceptions.base_exception import BadRequestError
+
+
+class Params(FastAPIPaginationParams):
+    include_total: bool = Query(
+        True, description="Calculate `total` and `pages`. Disable it if the client doesn't need them, e.g. on scroll."
+    )
+
+    def to_raw_params(self) -> RawParams:
+        raw_params: RawParams = super().to_raw_params()
+        raw_params.include_total = self.include_total
+
+        return raw_params
+
 
 Page = CustomizedPage[
     FastAPIPaginationPage,
+    UseParams(Params),
     UseParamsFields(size=Query(100, ge=1, le=1000)),
 ]
 
@@ -15,5 +44,238 @@ class ExtendedFastAPIPaginationPage(FastAPIPaginationPage):
 
 ExtendedPage = CustomizedPage[
     ExtendedFastAPIPaginationPage,
+    UseParams(Params),
+    UseParamsFields(size=Query(100, ge=1, le=1000)),
+]
+
+CursorPage = CustomizedPage[
+    FastAPIPaginationCursorPage,
     UseParamsFields(size=Query(100, ge=1, le=1000)),
 ]
+
+TOTAL_COUNT_LABEL: str = "pagination_total_count"
+SORT_KEY_LABEL: str = "cursor_sort_key"
+ID_KEY_LABEL: str = "cursor_id"
+
+
+def is_cursor_pagination() -> bool:
+    """
+    Check whether the current endpoint is paginated with `CursorPage`.
+    """
+    try:
+        return isinstance(resolve_params(), CursorParams)
+
+    except RuntimeError:
+        return False
+
+
+async def paginate(session: AsyncSession, stmt: Select, unique: bool = True) -> AbstractPage:
+    """
+    Paginate the statement with LIMIT/OFFSET, calculating the total count in the same query.
+
+    `fastapi_pagination` runs an extra `SELECT count(*) FROM (<statement>)`, i.e. every heavy GROUP BY statement
+    is executed twice. Here the total is selected as `count(*) OVER ()`, which is evaluated after GROUP BY and
+    before LIMIT, so one execution returns both the page and the total.
+    If the client passes `include_total=false`, nothing is counted at all.
+
+    :param session: Database session.
+    :param stmt: Statement to paginate.
+    :param unique: Whether to apply unique filtering to the rows, e.g. for joined eager loads of collections.
+
+    :return: Page of the current pagination type.
+    """
+    params = resolve_params()
+    raw_params: RawParams = params.to_raw_params().as_limit_offset()
+
+    if not isinstance(stmt, Select) or stmt._distinct or stmt._limit_clause is not None:
+        # The window is evaluated before DISTINCT and LIMIT, so the total has to be counted separately.
+        return await paginate_with_count_query(session, stmt, unique=unique)
+
+    paginated_stmt: Select = stmt.limit(raw_params.limit).offset(raw_params.offset)
+
+    if raw_params.include_total:
+        paginated_stmt = paginated_stmt.add_columns(func.count().over().label(TOTAL_COUNT_LABEL))
+
+    result = await session.execute(paginated_stmt)
+    rows: Sequence[Row] = (result.unique() if unique else result).all()
+
+    total: int | None = None
+
+    if raw_params.include_total:
+        if rows:
+            total = rows[0]._mapping[TOTAL_COUNT_LABEL]
+
+        elif raw_params.offset:
+            # The page is out of range, so there is no row to carry the window count.
+            total = await session.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+        else:
+            total = 0
+
+    # The same unwrapping as `fastapi_pagination` does: entities or scalars for a single column, mappings otherwise.
+    is_single_column: bool = len(stmt.column_descriptions) == 1
+    items: list[Any] = [
+        row[0] if is_single_column else {key: value for key, value in row._mapping.items() if key != TOTAL_COUNT_LABEL}
+        for row in rows
+    ]
+
+    return create_page(items, total=total, params=params)
+
+
+def _is_nullable(column: ColumnElement) -> bool:
+    # Labels and ORM attributes wrap the actual table column.
+    element = getattr(column, "element", column)
+    element = getattr(element, "expression", element)
+
+    return getattr(element, "nullable", True)
+
+
+def _encode_cursor(row: Row, sort_column: ColumnElement | None, backwards: bool = False) -> str:
+    sort_value: Any = row._mapping[SORT_KEY_LABEL] if sort_column is not None else None
+    key: list[Any] = [to_jsonable_python(sort_value), row._mapping[ID_KEY_LABEL]]
+
+    return json.dumps({"key": key, "backwards": backwards})
+
+
+def _decode_cursor(cursor: str, sort_column: ColumnElement | None) -> tuple[Any, int, bool]:
+    try:
+        payload: dict[str, Any] = json.loads(cursor)
+        sort_value, id_value = payload["key"]
+
+        if sort_column is not None and sort_value is not None:
+            sort_value = TypeAdapter(sort_column.type.python_type).validate_python(sort_value)
+
+        return sort_value, TypeAdapter(int).validate_python(id_value), bool(payload["backwards"])
+
+    except (ValueError, TypeError, KeyError, ValidationError):
+        raise BadRequestError("Invalid cursor value") from None
+
+
+def _generate_keyset_condition(
+    sort_column: ColumnElement | None,
+    id_column: ColumnElement,
+    sort_value: Any,
+    id_value: int,
+    descending: bool,
+) -> ColumnElement[bool]:
+    """
+    Generate the condition selecting rows placed after the (sort_value, id_value) key.
+    NULL sort values are treated as the smallest ones, i.e. `ASC NULLS FIRST` and `DESC NULLS LAST`.
+    """
+    if sort_column is None:
+        return id_column < id_value if descending else id_column > id_value
+
+    if not _is_nullable(sort_column):
+        # Row comparison is matched by a composite index directly.
+        if descending:
+            return tuple_(sort_column, id_column) < tuple_(sort_value, id_value)
+
+        return tuple_(sort_column, id_column) > tuple_(sort_value, id_value)
+
+    if sort_value is None:
+        if descending:
+            return and_(sort_column.is_(None), id_column < id_value)
+
+        return or_(sort_column.is_not(None), and_(sort_column.is_(None), id_column > id_value))
+
+    if descending:
+        return or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < id_value),
+            sort_column.is_(None),
+        )
+
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > id_value))
+
+
+def _generate_keyset_ordering(
+    sort_column: ColumnElement | None, id_column: ColumnElement, descending: bool
+) -> list[ColumnElement]:
+    if descending:
+        ordering = [id_column.desc()]
+
+        if sort_column is not None:
+            ordering.insert(0, sort_column.desc().nullslast())
+
+    else:
+        ordering = [id_column.asc()]
+
+        if sort_column is not None:
+            ordering.insert(0, sort_column.asc().nullsfirst())
+
+    return ordering
+
+
+async def paginate_by_cursor(
+    session: AsyncSession,
+    stmt: Select,
+    id_column: ColumnElement,
+    sort_column: ColumnElement | None = None,
+    descending: bool = False,
+) -> AbstractPage:
+    """
+    Paginate the statement by the (sort key, id) keyset instead of OFFSET.
+
+    Every page is a range scan starting right after the key of the previous page, so its cost doesn't depend on
+    the depth of the page, and no `count(*)` is executed.
+    The ID breaks ties of the sort key, so the ordering is stable for non-unique keys as well.
+    The current ordering of the statement is replaced by the keyset ordering.
+
+    :param session: Database session.
+    :param stmt: Statement to paginate.
+    :param id_column: Unique column of the selected entity.
+    :param sort_column: Column to sort by. If it isn't provided, the rows are sorted by ID only.
+    :param descending: Whether to sort in descending order.
+
+    :return: Page of the current pagination type with the cursors of the previous and next pages.
+    """
+    params: CursorParams = resolve_params()
+    raw_params = params.to_raw_params()
+
+    is_entity: bool = len(stmt.column_descriptions) == 1
+    sort_value, id_value, backwards = (
+        _decode_cursor(raw_params.cursor, sort_column) if raw_params.cursor else (None, None, False)
+    )
+
+    # The previous page is fetched in the reversed order and flipped back afterward.
+    query_descending: bool = descending != backwards
+
+    stmt = stmt.add_columns(id_column.label(ID_KEY_LABEL))
+
+    if sort_column is not None:
+        stmt = stmt.add_columns(sort_column.label(SORT_KEY_LABEL))
+
+    if id_value is not None:
+        stmt = stmt.where(
+            _generate_keyset_condition(sort_column, id_column, sort_value, id_value, descending=query_descending)
+        )
+
+    stmt = (
+        stmt.order_by(None)
+        .order_by(*_generate_keyset_ordering(sort_column, id_column, descending=query_descending))
+        .limit(raw_params.size + 1)
+    )
+
+    rows: Sequence[Row] = (await session.execute(stmt)).all()
+    has_more: bool = len(rows) > raw_params.size
+    rows = rows[: raw_params.size]
+
+    if backwards:
+        rows = rows[::-1]
+
+    has_previous: bool = has_more if backwards else id_value is not None
+    has_next: bool = id_value is not None if backwards else has_more
+
+    cursor_labels: set[str] = {ID_KEY_LABEL, SORT_KEY_LABEL}
+    items: list[Any] = [
+        row[0] if is_entity else {key: value for key, value in row._mapping.items() if key not in cursor_labels}
+        for row in rows
+    ]
+
+    return create_page(
+        items,
+        params=params,
+        current=raw_params.cursor,
+        previous=_encode_cursor(rows[0], sort_column, backwards=True) if rows and has_previous else None,
+        next_=_encode_cursor(rows[-1], sort_column) if rows and has_next else None,
+    )
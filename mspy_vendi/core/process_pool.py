@@ -0,0 +1,208 @@
+__all__ = ["run_in_process_pool", "iterate_in_subprocess", "dump_data_frame", "load_data_frame", "read_excel"]
+
+import asyncio
+import contextlib
+import functools
+import io
+import multiprocessing
+import pickle
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
+
+import pandas as pd
+
+from mspy_vendi.config import config
+
+ReturnType = TypeVar("ReturnType")
+ItemType = TypeVar("ItemType")
+
+# Seconds to wait for the subprocess of `iterate_in_subprocess` to exit before it's killed.
+SUBPROCESS_JOIN_TIMEOUT: float = 5.0
+# Seconds between the checks of the subprocess of `iterate_in_subprocess` while waiting for its item.
+SUBPROCESS_POLL_INTERVAL: float = 1.0
+
+# The pool is created lazily, so importing the module in the spawned processes doesn't start another pool.
+_executor: ProcessPoolExecutor | None = None
+# A semaphore is bound to the event loop, so every loop gets its own one.
+_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        # Forking a process with a running event loop and threads isn't safe, so the processes are spawned.
+        _executor = ProcessPoolExecutor(
+            max_workers=config.render_process_pool_size, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    return _executor
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(config.render_concurrency)
+
+    return _semaphores[loop]
+
+
+async def run_in_process_pool(func: Callable[..., ReturnType], *args: Any, **kwargs: Any) -> ReturnType:
+    """
+    Run the CPU bound function, e.g. rendering or parsing of a file, in the shared process pool.
+
+    pandas holds the GIL for the most part of the work, so a thread doesn't keep the event loop responsive.
+    At most `config.render_concurrency` functions run at the same time, the rest wait for their turn.
+    The function, the arguments and the result are pickled, so the function must be defined at the module level.
+    Pass DataFrames with `dump_data_frame`, pickling a big one at once blocks the event loop as well.
+
+    :param func: Function to run.
+    :param args: Positional arguments of the function.
+    :param kwargs: Keyword arguments of the function.
+
+    :return: Result of the function.
+    """
+    async with _get_semaphore():
+        return await asyncio.get_running_loop().run_in_executor(
+            _get_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+
+def _send_items(connection: Connection, func: Callable[..., Iterator[Any]], *args: Any, **kwargs: Any) -> None:
+    items: Iterator[Any] = func(*args, **kwargs)
+
+    try:
+        # Every item is produced on request, False stops the iteration.
+        while connection.recv():
+            connection.send(next(items, None))
+
+    except Exception as exc:
+        connection.send(exc)
+
+    finally:
+        items.close()
+        connection.close()
+
+
+def _receive_item(connection: Connection, process: BaseProcess) -> Any:
+    # The parent may still hold a duplicate of the end of the child, so its exit isn't always seen as EOF.
+    try:
+        while not connection.poll(SUBPROCESS_POLL_INTERVAL):
+            if not process.is_alive():
+                raise EOFError
+
+        return connection.recv()
+
+    except EOFError:
+        raise ChildProcessError("The subprocess has exited unexpectedly.") from None
+
+
+async def iterate_in_subprocess(
+    func: Callable[..., Iterator[ItemType]], *args: Any, **kwargs: Any
+) -> AsyncIterator[ItemType]:
+    """
+    Run the CPU bound generator, e.g. parsing of a file in batches, in a separate process and yield its items.
+
+    A generator can't be resumed in the process pool, so a dedicated process is spawned for every iteration.
+    The next item is produced only when the previous one has been consumed, so only one item is kept in memory.
+    Items are received and unpickled in a thread. The generator must not yield None, it marks the end.
+    The process counts towards `config.render_concurrency`, see `run_in_process_pool`.
+
+    :param func: Generator function to run, it must be defined at the module level.
+    :param args: Positional arguments of the function.
+    :param kwargs: Keyword arguments of the function.
+
+    :return: Asynchronous iterator over the items of the generator.
+
+    :raise: Exception: The exception raised by the generator.
+    :raise: ChildProcessError: Raised if the process exits unexpectedly.
+    """
+    async with _get_semaphore():
+        connection, child_connection = multiprocessing.Pipe()
+        process = multiprocessing.get_context("spawn").Process(
+            target=_send_items, args=(child_connection, func, *args), kwargs=kwargs, daemon=True
+        )
+        await asyncio.to_thread(process.start)
+        child_connection.close()
+
+        try:
+            while True:
+                connection.send(True)
+                item: ItemType | Exception | None = await asyncio.to_thread(_receive_item, connection, process)
+
+                if isinstance(item, Exception):
+                    raise item
+
+                if item is None:
+                    break
+
+                yield item
+
+        finally:
+            # The process is already gone if it has failed or the iteration is over.
+            with contextlib.suppress(OSError):
+                connection.send(False)
+
+            connection.close()
+            await asyncio.to_thread(process.join, SUBPROCESS_JOIN_TIMEOUT)
+
+            if process.is_alive():
+                process.kill()
+
+
+def _split_data_frame(data: pd.DataFrame) -> list[pd.DataFrame]:
+    chunk_size: int = config.db.export_chunk_size
+
+    # An empty DataFrame is kept as one chunk, so the columns are preserved.
+    return [data.iloc[start : start + chunk_size] for start in range(0, max(len(data), 1), chunk_size)]
+
+
+async def dump_data_frame(data: pd.DataFrame) -> list[bytes]:
+    """
+    Pickle the DataFrame chunk by chunk in a thread.
+    Dates, times and strings are pickled object by object while holding the GIL, so a chunk at a time is pickled
+    to let the event loop run in between.
+
+    :param data: DataFrame to pickle.
+
+    :return: Pickled chunks of the DataFrame, see `load_data_frame`.
+    """
+    return [await asyncio.to_thread(pickle.dumps, chunk, pickle.HIGHEST_PROTOCOL) for chunk in _split_data_frame(data)]
+
+
+def load_data_frame(chunks: list[bytes]) -> pd.DataFrame:
+    """
+    Restore the DataFrame pickled by `dump_data_frame`.
+
+    :param chunks: Pickled chunks of the DataFrame.
+
+    :return: DataFrame.
+    """
+    return pd.concat([pickle.loads(chunk) for chunk in chunks])
+
+
+def _read_excel(content: bytes, **kwargs: Any) -> list[bytes]:
+    return [
+        pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL)
+        for chunk in _split_data_frame(pd.read_excel(io.BytesIO(content), **kwargs))
+    ]
+
+
+async def read_excel(content: bytes, **kwargs: Any) -> pd.DataFrame:
+    """
+    Parse the Excel file with `pd.read_excel` in the process pool.
+    The result is unpickled chunk by chunk in a thread, so the event loop isn't blocked on the way back either.
+
+    :param content: Excel file as raw bytes.
+    :param kwargs: Keyword arguments of `pd.read_excel`.
+
+    :return: DataFrame with the data of the file.
+    """
+    chunks: list[bytes] = await run_in_process_pool(_read_excel, content, **kwargs)
+    data_frames: list[pd.DataFrame] = [await asyncio.to_thread(pickle.loads, chunk) for chunk in chunks]
+
+    return await asyncio.to_thread(pd.concat, data_frames)
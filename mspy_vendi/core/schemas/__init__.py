@@ -1,3 +1,6 @@
 from .base import BaseSchema
+from .dashboard import DashboardSchema, DashboardWidgetSchema
+from .data_import import BulkUpsertResultSchema
+from .export import ExportJobSchema
 
-__all__ = ["BaseSchema"]
+__all__ = ["BaseSchema", "BulkUpsertResultSchema", "DashboardSchema", "DashboardWidgetSchema", "ExportJobSchema"]
@@ -0,0 +1,16 @@
+from typing import Any
+
+from .base import BaseSchema
+
+
+class DashboardWidgetSchema(BaseSchema):
+    """
+    Result of a single dashboard widget. Either `data` or `error` is set.
+    """
+
+    data: Any = None
+    error: str | None = None
+
+
+class DashboardSchema(BaseSchema):
+    widgets: dict[str, DashboardWidgetSchema]
@@ -0,0 +1,14 @@
+from pydantic import NonNegativeInt
+
+from .base import BaseSchema
+
+
+class BulkUpsertResultSchema(BaseSchema):
+    """
+    Result of `CRUDManager.bulk_upsert`.
+    Skipped records are the ones conflicting with existing rows, when they aren't updated.
+    """
+
+    created_records: NonNegativeInt = 0
+    updated_records: NonNegativeInt = 0
+    skipped_records: NonNegativeInt = 0
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import NonNegativeInt, PositiveInt
+
+from mspy_vendi.core.enums import ExportEntityTypeEnum, ExportJobStatusEnum, ExportTypeEnum
+
+from .base import BaseSchema
+
+
+class ExportJobSchema(BaseSchema):
+    """
+    State of an asynchronous export job.
+    `download_url` is set once the job is completed, the link expires shortly after it's issued.
+    """
+
+    job_id: str
+    user_id: PositiveInt
+    entity: ExportEntityTypeEnum
+    export_type: ExportTypeEnum
+    status: ExportJobStatusEnum
+    processed_rows: NonNegativeInt = 0
+    file_name: str
+    created_at: datetime
+    finished_at: datetime | None = None
+    error: str | None = None
+    download_url: str | None = None
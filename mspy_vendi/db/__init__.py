@@ -7,7 +7,8 @@ from mspy_vendi.domain.machines.models import Machine, MachineUser
 from mspy_vendi.domain.product_category.models import ProductCategory
 from mspy_vendi.domain.product_user.models import ProductUser
 from mspy_vendi.domain.products.models import Product
-from mspy_vendi.domain.sales.models import Sale
+from mspy_vendi.domain.quarantined_message.models import QuarantinedMessage
+from mspy_vendi.domain.sales.models import Sale, SaleDailyRollup
 from mspy_vendi.domain.user.models import User
 
 __all__ = (
@@ -20,7 +21,9 @@ __all__ = (
     "ProductUser",
     "ProductCategory",
     "Sale",
+    "SaleDailyRollup",
     "Impression",
     "MachineImpression",
     "EntityLog",
+    "QuarantinedMessage",
 )
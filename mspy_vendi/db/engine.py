@@ -19,6 +19,22 @@ engine: AsyncEngine = create_async_engine(
 
 AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
 
+
+def configure_pool(pool_size: int, max_overflow: int) -> None:
+    """
+    Replace the engine of the sessions with one of the given pool size, e.g. for a consumer process
+    whose connections are sized by its workers rather than by `DATABASE_POOL_SIZE`.
+    The previous engine doesn't hold connections until it's used, so it must be called before the first session.
+
+    :param pool_size: Connections kept open in the pool.
+    :param max_overflow: Connections opened above the pool size when all of them are in use.
+    """
+    global engine
+
+    engine = create_async_engine(config.db.db_url, pool_size=pool_size, max_overflow=max_overflow)
+    AsyncSessionLocal.configure(bind=engine)
+
+
 # Ideally for tests
 AsyncScopedSession = async_scoped_session(AsyncSessionLocal, scopefunc=current_task)
 
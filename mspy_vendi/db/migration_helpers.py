@@ -68,3 +68,15 @@ def extension_exist(extension_name) -> bool:
     query_string = f"""SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = '{extension_name}');"""
     result = conn.execute(text(query_string))
     return result.scalar_one()
+
+
+def index_is_valid(name: str) -> bool:
+    conn = op.get_bind()
+    query_string = f"""
+        SELECT EXISTS(
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = '{name}' AND i.indisvalid
+        );
+    """
+    result = conn.execute(text(query_string))
+    return result.scalar_one()
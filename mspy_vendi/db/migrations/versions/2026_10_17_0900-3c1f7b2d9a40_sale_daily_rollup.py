@@ -0,0 +1,77 @@
+"""sale-daily-rollup
+
+Revision ID: 3c1f7b2d9a40
+Revises: 8f93580f5a06
+Create Date: 2026-10-17 09:00:12.418305
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from mspy_vendi.db.migration_helpers import index_exists, table_exists
+
+# revision identifiers, used by Alembic.
+revision = "3c1f7b2d9a40"
+down_revision = "8f93580f5a06"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not table_exists("sale_daily_rollup"):
+        op.create_table(
+            "sale_daily_rollup",
+            sa.Column("sale_date", sa.Date(), nullable=False),
+            sa.Column("quantity", sa.BigInteger(), nullable=False, comment="Total quantity of sold units"),
+            sa.Column("transactions_count", sa.BigInteger(), nullable=False, comment="Number of sale records"),
+            sa.Column(
+                "revenue",
+                sa.DECIMAL(precision=16, scale=2),
+                nullable=False,
+                comment="Sum of quantity * product price at the moment of aggregation",
+            ),
+            sa.Column("product_id", sa.BigInteger(), nullable=False),
+            sa.Column("machine_id", sa.BigInteger(), nullable=False),
+            sa.Column("id", sa.BigInteger(), sa.Identity(always=False, start=1, cycle=True), nullable=False),
+            sa.Column(
+                "created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+            ),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["machine_id"], ["machine.id"], onupdate="CASCADE", ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["product_id"], ["product.id"], onupdate="CASCADE", ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint(
+                "sale_date",
+                "machine_id",
+                "product_id",
+                name="uq_sale_daily_rollup_sale_date_machine_id_product_id",
+            ),
+        )
+
+        # Backfill the rollup from the existing sales, so statistics don't start from zero.
+        op.execute(
+            """
+            INSERT INTO sale_daily_rollup (sale_date, machine_id, product_id, quantity, transactions_count, revenue)
+            SELECT sale.sale_date,
+                   sale.machine_id,
+                   sale.product_id,
+                   SUM(sale.quantity),
+                   COUNT(*),
+                   COALESCE(SUM(sale.quantity * product.price), 0)
+            FROM sale
+            JOIN product ON product.id = sale.product_id
+            GROUP BY sale.sale_date, sale.machine_id, sale.product_id
+            """
+        )
+
+    if not index_exists("ix_sale_daily_rollup_machine_id"):
+        op.create_index(op.f("ix_sale_daily_rollup_machine_id"), "sale_daily_rollup", ["machine_id"])
+
+    if not index_exists("ix_sale_daily_rollup_product_id"):
+        op.create_index(op.f("ix_sale_daily_rollup_product_id"), "sale_daily_rollup", ["product_id"])
+
+
+def downgrade() -> None:
+    if table_exists("sale_daily_rollup"):
+        op.drop_table("sale_daily_rollup")
@@ -0,0 +1,57 @@
+"""sale-analytical-indexes
+
+Revision ID: 614833622255
+Revises: 3c1f7b2d9a40
+Create Date: 2026-10-17 10:00:41.907113
+
+"""
+
+from alembic import op
+
+from mspy_vendi.db.migration_helpers import index_exists, index_is_valid
+
+# revision identifiers, used by Alembic.
+revision = "614833622255"
+down_revision = "3c1f7b2d9a40"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns, covered columns)
+INDEXES: list[tuple[str, str, list[str], list[str]]] = [
+    # Date range filters of every sale statistic, with machine/product available for the joins.
+    ("ix_sale_sale_date_machine_id_product_id", "sale", ["sale_date", "machine_id", "product_id"], ["quantity"]),
+    # Users with a machine scope: nested loop from `machine_user` into the sales of each machine.
+    ("ix_sale_machine_id_sale_date", "sale", ["machine_id", "sale_date"], ["product_id", "quantity", "sale_time"]),
+    # Product filters and the product scope of a user.
+    ("ix_sale_product_id_sale_date", "sale", ["product_id", "sale_date"], ["machine_id", "quantity"]),
+    # The unique constraints start from machine_id/product_id, lookups are done by user_id.
+    ("ix_machine_user_user_id_machine_id", "machine_user", ["user_id", "machine_id"], []),
+    ("ix_product_user_user_id_product_id", "product_user", ["user_id", "product_id"], []),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns, include in INDEXES:
+            if index_exists(name) and not index_is_valid(name):
+                # Leftover of an interrupted concurrent build.
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+            if not index_exists(name):
+                op.create_index(
+                    name,
+                    table,
+                    columns,
+                    postgresql_include=include,
+                    postgresql_concurrently=True,
+                )
+
+        op.execute("ANALYZE sale")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            if index_exists(name):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,50 @@
+"""quarantined-message
+
+Revision ID: b51e0c9d27a4
+Revises: 614833622255
+Create Date: 2026-10-17 11:00:27.530196
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from mspy_vendi.db.migration_helpers import table_exists
+
+# revision identifiers, used by Alembic.
+revision = "b51e0c9d27a4"
+down_revision = "614833622255"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not table_exists("quarantined_message"):
+        op.create_table(
+            "quarantined_message",
+            sa.Column("queue_name", sa.String(), nullable=False),
+            sa.Column("message_id", sa.String(), nullable=False),
+            sa.Column("body", sa.Text(), nullable=False),
+            sa.Column(
+                "attributes",
+                postgresql.JSONB(none_as_null=True, astext_type=sa.Text()),
+                server_default=sa.text("'{}'::jsonb"),
+                nullable=False,
+            ),
+            sa.Column("receive_count", sa.Integer(), nullable=False),
+            sa.Column("error", sa.Text(), nullable=False),
+            sa.Column("replayed_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("id", sa.BigInteger(), sa.Identity(always=False, start=1, cycle=True), nullable=False),
+            sa.Column(
+                "created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+            ),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("message_id"),
+        )
+
+
+def downgrade() -> None:
+    if table_exists("quarantined_message"):
+        op.drop_table("quarantined_message")
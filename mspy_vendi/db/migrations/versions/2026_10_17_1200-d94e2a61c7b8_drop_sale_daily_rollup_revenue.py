@@ -0,0 +1,46 @@
+"""drop-sale-daily-rollup-revenue
+
+Revision ID: d94e2a61c7b8
+Revises: b51e0c9d27a4
+Create Date: 2026-10-17 12:00:41.906217
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from mspy_vendi.db.migration_helpers import table_has_column
+
+# revision identifiers, used by Alembic.
+revision = "d94e2a61c7b8"
+down_revision = "b51e0c9d27a4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if table_has_column("sale_daily_rollup", "revenue"):
+        op.drop_column("sale_daily_rollup", "revenue")
+
+
+def downgrade() -> None:
+    if not table_has_column("sale_daily_rollup", "revenue"):
+        op.add_column(
+            "sale_daily_rollup",
+            sa.Column(
+                "revenue",
+                sa.DECIMAL(precision=16, scale=2),
+                server_default="0",
+                nullable=False,
+                comment="Sum of quantity * product price at the moment of aggregation",
+            ),
+        )
+        op.execute(
+            """
+            UPDATE sale_daily_rollup
+            SET revenue = sale_daily_rollup.quantity * product.price
+            FROM product
+            WHERE product.id = sale_daily_rollup.product_id
+            """
+        )
+        op.alter_column("sale_daily_rollup", "revenue", server_default=None)
@@ -1,11 +1,10 @@
 from typing import Any
 
-from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlalchemy import VARCHAR, Select, case, cast, func, label, null, select
 from sqlalchemy.orm import joinedload
 
 from mspy_vendi.core.manager import CRUDManager
-from mspy_vendi.core.pagination import Page
+from mspy_vendi.core.pagination import Page, paginate
 from mspy_vendi.domain.activity_log.filters import ActivityLogFilter
 from mspy_vendi.domain.activity_log.models import ActivityLog
 from mspy_vendi.domain.activity_log.schemas import ExportActivityLogDetailSchema
@@ -18,21 +17,13 @@ class ActivityLogManager(CRUDManager):
     def get_query(self) -> Select:
         return super().get_query().options(joinedload(self.sql_model.user))
 
-    async def export(
-        self,
-        query_filter: ActivityLogFilter,
-        *_: Any,
-        raw_result: bool = True,
-    ) -> list[ActivityLog] | Page[ExportActivityLogDetailSchema]:
+    async def get_export_query(self, query_filter: ActivityLogFilter, *_: Any) -> Select:
         """
-        Export activity_log data.
-        This method is used to export activity_log data in different formats.
-        It returns a list of sales objects based on the filter.
+        Generate the statement of the activity_log export with the filter applied.
 
         :param query_filter: Filter object.
-        :param raw_result: A flag object indicating whether to export raw data.
 
-        :return: List of sales objects.
+        :return: Statement selecting the exported columns.
         """
         stmt = (
             select(
@@ -58,7 +49,25 @@ class ActivityLogManager(CRUDManager):
             .order_by(self.sql_model.created_at)
         )
 
-        stmt = query_filter.filter(stmt, autojoin=False)
+        return query_filter.filter(stmt, autojoin=False)
+
+    async def export(
+        self,
+        query_filter: ActivityLogFilter,
+        *_: Any,
+        raw_result: bool = True,
+    ) -> list[ActivityLog] | Page[ExportActivityLogDetailSchema]:
+        """
+        Export activity_log data.
+        This method is used to export activity_log data in different formats.
+        It returns a list of sales objects based on the filter.
+
+        :param query_filter: Filter object.
+        :param raw_result: A flag object indicating whether to export raw data.
+
+        :return: List of sales objects.
+        """
+        stmt = await self.get_export_query(query_filter)
 
         if not raw_result:
             return await paginate(self.session, stmt, unique=False)
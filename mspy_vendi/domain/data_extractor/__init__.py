@@ -1,5 +1,12 @@
-from .base import BaseDataExtractorClient
-from .csv import CSVDataExtractor
-from .excel import ExcelDataExtractor
+from .base import BaseDataExtractorClient, BaseStreamingDataExtractorClient
+from .csv import CSVDataExtractor, StreamingCSVDataExtractor
+from .excel import ExcelDataExtractor, StreamingExcelDataExtractor
 
-__all__ = ("CSVDataExtractor", "ExcelDataExtractor", "BaseDataExtractorClient")
+__all__ = (
+    "CSVDataExtractor",
+    "ExcelDataExtractor",
+    "StreamingCSVDataExtractor",
+    "StreamingExcelDataExtractor",
+    "BaseDataExtractorClient",
+    "BaseStreamingDataExtractorClient",
+)
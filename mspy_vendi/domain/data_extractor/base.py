@@ -1,6 +1,8 @@
-from typing import Any, Generic, TypeVar
+import asyncio
+import tempfile
+from typing import IO, Any, Awaitable, Callable, Generic, Sequence, TypeVar
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 
 DataType = TypeVar("DataType", bound=Any)
 ReturnType = TypeVar("ReturnType", bound=Any)
@@ -19,3 +21,73 @@ class BaseDataExtractorClient(Generic[DataType, ReturnType]):
 
     async def extract(self, data: DataType) -> ReturnType:
         raise NotImplementedError
+
+
+class BaseStreamingDataExtractorClient(BaseDataExtractorClient[AsyncResult, IO[bytes]]):
+    """
+    Base class for extractors writing the rows of a streamed result into an anonymous temporary file.
+
+    The rows are never collected in memory: every partition of the result is written before the next one is fetched.
+    Child classes implement `write_rows` and `finish`, optionally `write_header`.
+    """
+
+    suffix: str = ""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+
+        self.file: IO[bytes] = tempfile.TemporaryFile(suffix=self.suffix)
+        self.columns: list[str] = []
+
+    def write_header(self) -> None:
+        pass
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        raise NotImplementedError
+
+    def finish(self) -> None:
+        pass
+
+    def close(self) -> IO[bytes]:
+        """
+        Finish the file.
+
+        :return: Temporary file, positioned at the start. The caller must close it.
+        """
+        self.finish()
+        self.file.seek(0)
+
+        return self.file
+
+    async def extract(
+        self,
+        data: AsyncResult,
+        on_progress: Callable[[int], Awaitable[Any]] | None = None,
+    ) -> IO[bytes]:
+        """
+        Write the streamed result into the file.
+
+        :param data: Result of `AsyncSession.stream`. Its `yield_per` option defines the size of the partitions.
+        :param on_progress: Callback receiving the count of written rows after every partition.
+
+        :return: Temporary file, positioned at the start. The caller must close it.
+        """
+        self.columns = list(data.keys())
+        written_rows: int = 0
+
+        try:
+            self.write_header()
+
+            async for rows in data.partitions():
+                # Rendering is CPU bound, so it doesn't block the event loop while the next partition is awaited.
+                await asyncio.to_thread(self.write_rows, rows)
+                written_rows += len(rows)
+
+                if on_progress:
+                    await on_progress(written_rows)
+
+            return await asyncio.to_thread(self.close)
+
+        except BaseException:
+            self.file.close()
+            raise
@@ -1,23 +1,67 @@
+import csv
 import io
+from typing import Any, Sequence
 
 import pandas as pd
 
-from .base import BaseDataExtractorClient
+from mspy_vendi.core.process_pool import dump_data_frame, load_data_frame, run_in_process_pool
+
+from .base import BaseDataExtractorClient, BaseStreamingDataExtractorClient
+
+
+def _render_csv(chunks: list[bytes]) -> io.BytesIO:
+    data: pd.DataFrame = load_data_frame(chunks)
+    response_bytes = io.BytesIO()
+
+    data.to_csv(response_bytes, index=False)
+
+    response_bytes.seek(0)
+
+    return response_bytes
 
 
 class CSVDataExtractor(BaseDataExtractorClient[pd.DataFrame, io.BytesIO]):
     async def extract(self, data: pd.DataFrame) -> io.BytesIO:
         """
         Extract data from the Excel file and provide the Buffer with the actual file.
+        The file is rendered in the process pool, so the event loop isn't blocked.
 
         :param data: DataFrame with the data.
 
         :return: Buffer with the actual file.
         """
-        response_bytes = io.BytesIO()
+        return await run_in_process_pool(_render_csv, await dump_data_frame(data))
+
+
+class StreamingCSVDataExtractor(BaseStreamingDataExtractorClient):
+    """
+    Write the rows of a streamed result into a CSV file in constant memory.
+    The format is the same as `DataFrame.to_csv` produces.
+    """
 
-        data.to_csv(response_bytes, index=False)
+    suffix: str = ".csv"
 
-        response_bytes.seek(0)
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
 
-        return response_bytes
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator="\n")
+
+    def _flush(self) -> None:
+        self.file.write(self.buffer.getvalue().encode())
+
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+    def write_header(self) -> None:
+        self.writer.writerow(self.columns)
+        self._flush()
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """
+        Append the rows to the file.
+
+        :param rows: Rows with the values in the order of the columns.
+        """
+        self.writer.writerows(rows)
+        self._flush()
@@ -1,24 +1,121 @@
 import io
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Sequence
 
 import pandas as pd
+import xlsxwriter
+from xlsxwriter.format import Format
+from xlsxwriter.worksheet import Worksheet
 
-from .base import BaseDataExtractorClient
+from mspy_vendi.core.process_pool import dump_data_frame, load_data_frame, run_in_process_pool
+
+from .base import BaseDataExtractorClient, BaseStreamingDataExtractorClient
+
+# Rows of one worksheet including the header, the limit of the XLSX format.
+MAX_WORKSHEET_ROWS: int = 1_048_576
+
+
+def _render_excel(chunks: list[bytes]) -> io.BytesIO:
+    data: pd.DataFrame = load_data_frame(chunks)
+    response_bytes = io.BytesIO()
+
+    with pd.ExcelWriter(response_bytes, engine="xlsxwriter") as writer:
+        data.to_excel(writer, index=False)
+
+    response_bytes.seek(0)
+
+    return response_bytes
 
 
 class ExcelDataExtractor(BaseDataExtractorClient[pd.DataFrame, io.BytesIO]):
     async def extract(self, data: pd.DataFrame) -> io.BytesIO:
         """
         Extract data from the CSV file and provide the Buffer with the actual file.
+        The file is rendered in the process pool, so the event loop isn't blocked.
 
         :param data: DataFrame with the data.
 
         :return: Buffer with the actual file.
         """
-        response_bytes = io.BytesIO()
+        return await run_in_process_pool(_render_excel, await dump_data_frame(data))
+
+
+class StreamingExcelDataExtractor(BaseStreamingDataExtractorClient):
+    """
+    Write the rows of a streamed result into an XLSX file in constant memory.
+
+    Unlike `ExcelDataExtractor`, the rows are never collected into a DataFrame: every partition of the result is
+    written and flushed to disk by xlsxwriter's `constant_memory` mode before the next one is fetched.
+    If the rows don't fit into one worksheet, the next worksheet is started.
+    """
+
+    suffix: str = ".xlsx"
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+
+        self.workbook = xlsxwriter.Workbook(self.file, {"constant_memory": True})
+
+        # The same formats as `DataFrame.to_excel` uses.
+        self.header_format: Format = self.workbook.add_format(
+            {"bold": True, "border": 1, "align": "center", "valign": "top"}
+        )
+        self.formats: dict[type, Format] = {
+            datetime: self.workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"}),
+            date: self.workbook.add_format({"num_format": "yyyy-mm-dd"}),
+        }
+
+        self.worksheet: Worksheet | None = None
+        self.row_number: int = 0
+
+    def _add_worksheet(self) -> None:
+        self.worksheet = self.workbook.add_worksheet()
+        self.worksheet.write_row(0, 0, self.columns, self.header_format)
+        self.row_number = 1
+
+    def _write_value(self, row_number: int, column_number: int, value: Any) -> None:
+        if value is None:
+            return
+
+        if isinstance(value, (datetime, date)):
+            # `datetime` is a subclass of `date`, so the format is looked up by the exact type.
+            self.worksheet.write_datetime(row_number, column_number, value, self.formats[type(value)])
+
+        elif isinstance(value, time):
+            # `DataFrame.to_excel` writes times as text, the files are kept the same.
+            self.worksheet.write_string(row_number, column_number, value.isoformat())
+
+        elif isinstance(value, Enum):
+            self.worksheet.write(row_number, column_number, value.value)
+
+        elif isinstance(value, Decimal):
+            self.worksheet.write_number(row_number, column_number, float(value))
+
+        elif isinstance(value, (str, int, float, bool)):
+            self.worksheet.write(row_number, column_number, value)
+
+        else:
+            self.worksheet.write_string(row_number, column_number, str(value))
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """
+        Append the rows to the current worksheet.
+
+        :param rows: Rows with the values in the order of the columns.
+        """
+        for row in rows:
+            if self.worksheet is None or self.row_number == MAX_WORKSHEET_ROWS:
+                self._add_worksheet()
+
+            for column_number, value in enumerate(row):
+                self._write_value(self.row_number, column_number, value)
 
-        with pd.ExcelWriter(response_bytes, engine="xlsxwriter") as writer:
-            data.to_excel(writer, index=False)
+            self.row_number += 1
 
-        response_bytes.seek(0)
+    def finish(self) -> None:
+        if self.worksheet is None:
+            self._add_worksheet()
 
-        return response_bytes
+        self.workbook.close()
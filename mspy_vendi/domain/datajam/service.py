@@ -5,6 +5,7 @@ import sentry_sdk
 from sentry_sdk.integrations.logging import ignore_logger
 
 from mspy_vendi.config import config, log
+from mspy_vendi.core.cache import bump_data_version
 from mspy_vendi.core.constants import DEFAULT_DATAJAM_DATE
 from mspy_vendi.core.exceptions.base_exception import BadRequestError
 from mspy_vendi.db.engine import get_db_session
@@ -175,6 +176,8 @@ class DataJamService:
                     ]
                 )
 
+            await bump_data_version()
+
         except BadRequestError as err:
             log.info(
                 "Error processing data from DataJam API. Continue fetching",
@@ -0,0 +1,107 @@
+from redis.exceptions import RedisError
+from sqlalchemy import ARRAY, BigInteger, ColumnElement, Select, any_, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mspy_vendi.config import config, log
+from mspy_vendi.core.cache import redis_client
+from mspy_vendi.domain.entitlements.schemas import UserEntitlementSchema
+from mspy_vendi.domain.machine_user.manager import MachineUserManager
+from mspy_vendi.domain.product_user.manager import ProductUserManager
+from mspy_vendi.domain.user.models import User
+from mspy_vendi.domain.user.schemas import UserScheduleSchema
+
+
+class EntitlementManager:
+    """
+    Resolves the machines and products assigned to a user.
+
+    The result is memoized for the lifetime of the manager (one request) and cached in Redis under the current
+    entitlement version of the user. Any change of the assignments bumps the version, so stale entries are never read
+    and simply expire.
+    """
+
+    version_key_template: str = "entitlement:version:{user_id}"
+    entitlement_key_template: str = "entitlement:{user_id}:{version}"
+
+    def __init__(self, session: AsyncSession):
+        self.machine_user_manager = MachineUserManager(session)
+        self.product_user_manager = ProductUserManager(session)
+        self._entitlements: dict[int, UserEntitlementSchema] = {}
+
+    async def get_user_entitlement(self, user: User | UserScheduleSchema) -> UserEntitlementSchema:
+        """
+        Get the machines and products assigned to the user.
+
+        :param user: Current user.
+
+        :return: Entitlement of the user.
+        """
+        if entitlement := self._entitlements.get(user.id):
+            return entitlement
+
+        try:
+            version: str = await redis_client.get(self.version_key_template.format(user_id=user.id)) or "0"
+            entitlement_key: str = self.entitlement_key_template.format(user_id=user.id, version=version)
+
+            if cached_entitlement := await redis_client.get(entitlement_key):
+                entitlement = UserEntitlementSchema.model_validate_json(cached_entitlement)
+
+            else:
+                entitlement = await self._load_user_entitlement(user.id)
+                await redis_client.set(
+                    entitlement_key, entitlement.model_dump_json(), ex=config.redis.entitlement_cache_ttl
+                )
+
+        except RedisError as exc:
+            log.warning("Entitlement cache is unavailable, loading from the database", exception=str(exc))
+            entitlement = await self._load_user_entitlement(user.id)
+
+        self._entitlements[user.id] = entitlement
+
+        return entitlement
+
+    async def _load_user_entitlement(self, user_id: int) -> UserEntitlementSchema:
+        return UserEntitlementSchema(
+            machine_ids=await self.machine_user_manager.get_machines_for_user(user_id=user_id),
+            product_ids=await self.product_user_manager.get_products_for_user(user_id=user_id),
+        )
+
+    @classmethod
+    async def invalidate(cls, user_id: int) -> None:
+        """
+        Bump the entitlement version of the user, so the next request resolves the assignments again.
+        It must be called after the assignments are committed.
+
+        :param user_id: The user ID.
+        """
+        try:
+            await redis_client.incr(cls.version_key_template.format(user_id=user_id))
+
+        except RedisError as exc:
+            log.error("Failed to invalidate the entitlement cache", user_id=user_id, exception=str(exc))
+
+    @staticmethod
+    def generate_entitlement_query(
+        stmt: Select,
+        entitlement: UserEntitlementSchema,
+        machine_id_column: ColumnElement | None = None,
+        product_id_column: ColumnElement | None = None,
+    ) -> Select:
+        """
+        Restrict the statement to the machines and products of the entitlement.
+        The predicates are applied as `column = ANY(:ids)` on the provided columns, so no extra joins are required.
+
+        :param stmt: Current statement.
+        :param entitlement: Entitlement of the user.
+        :param machine_id_column: Column with the machine ID. Machines aren't restricted if it isn't provided.
+        :param product_id_column: Column with the product ID. Products aren't restricted if it isn't provided.
+
+        :return: New statement with the entitlement applied.
+        """
+        if machine_id_column is not None:
+            stmt = stmt.where(machine_id_column == any_(literal(entitlement.machine_ids, ARRAY(BigInteger))))
+
+        if product_id_column is not None:
+            stmt = stmt.where(product_id_column == any_(literal(entitlement.product_ids, ARRAY(BigInteger))))
+
+        return stmt
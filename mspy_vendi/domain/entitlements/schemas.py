@@ -0,0 +1,12 @@
+from pydantic import PositiveInt
+
+from mspy_vendi.core.schemas import BaseSchema
+
+
+class UserEntitlementSchema(BaseSchema):
+    """
+    Machines and products the user is allowed to see.
+    """
+
+    machine_ids: list[PositiveInt] = []
+    product_ids: list[PositiveInt] = []
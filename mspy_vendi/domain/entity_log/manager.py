@@ -1,6 +1,35 @@
+from typing import Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+
+from mspy_vendi.core.exceptions.base_exception import raise_db_error
 from mspy_vendi.core.manager import CRUDManager
 from mspy_vendi.domain.entity_log.models import EntityLog
+from mspy_vendi.domain.entity_log.schemas import EntityLogCreateSchema
 
 
 class EntityLogManager(CRUDManager):
     sql_model = EntityLog
+
+    async def create_batch(self, objs: Sequence[EntityLogCreateSchema], autocommit: bool = True) -> None:
+        """
+        Create several entity logs with one statement.
+
+        :param objs: Entity logs to create.
+        :param autocommit: If True, commit changes immediately, otherwise flush changes.
+        """
+        if not objs:
+            return
+
+        try:
+            await self.session.execute(insert(self.sql_model).values([obj.model_dump() for obj in objs]))
+
+            if autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+
+        except DBAPIError as ex:
+            await self.session.rollback()
+            raise_db_error(ex)
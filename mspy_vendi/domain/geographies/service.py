@@ -1,8 +1,9 @@
+from mspy_vendi.core.mixins.entity_version import EntityVersionMixin
 from mspy_vendi.core.service import CRUDService
 from mspy_vendi.domain.geographies.filters import GeographyFilter
 from mspy_vendi.domain.geographies.manager import GeographyManager
 
 
-class GeographyService(CRUDService):
+class GeographyService(EntityVersionMixin, CRUDService):
     manager_class = GeographyManager
     filter_class = GeographyFilter
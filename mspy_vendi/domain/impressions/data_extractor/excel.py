@@ -1,9 +1,8 @@
 from datetime import date, datetime
-from io import BytesIO
 
-import pandas as pd
 from pandas.core.interchange.dataframe_protocol import DataFrame
 
+from mspy_vendi.core.process_pool import read_excel
 from mspy_vendi.domain.data_extractor import BaseDataExtractorClient
 from mspy_vendi.domain.impressions.manager import ImpressionManager
 from mspy_vendi.domain.impressions.schemas import ExcelImpressionCreateSchema, ImpressionsBulkCreateResponseSchema
@@ -50,7 +49,7 @@ class ExcelDataExtractor(BaseDataExtractorClient[bytes, ImpressionsBulkCreateRes
         :return: Result of the bulk insert operation.
         """
         impression_manager: ImpressionManager = ImpressionManager(self.session)
-        data_frame: DataFrame = pd.read_excel(BytesIO(data), header=0)
+        data_frame: DataFrame = await read_excel(data, header=0)
 
         self._transform_data_frame(data_frame)
 
@@ -1,16 +1,34 @@
-from datetime import date, timedelta
+from datetime import date, datetime
 from typing import Any
 
-from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import CTE, ColumnClause, Date, Label, Row, Select, asc, cast, desc, func, label, select, text
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import (
+    CTE,
+    ColumnClause,
+    ColumnElement,
+    Date,
+    Label,
+    Row,
+    Select,
+    asc,
+    cast,
+    desc,
+    func,
+    label,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from mspy_vendi.core.cache import cached_statistic
 from mspy_vendi.core.enums.date_range import DateRangeEnum
 from mspy_vendi.core.exceptions.base_exception import NotFoundError
 from mspy_vendi.core.filter import BaseFilter
+from mspy_vendi.core.helpers import get_previous_month_range, set_end_of_day_time
 from mspy_vendi.core.manager import CRUDManager, Model, Schema
-from mspy_vendi.core.pagination import Page
+from mspy_vendi.core.pagination import Page, paginate
+from mspy_vendi.core.schemas import BulkUpsertResultSchema
 from mspy_vendi.db import Impression
+from mspy_vendi.domain.entitlements.manager import EntitlementManager
 from mspy_vendi.domain.geographies.models import Geography
 from mspy_vendi.domain.impressions.filters import ExportImpressionFilter, ImpressionFilter
 from mspy_vendi.domain.impressions.schemas import (
@@ -34,10 +52,17 @@ from mspy_vendi.domain.sales.models import Sale
 from mspy_vendi.domain.user.models import User
 from mspy_vendi.domain.user.schemas import UserScheduleSchema
 
+# Fields applied by the period statistic queries on their own, without modifying the filter object.
+PERIOD_STATISTIC_EXCLUDED_FIELDS: tuple[str, ...] = ("date_from", "date_to", "geography_id__in")
+
 
 class ImpressionManager(CRUDManager):
     sql_model = Impression
 
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+        self.entitlement_manager = EntitlementManager(session)
+
     async def get(
         self, obj_id: int, *, raise_error: bool = True, user: User | None = None, **_: Any
     ) -> Impression | None:
@@ -88,24 +113,14 @@ class ImpressionManager(CRUDManager):
     async def create_batch(self, obj: list[ImpressionCreateSchema]) -> ImpressionsBulkCreateResponseSchema:
         """
         Create a batch of impressions in the database.
+        Impressions of the same source system ID and type which already exist are skipped.
 
         :param obj: A list of impressions to create.
         :return: ImpressionsBulkCreateResponseSchema
         """
-        count_stmt: Select = select(func.count()).select_from(self.sql_model)
-        existing_records: list[int] = await self.session.scalar(count_stmt)
-        try:
-            stmt = insert(self.sql_model).on_conflict_do_nothing(constraint="uq_impression_source_system_id_type")
-
-            await self.session.execute(stmt, [item.model_dump() for item in obj])
-            await self.session.commit()
-
-        except Exception as ex:
-            await self.session.rollback()
-            raise ex
+        result: BulkUpsertResultSchema = await self.bulk_upsert(obj, "uq_impression_source_system_id_type")
 
-        updated_records: list[int] = await self.session.scalar(count_stmt)
-        return ImpressionsBulkCreateResponseSchema(initial_records=existing_records, final_records=updated_records)
+        return ImpressionsBulkCreateResponseSchema.model_validate(result.model_dump())
 
     def _generate_geography_query(
         self, query_filter: BaseFilter, stmt: Select, *, modify_filter: bool = True
@@ -163,11 +178,7 @@ class ImpressionManager(CRUDManager):
         :param query_filter: The original SaleFilter instance.
         :return: A new SaleFilter with date_from and date_to set to the previous month's range.
         """
-        current_date = query_filter.date_from
-        first_day_of_current_month = current_date.replace(day=1)
-
-        last_day_of_previous_month = first_day_of_current_month - timedelta(days=1)
-        first_day_of_previous_month = last_day_of_previous_month.replace(day=1)
+        first_day_of_previous_month, last_day_of_previous_month = get_previous_month_range(query_filter.date_from)
 
         return ImpressionFilter(
             date_from=first_day_of_previous_month,
@@ -175,6 +186,30 @@ class ImpressionManager(CRUDManager):
             **query_filter.model_dump(exclude={"date_from", "date_to"}),
         )
 
+    @staticmethod
+    def _generate_period_conditions(
+        query_filter: ImpressionFilter,
+        date_column: ColumnElement,
+    ) -> tuple[ColumnElement, ColumnElement, ColumnElement]:
+        """
+        Generate conditions for the requested period and the previous month,
+        so both statistics can be calculated in one query with `FILTER (WHERE ...)`.
+
+        :param query_filter: Filter object, it isn't modified.
+        :param date_column: Date column to compare.
+
+        :return: Conditions for the current period, the previous month and the range covering both.
+        """
+        date_to: datetime = set_end_of_day_time(query_filter.date_to)
+        previous_date_from, previous_date_to = get_previous_month_range(query_filter.date_from)
+        previous_date_to = set_end_of_day_time(previous_date_to)
+
+        return (
+            date_column.between(query_filter.date_from, date_to),
+            date_column.between(previous_date_from, previous_date_to),
+            date_column.between(min(previous_date_from, query_filter.date_from), max(previous_date_to, date_to)),
+        )
+
     @staticmethod
     def _generate_date_range_cte(time_frame: DateRangeEnum, query_filter: ImpressionFilter) -> CTE:
         """
@@ -250,8 +285,9 @@ class ImpressionManager(CRUDManager):
 
             return (await self.session.scalars(stmt)).all()  # type: ignore
 
-        return await paginate(self.session, stmt)
+        return await self.get_page(stmt, query_filter.order_by if query_filter else None)
 
+    @cached_statistic
     async def get_impressions_per_range(
         self, time_frame: DateRangeEnum, query_filter: ImpressionFilter, user: User
     ) -> Page[TimeFrameImpressionsSchema]:
@@ -287,6 +323,7 @@ class ImpressionManager(CRUDManager):
 
         return await paginate(self.session, final_stmt)
 
+    @cached_statistic
     async def get_impressions_per_geography(
         self,
         query_filter: ImpressionFilter,
@@ -337,28 +374,27 @@ class ImpressionManager(CRUDManager):
 
         return await paginate(self.session, stmt, unique=False)
 
-    async def export(
-        self,
-        query_filter: ExportImpressionFilter,
-        user: User | UserScheduleSchema,
-        raw_result: bool = True,
-    ) -> list[Impression] | Page[ExportImpressionDetailSchema]:
+    def _get_export_column_mapping(self) -> dict[str, Label]:
         """
-        Export impression data. This method is used to export sales data in different formats.
-        It returns a list of sales objects based on the filter.
+        Columns of the extra ordering fields of the impressions export.
+        """
+        return {
+            "venue": label("Machine Name", Machine.machine_name),
+            "geography": label("Geography", Geography.name),
+            "impressions": label("Impressions", self.sql_model.total_impressions),
+            "device_number": label("Device Number", self.sql_model.device_number),
+            "date": label("Date", self.sql_model.date),
+        }
+
+    async def get_export_query(self, query_filter: ExportImpressionFilter, user: User | UserScheduleSchema) -> Select:
+        """
+        Generate the statement of the impressions export with the filter and ordering applied.
 
         :param query_filter: Filter object.
         :param user: User object.
-        :param raw_result: A flag object indicating whether to export raw data.
 
-        :return: List of sales objects.
+        :return: Statement selecting the exported columns.
         """
-        venue_order_field: str = "venue"
-        geography_order_field: str = "geography"
-        impressions_order_field: str = "impressions"
-        device_number_order_field: str = "device_number"
-        date_order_field: str = "date"
-
         stmt = (
             select(
                 label("Impression ID", self.sql_model.id),
@@ -385,59 +421,65 @@ class ImpressionManager(CRUDManager):
 
         stmt = query_filter.filter(stmt)
 
-        column_mapping = {
-            venue_order_field: label("Machine Name", Machine.machine_name),
-            geography_order_field: label("Geography", Geography.name),
-            impressions_order_field: label("Impressions", self.sql_model.total_impressions),
-            device_number_order_field: label("Device Number", self.sql_model.device_number),
-            date_order_field: label("Date", self.sql_model.date),
-        }
+        return self.sort_additional_fields(self._get_export_column_mapping(), query_filter, stmt)
 
-        stmt = self.sort_additional_fields(column_mapping, query_filter, stmt)
+    async def export(
+        self,
+        query_filter: ExportImpressionFilter,
+        user: User | UserScheduleSchema,
+        raw_result: bool = True,
+    ) -> list[Impression] | Page[ExportImpressionDetailSchema]:
+        """
+        Export impression data. This method is used to export sales data in different formats.
+        It returns a list of sales objects based on the filter.
+
+        :param query_filter: Filter object.
+        :param user: User object.
+        :param raw_result: A flag object indicating whether to export raw data.
+
+        :return: List of sales objects.
+        """
+        # The extra ordering fields are removed from the filter, but cursor pagination still needs them.
+        order_by: list[str] = list(query_filter.order_by or [])
+
+        stmt = await self.get_export_query(query_filter, user)
 
         if not raw_result:
-            return await paginate(self.session, stmt)
+            return await self.get_page(stmt, order_by, self._get_export_column_mapping())
 
         return (await self.session.execute(stmt)).mappings().all()  # type: ignore
 
+    @cached_statistic
     async def get_exposure(self, query_filter: ImpressionFilter, user: User) -> ExposureStatisticSchema:
         """
-        Get total seconds of exposure filtered by dates and statistic for previous month.
+        Get total seconds of exposure filtered by dates and statistic for previous month in one query.
 
         :param query_filter: Filter object.
         :param user: Current User.
 
         :return: Exposure statistic.
         """
-        stmt_seconds_exposure = label("seconds_exposure", func.sum(self.sql_model.seconds_exposure))
+        current_period, previous_month, covering_period = self._generate_period_conditions(
+            query_filter, self.sql_model.date
+        )
 
-        stmt = select(stmt_seconds_exposure)
+        stmt = select(
+            func.sum(self.sql_model.seconds_exposure).filter(current_period).label("seconds_exposure"),
+            func.sum(self.sql_model.seconds_exposure).filter(previous_month).label("previous_month_statistic"),
+        ).where(covering_period)
 
         stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False)
         stmt = self._generate_user_query(query_filter, user, stmt)
+        stmt = query_filter.filter(stmt, exclude_fields=PERIOD_STATISTIC_EXCLUDED_FIELDS)
 
-        setattr(query_filter, "geography_id__in", None)
-        stmt = query_filter.filter(stmt)
-
-        stmt_previous_month_stat = select(func.sum(self.sql_model.seconds_exposure).label("previous_month_statistic"))
-        query_filter = self.generate_previous_month_filter(query_filter)
-
-        stmt_previous_month_stat = self._generate_geography_query(
-            query_filter, stmt_previous_month_stat, modify_filter=False
-        )
-        stmt_previous_month_stat = self._generate_user_query(query_filter, user, stmt_previous_month_stat)
-
-        setattr(query_filter, "geography_id__in", None)
-        stmt_previous_month_stat = query_filter.filter(stmt_previous_month_stat)
-
-        current_month_result = await self.session.scalar(stmt) or 0
-        previous_month_result = await self.session.scalar(stmt_previous_month_stat) or 0
+        row: Row = (await self.session.execute(stmt)).one()
 
         return ExposureStatisticSchema(
-            seconds_exposure=current_month_result,
-            previous_month_statistic=previous_month_result,
+            seconds_exposure=row.seconds_exposure or 0,
+            previous_month_statistic=row.previous_month_statistic or 0,
         )
 
+    @cached_statistic
     async def get_exposure_per_range(
         self,
         time_frame: DateRangeEnum,
@@ -476,6 +518,7 @@ class ImpressionManager(CRUDManager):
 
         return await paginate(self.session, final_stmt)
 
+    @cached_statistic
     async def get_average_impressions_count(
         self,
         query_filter: ImpressionFilter,
@@ -525,12 +568,14 @@ class ImpressionManager(CRUDManager):
             impressions=getattr(row, "impressions", 0) or 0,
         )
 
+    @cached_statistic
     async def get_advert_playouts(self, query_filter: ImpressionFilter, user: User) -> AdvertPlayoutsStatisticsSchema:
         """
-        Calculate the total number of advert playouts for a given time range.
+        Calculate the total number of advert playouts for a given time range and the previous month.
 
         This method performs the following:
-        - Calculates the sum of advert playouts (`advert_playouts`) within the specified time range.
+        - Calculates the sum of advert playouts (`advert_playouts`) within the specified time range
+          and within the previous month in one query.
         - Applies filters for geography, user context, and other criteria defined in the `query_filter` object.
 
         :param query_filter: Filter object containing criteria for impressions data.
@@ -538,21 +583,27 @@ class ImpressionManager(CRUDManager):
 
         :return: An instance of `AdvertPlayoutsStatisticsSchema` containing the total count of advert playouts.
         """
-        stmt_sum_advert_playouts = label("advert_playouts", func.sum(self.sql_model.advert_playouts))
+        current_period, previous_month, covering_period = self._generate_period_conditions(
+            query_filter, self.sql_model.date
+        )
 
-        stmt = select(stmt_sum_advert_playouts)
+        stmt = select(
+            func.sum(self.sql_model.advert_playouts).filter(current_period).label("advert_playouts"),
+            func.sum(self.sql_model.advert_playouts).filter(previous_month).label("previous_month_statistic"),
+        ).where(covering_period)
 
         stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False)
         stmt = self._generate_user_query(query_filter, user, stmt)
+        stmt = query_filter.filter(stmt, exclude_fields=PERIOD_STATISTIC_EXCLUDED_FIELDS)
 
-        setattr(query_filter, "geography_id__in", None)
-        stmt = query_filter.filter(stmt)
-
-        result = await self.session.execute(stmt)
-        row = result.one()
+        row: Row = (await self.session.execute(stmt)).one()
 
-        return AdvertPlayoutsStatisticsSchema(advert_playouts=getattr(row, "advert_playouts", 0) or 0)
+        return AdvertPlayoutsStatisticsSchema(
+            advert_playouts=row.advert_playouts or 0,
+            previous_month_statistic=row.previous_month_statistic or 0,
+        )
 
+    @cached_statistic
     async def get_advert_playouts_per_range(
         self,
         time_frame: DateRangeEnum,
@@ -591,6 +642,7 @@ class ImpressionManager(CRUDManager):
 
         return await paginate(self.session, final_stmt)
 
+    @cached_statistic
     async def get_average_exposure(self, query_filter: ImpressionFilter, user: User) -> AverageExposureSchema:
         """
         Get an average time of exposure.
@@ -615,6 +667,7 @@ class ImpressionManager(CRUDManager):
 
         return AverageExposureSchema(seconds_exposure=row.seconds_exposure)
 
+    @cached_statistic
     async def get_impressions_by_venue_per_range(
         self, time_frame: DateRangeEnum, query_filter: ImpressionFilter, user: User
     ) -> Page[TimeFrameImpressionsByVenueSchema]:
@@ -675,6 +728,7 @@ class ImpressionManager(CRUDManager):
 
         return await paginate(self.session, final_stmt)
 
+    @cached_statistic
     async def get_impressions_sales_playouts_convertion_per_range(
         self,
         time_frame: DateRangeEnum,
@@ -3,9 +3,11 @@ from typing import Annotated
 from fastapi import Depends, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from mspy_vendi.core.cache import bump_data_version
 from mspy_vendi.core.email import MailGunService
-from mspy_vendi.core.enums import ExportEntityTypeEnum
+from mspy_vendi.core.enums import ExportEntityTypeEnum, ImpressionDashboardWidgetEnum
 from mspy_vendi.core.enums.date_range import DateRangeEnum
+from mspy_vendi.core.mixins.dashboard import DashboardMixin
 from mspy_vendi.core.mixins.export import ExportMixin
 from mspy_vendi.core.pagination import Page
 from mspy_vendi.core.service import CRUDService
@@ -31,9 +33,21 @@ from mspy_vendi.domain.impressions.schemas import (
 from mspy_vendi.domain.user.models import User
 
 
-class ImpressionService(CRUDService, ExportMixin):
+class ImpressionService(CRUDService, ExportMixin, DashboardMixin):
     manager_class = ImpressionManager
     filter_class = ImpressionFilter
+    dashboard_widgets = {
+        ImpressionDashboardWidgetEnum.IMPRESSIONS_PER_RANGE: "get_impressions_per_range",
+        ImpressionDashboardWidgetEnum.IMPRESSIONS_PER_GEOGRAPHY: "get_impressions_per_geography",
+        ImpressionDashboardWidgetEnum.EXPOSURE: "get_exposure",
+        ImpressionDashboardWidgetEnum.EXPOSURE_PER_RANGE: "get_exposure_per_range",
+        ImpressionDashboardWidgetEnum.AVERAGE_IMPRESSIONS: "get_average_impressions_count",
+        ImpressionDashboardWidgetEnum.ADVERT_PLAYOUTS_PER_RANGE: "get_advert_playouts_per_range",
+        ImpressionDashboardWidgetEnum.ADVERT_PLAYOUTS: "get_advert_playouts",
+        ImpressionDashboardWidgetEnum.AVERAGE_EXPOSURE: "get_average_exposure",
+        ImpressionDashboardWidgetEnum.IMPRESSIONS_BY_VENUE_PER_RANGE: "get_impressions_by_venue_per_range",
+        ImpressionDashboardWidgetEnum.MONTH_ON_MONTH_SUMMARY: "get_impressions_sales_playouts_convertion_per_range",
+    }
 
     def __init__(
         self,
@@ -94,13 +108,7 @@ class ImpressionService(CRUDService, ExportMixin):
         return await self.manager.get_average_exposure(query_filter, user)
 
     async def get_advert_playouts(self, query_filter: ImpressionFilter, user: User) -> AdvertPlayoutsStatisticsSchema:
-        prev_month_filter = self.manager.generate_previous_month_filter(query_filter)
-        prev_month_res: AdvertPlayoutsStatisticsSchema = await self.manager.get_advert_playouts(prev_month_filter, user)
-        res: AdvertPlayoutsStatisticsSchema = await self.manager.get_advert_playouts(query_filter, user)
-        return AdvertPlayoutsStatisticsSchema(
-            previous_month_statistic=prev_month_res.advert_playouts,
-            **res.model_dump(exclude={"previous_month_statistic"}),
-        )
+        return await self.manager.get_advert_playouts(query_filter, user)
 
     async def get_impressions_by_venue_per_range(
         self,
@@ -132,4 +140,8 @@ class ImpressionService(CRUDService, ExportMixin):
         data_extractor: BaseDataExtractorClient = DataTransformFactory.transform(
             session=self.db_session, file_type=file_type
         )
-        return await data_extractor.extract(binary_data)
+        result: ImpressionsBulkCreateResponseSchema = await data_extractor.extract(binary_data)
+
+        await bump_data_version()
+
+        return result
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Annotated
 
 import sentry_sdk
@@ -7,11 +7,12 @@ from taskiq import Context, TaskiqDepends
 
 from mspy_vendi.broker import broker
 from mspy_vendi.config import log
-from mspy_vendi.core.constants import DEFAULT_SCHEDULE_TIMEDELTA
+from mspy_vendi.core.constants import DEFAULT_SCHEDULE_RESOLUTION, DEFAULT_SCHEDULE_TIMEDELTA
 from mspy_vendi.core.enums import ExportTypeEnum
 from mspy_vendi.core.enums.date_range import ScheduleEnum
 from mspy_vendi.core.enums.export import ExportEntityTypeEnum
-from mspy_vendi.domain.impressions.filters import GeographyFilter, ScheduleGeographyFilter
+from mspy_vendi.core.helpers import truncate_datetime
+from mspy_vendi.domain.impressions.filters import ExportImpressionFilter, GeographyFilter, ScheduleGeographyFilter
 from mspy_vendi.domain.impressions.service import ImpressionService
 from mspy_vendi.domain.user.schemas import UserScheduleSchema
 
@@ -41,12 +42,14 @@ async def export_impression_task(
     :param impression_service: ImpressionService
     """
     try:
-        current_time: datetime = datetime.now()
+        # Every task of the tick gets the same window, so the report is computed once per filter and entitlement.
+        tick: datetime = truncate_datetime(datetime.now(), DEFAULT_SCHEDULE_RESOLUTION[schedule])
 
         query_filter: ScheduleGeographyFilter = ScheduleGeographyFilter(
             geography_id__in=query_filter.geography_id__in,
-            date_from=current_time - DEFAULT_SCHEDULE_TIMEDELTA[schedule],
-            date_to=current_time,
+            date_from=tick - DEFAULT_SCHEDULE_TIMEDELTA[schedule],
+            # The window ends right before the tick, a midnight `date_to` would be extended to the end of the day.
+            date_to=tick - timedelta(microseconds=1),
         )
 
         log.info(
@@ -84,3 +87,32 @@ async def export_impression_task(
             error=str(err),
         )
         sentry_sdk.capture_exception(err)
+
+
+@broker.task(task_name="export_impression_job_task")
+async def export_impression_job_task(
+    *,
+    job_id: str,
+    user: UserScheduleSchema,
+    query_filter: ExportImpressionFilter,
+    impression_service: Annotated[ImpressionService, TaskiqDepends()],
+) -> None:
+    """
+    TaskIQ task to process the impression export job requested by the user.
+    The state of the job and the file are stored in Redis, see `ExportMixin.create_export_job`.
+
+    :param job_id: ID of the export job
+    :param user: UserScheduleSchema
+    :param query_filter: ExportImpressionFilter
+    :param impression_service: ImpressionService
+    """
+    try:
+        log.info("Start the Impression export job", job_id=job_id, user_id=user.id)
+
+        await impression_service.run_export_job(job_id, query_filter, user, entity=ExportEntityTypeEnum.IMPRESSION)
+
+        log.info("Impression export job was finished", job_id=job_id, user_id=user.id)
+
+    except Exception as err:
+        log.error("Impression export job failed", job_id=job_id, user_id=user.id, error=str(err))
+        sentry_sdk.capture_exception(err)
@@ -1,9 +1,10 @@
+import asyncio
 import re
-from io import BytesIO
+from typing import Any, AsyncIterator
 
-import pandas as pd
-from pandas.core.interchange.dataframe_protocol import DataFrame
+from pydantic import TypeAdapter
 
+from mspy_vendi.core.helpers import read_excel_batches
 from mspy_vendi.domain.data_extractor.base import BaseDataExtractorClient
 from mspy_vendi.domain.machine_impression.manager import MachineImpressionManager
 from mspy_vendi.domain.machine_impression.schemas import (
@@ -11,10 +12,18 @@ from mspy_vendi.domain.machine_impression.schemas import (
     MachineImpressionCreateSchema,
 )
 
+MACHINE_IMPRESSION_COLUMNS: set[str] = {
+    field.alias for field in MachineImpressionCreateSchema.model_fields.values() if field.alias
+}
+
+machine_impressions_adapter: TypeAdapter[list[MachineImpressionCreateSchema]] = TypeAdapter(
+    list[MachineImpressionCreateSchema]
+)
+
 
 class ExcelDataExtractor(BaseDataExtractorClient[bytes, MachineImpressionBulkCreateResponseSchema]):
     @staticmethod
-    def validate_machine_number(v: int | float | str) -> int | None:
+    def validate_machine_number(v: int | float | str | None) -> int | None:
         """
         Validate input data from the DataFrame.
         If the string coming, we expect that the value will be inside the brackets.
@@ -22,6 +31,7 @@ class ExcelDataExtractor(BaseDataExtractorClient[bytes, MachineImpressionBulkCre
         Example:
         >>> "1111 (123456789)" # Desired value is 123456789
         >>> float("nan") # Will be converted to None
+        >>> None # Empty cell, stays None
 
         :param v: Arbitrary value.
 
@@ -30,7 +40,7 @@ class ExcelDataExtractor(BaseDataExtractorClient[bytes, MachineImpressionBulkCre
         if isinstance(v, int):
             return v
 
-        if isinstance(v, float):
+        if v is None or isinstance(v, float):
             return None
 
         if isinstance(v, str) and not v.isdigit():
@@ -39,50 +49,42 @@ class ExcelDataExtractor(BaseDataExtractorClient[bytes, MachineImpressionBulkCre
 
         return int(v)
 
-    def _transform_data_frame(self, data_frame: DataFrame):
+    def _transform_rows(self, rows: list[dict[str, Any]]) -> list[MachineImpressionCreateSchema]:
         """
-        Perform data transformation on the DataFrame.
+        Perform data transformation on one batch of rows.
 
-        We expect that the DataFrame will have the following columns:
+        We expect that the rows will have the following columns:
         - Nayax Code
         - DJ NAME
         - Venue Name
 
-        We will drop all columns that are not in the MachineImpressionCreateSchema.model_fields.values().
-        We will also validate the Nayax Code column. Apply the validate_machine_number method to the column.
+        Only the columns of MachineImpressionCreateSchema are read from the file.
+        We validate the Nayax Code column. Apply the validate_machine_number method to the column.
+        The whole batch is validated at once with a TypeAdapter.
 
-        :param data_frame: DataFrame to transform.
+        :param rows: Batch of rows read from Excel.
 
-        :return: None
+        :return: Validated machine impressions of the batch.
         """
-        # Set the first row as the column names.
-        data_frame.columns = data_frame.iloc[0]
-        # Drop the first row. We don't need it anymore.
-        data_frame.drop(0).reset_index(drop=True)
+        for row in rows:
+            row["Nayax Code"] = self.validate_machine_number(row.get("Nayax Code"))
 
-        for column in data_frame.columns:
-            if column not in [field.alias for field in MachineImpressionCreateSchema.model_fields.values()]:
-                # Drop the column if it's not in the MachineImpressionCreateSchema.model_fields.values()
-                data_frame.drop(columns=[column], inplace=True)
+        return machine_impressions_adapter.validate_python(rows)
 
-        # Validate the Nayax Code column. Apply the validate_machine_number method to the column.
-        data_frame.loc[1:, "Nayax Code"] = data_frame.loc[1:, "Nayax Code"].apply(self.validate_machine_number)
+    async def _read_batches(self, data: bytes) -> AsyncIterator[list[MachineImpressionCreateSchema]]:
+        # The first row of the sheet is a title, the column names are in the second one.
+        async for rows in read_excel_batches(data, MACHINE_IMPRESSION_COLUMNS, header_row=2):
+            yield await asyncio.to_thread(self._transform_rows, rows)
 
     async def extract(self, data: bytes) -> MachineImpressionBulkCreateResponseSchema:
         """
         Extract data from the Excel file and save it to the database.
+        The file is read and saved batch by batch, so it is never loaded into memory at once.
 
         :param data: Excel file in bytes.
 
         :return: MachineImpressionBulkCreateResponseSchema
         """
         machine_impression_manager: MachineImpressionManager = MachineImpressionManager(self.session)
-        data_frame: DataFrame = pd.read_excel(BytesIO(data))
-
-        self._transform_data_frame(data_frame)
-
-        machine_impression_entities: list[MachineImpressionCreateSchema] = [
-            MachineImpressionCreateSchema.model_validate(row.to_dict()) for _, row in data_frame.loc[1:].iterrows()
-        ]
 
-        return await machine_impression_manager.create_batch(machine_impression_entities)
+        return await machine_impression_manager.create_batch(self._read_batches(data))
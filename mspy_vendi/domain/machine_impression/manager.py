@@ -1,59 +1,56 @@
-from sqlalchemy import Select, func, select
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.exc import IntegrityError
+from typing import AsyncIterable
 
 from mspy_vendi.core.manager import CRUDManager
+from mspy_vendi.core.schemas import BulkUpsertResultSchema
 from mspy_vendi.db import MachineImpression
 from mspy_vendi.domain.machine_impression.schemas import (
     MachineImpressionBulkCreateResponseSchema,
     MachineImpressionCreateSchema,
 )
+from mspy_vendi.domain.machines.manager import MachineManager
 
 
 class MachineImpressionManager(CRUDManager):
     sql_model = MachineImpression
 
-    async def create_batch(self, obj: list[MachineImpressionCreateSchema]) -> MachineImpressionBulkCreateResponseSchema:
+    async def create_batch(
+        self, batches: AsyncIterable[list[MachineImpressionCreateSchema]]
+    ) -> MachineImpressionBulkCreateResponseSchema:
         """
-        Create a batch of impressions in the database.
+        Create impressions in the database batch by batch, as they are parsed from Excel.
         If the record already exists, we will skip it. Due to the CONFLICT DO NOTHING clause.
-        If the FK constraint fails, we will skip the record.
+        Records with empty fields or of unknown machines are skipped as well.
+        The whole import is committed once at the end.
 
-        We return the number of records that were created.
+        We return the number of records that were created and skipped.
 
-        :param obj: A list of impressions to create.
+        :param batches: Batches of impressions to create.
 
         :return: MachineImpressionBulkCreateResponseSchema
         """
-        count_stmt: Select = select(func.count()).select_from(self.sql_model)
-        existing_records: list[int] = await self.session.scalar(count_stmt)
-
-        for item in obj:
-            dict_item = item.model_dump()
-
-            if not all(item.model_dump(exclude_defaults=True).values()):
-                continue
-
-            try:
-                stmt = (
-                    insert(self.sql_model)
-                    .values(**dict_item)
-                    .on_conflict_do_nothing(constraint="uq_machine_impression_machine_id_impression_device_number")
+        result = MachineImpressionBulkCreateResponseSchema()
+        machine_manager = MachineManager(self.session)
+
+        try:
+            async for batch in batches:
+                items: list[MachineImpressionCreateSchema] = [
+                    item for item in batch if all(item.model_dump(exclude_defaults=True).values())
+                ]
+                # Unknown machines would fail the FK constraint of the whole statement, so they are filtered out.
+                machine_ids: set[int] = await machine_manager.get_existing_ids({item.machine_id for item in items})
+                items = [item for item in items if item.machine_id in machine_ids]
+
+                batch_result: BulkUpsertResultSchema = await self.bulk_upsert(
+                    items, "uq_machine_impression_machine_id_impression_device_number", autocommit=False
                 )
 
-                await self.session.execute(stmt)
-                await self.session.commit()
-
-            except IntegrityError:
-                await self.session.rollback()
-                continue
+                result.created_records += batch_result.created_records
+                result.skipped_records += len(batch) - batch_result.created_records
 
-            except Exception as ex:
-                await self.session.rollback()
-                raise ex
+            await self.session.commit()
 
-        updated_records: list[int] = await self.session.scalar(count_stmt)
+        except Exception as ex:
+            await self.session.rollback()
+            raise ex
 
-        return MachineImpressionBulkCreateResponseSchema(
-            initial_records=existing_records, final_records=updated_records
-        )
+        return result
@@ -1,9 +1,9 @@
 import math
 from typing import Any
 
-from pydantic import Field, NonNegativeInt, PositiveInt, computed_field, field_validator
+from pydantic import Field, PositiveInt, field_validator
 
-from mspy_vendi.core.schemas import BaseSchema
+from mspy_vendi.core.schemas import BaseSchema, BulkUpsertResultSchema
 
 
 class MachineImpressionCreateSchema(BaseSchema):
@@ -15,7 +15,7 @@ class MachineImpressionCreateSchema(BaseSchema):
     @field_validator("machine_id", mode="before")
     @classmethod
     def validate_machine_id(cls, v: Any) -> int | None:
-        if isinstance(v, float) and math.isnan(v):
+        if v is None or (isinstance(v, float) and math.isnan(v)):
             return None
 
         return abs(int(v))
@@ -29,10 +29,4 @@ class MachineImpressionCreateSchema(BaseSchema):
         return v
 
 
-class MachineImpressionBulkCreateResponseSchema(BaseSchema):
-    initial_records: NonNegativeInt
-    final_records: NonNegativeInt
-
-    @computed_field
-    def created_records(self) -> int:
-        return self.final_records - self.initial_records
+class MachineImpressionBulkCreateResponseSchema(BulkUpsertResultSchema): ...
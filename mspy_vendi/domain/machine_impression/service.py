@@ -1,5 +1,6 @@
 from fastapi import UploadFile
 
+from mspy_vendi.core.cache import bump_data_version
 from mspy_vendi.core.service import CRUDService
 from mspy_vendi.domain.data_extractor.base import BaseDataExtractorClient
 from mspy_vendi.domain.machine_impression.factory import DataTransformFactory
@@ -17,4 +18,8 @@ class MachineImpressionService(CRUDService):
         data_extractor: BaseDataExtractorClient = DataTransformFactory.transform(
             session=self.db_session, file_type=file_type
         )
-        return await data_extractor.extract(binary_data)
+        result: MachineImpressionBulkCreateResponseSchema = await data_extractor.extract(binary_data)
+
+        await bump_data_version()
+
+        return result
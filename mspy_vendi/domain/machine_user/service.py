@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from mspy_vendi.core.service import CRUDService
 from mspy_vendi.deps import get_db_session
+from mspy_vendi.domain.entitlements.manager import EntitlementManager
 from mspy_vendi.domain.machine_user.manager import MachineUserManager
 from mspy_vendi.domain.machines.manager import MachineManager
 from mspy_vendi.domain.user.managers import UserManager
@@ -34,6 +35,9 @@ class MachineUserService(CRUDService):
         if machines_to_remove := current_machines_set - new_machines_set:
             await self.manager.disassociate_user_with_machine(user_id, *machines_to_remove)
 
+        if machines_to_add or machines_to_remove:
+            await EntitlementManager.invalidate(user_id)
+
     async def attach_all_machines(self, user_id: int) -> None:
         """
         Attach all machines to the user.
@@ -48,3 +52,4 @@ class MachineUserService(CRUDService):
 
         if machines_to_add := all_machines_set - current_machines_set:
             await self.manager.attach_user_to_machine(user_id, *machines_to_add)
+            await EntitlementManager.invalidate(user_id)
@@ -1,8 +1,9 @@
-from fastapi_pagination.ext.sqlalchemy import paginate
+from typing import Iterable
+
 from sqlalchemy import func, label, select
 
 from mspy_vendi.core.manager import CRUDManager
-from mspy_vendi.core.pagination import Page
+from mspy_vendi.core.pagination import Page, paginate
 from mspy_vendi.domain.geographies.models import Geography
 from mspy_vendi.domain.machines.filters import MachineFilter
 from mspy_vendi.domain.machines.models import Machine, MachineUser
@@ -103,6 +104,35 @@ class MachineManager(CRUDManager):
 
         return await self.session.scalar(stmt)
 
+    async def get_ids_by_names(self, names: Iterable[str]) -> dict[str, int]:
+        """
+        Resolve the names of machines into their IDs with one query.
+        Names aren't unique, the lowest ID of the name is picked, so every import resolves it the same way.
+
+        :param names: Names to resolve.
+
+        :return: Mapping of the found names to the IDs. Unknown names are missing.
+        """
+        stmt = (
+            select(self.sql_model.name, func.min(self.sql_model.id))
+            .where(self.sql_model.name.in_(set(names)))
+            .group_by(self.sql_model.name)
+        )
+
+        return dict((await self.session.execute(stmt)).tuples().all())
+
+    async def get_existing_ids(self, obj_ids: Iterable[int]) -> set[int]:
+        """
+        Filter the IDs of existing machines with one query.
+
+        :param obj_ids: IDs to check.
+
+        :return: IDs of the machines which exist.
+        """
+        stmt = select(self.sql_model.id).where(self.sql_model.id.in_(set(obj_ids)))
+
+        return set((await self.session.scalars(stmt)).all())
+
     async def get_all_machine_ids(self) -> list[int]:
         stmt = select(self.sql_model.id)
 
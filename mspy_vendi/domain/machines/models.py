@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, ForeignKey, String, UniqueConstraint, func
+from sqlalchemy import BigInteger, ForeignKey, Index, String, UniqueConstraint, func
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -71,4 +71,7 @@ class MachineUser(CommonMixin, Base):
     machine: Mapped["Machine"] = relationship(back_populates="machine_users", uselist=False)
     user: Mapped["User"] = relationship(back_populates="machine_users", uselist=False)
 
-    __table_args__ = (UniqueConstraint("machine_id", "user_id", name="uq_machine_user_machine_id_user_id"),)
+    __table_args__ = (
+        UniqueConstraint("machine_id", "user_id", name="uq_machine_user_machine_id_user_id"),
+        Index("ix_machine_user_user_id_machine_id", "user_id", "machine_id"),
+    )
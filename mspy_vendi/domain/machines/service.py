@@ -1,3 +1,4 @@
+from mspy_vendi.core.mixins.entity_version import EntityVersionMixin
 from mspy_vendi.core.pagination import Page
 from mspy_vendi.core.service import CRUDService
 from mspy_vendi.domain.machines.filters import MachineFilter
@@ -6,7 +7,7 @@ from mspy_vendi.domain.machines.schemas import MachinesCountGeographySchema, Mac
 from mspy_vendi.domain.user.models import User
 
 
-class MachineService(CRUDService):
+class MachineService(EntityVersionMixin, CRUDService):
     manager_class = MachineManager
     filter_class = MachineFilter
 
@@ -0,0 +1,83 @@
+from typing import Any
+
+from mspy_vendi.config import config
+from mspy_vendi.core.cache import LocalCache, bump_entity_version, get_entity_version
+
+
+class NayaxEntityCache:
+    """
+    Current state of the entities referenced by Nayax messages, by their natural keys:
+    geographies by name, machines by ID, product category IDs by name and products by ID.
+
+    Only committed states are stored. The whole cache is cleared when the entity version in Redis changes,
+    i.e. when the entities are edited by the API or by another consumer process, or when the version is unknown.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.geographies: LocalCache[str, dict[str, Any]] = LocalCache(max_size, ttl)
+        self.machines: LocalCache[int, dict[str, Any]] = LocalCache(max_size, ttl)
+        self.product_category_ids: LocalCache[str, int] = LocalCache(max_size, ttl)
+        self.products: LocalCache[int, dict[str, Any]] = LocalCache(max_size, ttl)
+
+        self.version: str | None = None
+
+    def clear(self) -> None:
+        for cache in (self.geographies, self.machines, self.product_category_ids, self.products):
+            cache.clear()
+
+    async def refresh(self) -> None:
+        """
+        Clear the cache if the entities were edited since the previous call.
+        It must be called before the cached states are read.
+        """
+        version: str | None = await get_entity_version()
+
+        if version is None or version != self.version:
+            self.clear()
+
+        self.version = version
+
+    async def publish(self) -> None:
+        """
+        Invalidate the caches of the other processes after the cached entities are updated by this one.
+        The own cache is kept only if nobody else has changed the entities since the previous `refresh`,
+        otherwise it's cleared on the next `refresh`.
+        It must be called after the changes are committed.
+        """
+        version: int | None = await bump_entity_version()
+
+        if version is None or self.version is None or version != int(self.version) + 1:
+            self.clear()
+            self.version = None
+
+        else:
+            self.version = str(version)
+
+    @staticmethod
+    def split_changed(
+        cache: LocalCache[Any, dict[str, Any]], rows: dict[Any, dict[str, Any]]
+    ) -> tuple[dict[Any, dict[str, Any]], dict[Any, dict[str, Any]]]:
+        """
+        Split the incoming rows into the ones equal to the cached states and the ones to store.
+
+        :param cache: Cache of the entity.
+        :param rows: Incoming rows by their keys.
+
+        :return: The cached states of the unchanged rows and the rest of the rows, by their keys.
+        """
+        cached_states: dict[Any, dict[str, Any]] = {}
+        changed_rows: dict[Any, dict[str, Any]] = {}
+
+        for key, row in rows.items():
+            state: dict[str, Any] | None = cache.get(key)
+
+            if state is not None and all(state.get(column) == value for column, value in row.items()):
+                cached_states[key] = state
+
+            else:
+                changed_rows[key] = row
+
+        return cached_states, changed_rows
+
+
+nayax_entity_cache = NayaxEntityCache(config.nayax_entity_cache_size, config.nayax_entity_cache_ttl)
@@ -1,6 +1,9 @@
+from typing import Any, Sequence
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from mspy_vendi.config import log
+from mspy_vendi.core.cache import bump_data_version
 from mspy_vendi.core.helpers.db_helpers import serialize_for_json
 from mspy_vendi.domain.entity_log.enums import EntityTypeEnum
 from mspy_vendi.domain.entity_log.manager import EntityLogManager
@@ -9,9 +12,9 @@ from mspy_vendi.domain.geographies.manager import GeographyManager
 from mspy_vendi.domain.geographies.schemas import GeographyCreateSchema
 from mspy_vendi.domain.machines.manager import MachineManager
 from mspy_vendi.domain.machines.schemas import MachineCreateSchema
+from mspy_vendi.domain.nayax.cache import NayaxEntityCache, nayax_entity_cache
 from mspy_vendi.domain.nayax.schemas import NayaxTransactionSchema
 from mspy_vendi.domain.product_category.manager import ProductCategoryManager
-from mspy_vendi.domain.product_category.schemas import CreateProductCategorySchema
 from mspy_vendi.domain.products.manager import ProductManager
 from mspy_vendi.domain.products.schemas import ProductCreateSchema
 from mspy_vendi.domain.sales.manager import SaleManager
@@ -19,7 +22,9 @@ from mspy_vendi.domain.sales.schemas import SaleCreateSchema
 
 
 class NayaxService:
-    def __init__(self, db_session: AsyncSession):
+    def __init__(self, db_session: AsyncSession, entity_cache: NayaxEntityCache = nayax_entity_cache):
+        self.db_session = db_session
+        self.entity_cache = entity_cache
         self.geography_manager = GeographyManager(db_session)
         self.machine_manager = MachineManager(db_session)
         self.product_manager = ProductManager(db_session)
@@ -27,129 +32,174 @@ class NayaxService:
         self.sale_manager = SaleManager(db_session)
         self.entity_log_manager = EntityLogManager(db_session)
 
-    async def process_message(self, message: NayaxTransactionSchema) -> None:
-        geography, old_geography, is_updated = await self.geography_manager.update_or_create(
-            name=message.data.area_description or message.data.actor_description,
-            obj=GeographyCreateSchema(
-                name=message.data.area_description or message.data.actor_description,
+    async def process_message(self, message: NayaxTransactionSchema) -> int:
+        """
+        Process one message, the same as a batch of one message, see `process_batch`.
+
+        :param message: Message to process.
+
+        :return: 1 if the transaction of the message is already stored, i.e. the message is a duplicate, 0 otherwise.
+        """
+        return await self.process_batch([message])
+
+    @staticmethod
+    def _generate_entity_logs(
+        entity_type: EntityTypeEnum, states: list[tuple[dict[str, Any], dict[str, Any] | None, bool]]
+    ) -> list[EntityLogCreateSchema]:
+        return [
+            EntityLogCreateSchema(
+                entity_type=entity_type,
+                old_value=serialize_for_json(previous_state),
+                new_value=serialize_for_json(current_state),
+            )
+            for current_state, previous_state, is_written in states
+            if is_written and previous_state is not None
+        ]
+
+    async def process_batch(self, messages: Sequence[NayaxTransactionSchema]) -> int:
+        """
+        Process several messages within one transaction, e.g. all messages of one `receive_message` call.
+
+        Geographies, machines, product categories and products are deduplicated across the messages and stored
+        with one bulk statement per entity type, all sales are stored with one statement as well.
+        The result is the same as processing the messages one by one in the given order:
+        if several messages carry the same entity, the last one wins.
+        Only the entities which actually differ from the stored ones are written and get an entity log.
+        Entities equal to their states in `NayaxEntityCache` aren't even sent to the database.
+        If any entity is updated, the caches of the other consumer processes are invalidated after the commit.
+
+        :param messages: Messages to process.
+
+        :return: Count of the transactions which are already stored unchanged, i.e. duplicate deliveries.
+        """
+        geographies: dict[str, GeographyCreateSchema] = {}
+        # Geographies and product categories are resolved into IDs after they are stored.
+        machines: dict[int, tuple[str, str]] = {}
+        products: dict[int, tuple[str, float, str]] = {}
+        sales: dict[int, SaleCreateSchema] = {}
+
+        for message in messages:
+            geography_name: str = message.data.area_description or message.data.actor_description
+            geographies[geography_name] = GeographyCreateSchema(
+                name=geography_name,
                 postcode=str(message.data.location_code or message.data.actor_code),
-            ),
-        )
-
-        log.info("Geography object", geography_name=geography.name, is_updated=is_updated)
+            )
+            machines[message.machine_id] = (message.data.machine_name, geography_name)
+            sale_datetime = message.machine_time or message.data.machine_au_time
 
-        if is_updated:
-            await self.entity_log_manager.create(
-                obj=EntityLogCreateSchema(
-                    entity_type=EntityTypeEnum.GEOGRAPHY,
-                    old_value=serialize_for_json(old_geography.to_dict()),
-                    new_value=serialize_for_json(geography.to_dict()),
+            for product_item in message.data.products:
+                products[product_item.product_id] = (
+                    product_item.product_name,
+                    product_item.product_bruto,
+                    product_item.product_group,
+                )
+                # The sale is identified by the transaction, so the last product of the message wins.
+                sales[message.transaction_id] = SaleCreateSchema(
+                    sale_date=sale_datetime.date(),
+                    sale_time=sale_datetime.time(),
+                    quantity=product_item.product_quantity or 1,
+                    source_system_id=message.transaction_id,
+                    product_id=product_item.product_id,
+                    machine_id=message.machine_id,
                 )
-            )
-            log.info("Updated data:", old_geography=old_geography.to_dict(), geography=geography.to_dict())
-
-        machine, old_machine, is_updated = await self.machine_manager.update_or_create(
-            obj_id=message.machine_id,
-            obj=MachineCreateSchema(
-                name=message.data.machine_name,
-                geography_id=geography.id,
-            ),
-        )
 
-        log.info("Machine object", machine_id=machine.id, is_updated=is_updated)
+        cache: NayaxEntityCache = self.entity_cache
+        await cache.refresh()
 
-        if is_updated:
-            await self.entity_log_manager.create(
-                obj=EntityLogCreateSchema(
-                    entity_type=EntityTypeEnum.MACHINE,
-                    old_value=serialize_for_json(old_machine.to_dict()),
-                    new_value=serialize_for_json(machine.to_dict()),
-                ),
+        cached_geographies, geography_rows = cache.split_changed(
+            cache.geographies, {name: geography.model_dump() for name, geography in geographies.items()}
+        )
+        geography_states = await self.geography_manager.bulk_update_or_create(
+            list(geography_rows.values()), "uq_geography_name", autocommit=False
+        )
+        geography_ids: dict[str, int] = {name: state["id"] for name, state in cached_geographies.items()} | {
+            state["name"]: state["id"] for state, *_ in geography_states
+        }
+
+        cached_machines, machine_rows = cache.split_changed(
+            cache.machines,
+            {
+                machine_id: MachineCreateSchema(name=name, geography_id=geography_ids[geography_name]).model_dump()
+                | {"id": machine_id}
+                for machine_id, (name, geography_name) in machines.items()
+            },
+        )
+        machine_states = await self.machine_manager.bulk_update_or_create(list(machine_rows.values()), autocommit=False)
+
+        product_groups: set[str] = {product_group for *_, product_group in products.values()}
+        product_category_ids: dict[str, int] = {
+            name: category_id
+            for name in product_groups
+            if (category_id := cache.product_category_ids.get(name)) is not None
+        }
+
+        if missing_product_groups := product_groups - product_category_ids.keys():
+            product_category_ids |= await self.product_category_manager.get_or_create_ids_by_names(
+                missing_product_groups, autocommit=False
             )
-            log.info("Updated data", old_machine=old_machine.to_dict(), machine=machine.to_dict())
 
-        for product_item in message.data.products:
-            log.info("Start working with the following product", product_id=product_item.product_id)
+        cached_products, product_rows = cache.split_changed(
+            cache.products,
+            {
+                product_id: ProductCreateSchema(
+                    name=name, price=price, product_category_id=product_category_ids[product_group]
+                ).model_dump()
+                | {"id": product_id}
+                for product_id, (name, price, product_group) in products.items()
+            },
+        )
+        product_states = await self.product_manager.bulk_update_or_create(list(product_rows.values()), autocommit=False)
 
-            product_category, old_product_category, is_updated = await self.product_category_manager.update_or_create(
-                name=product_item.product_group,
-                obj=CreateProductCategorySchema(name=product_item.product_group),
-            )
+        sale_states = await self.sale_manager.bulk_update_or_create(
+            [sale.model_dump() | {"id": sale_id} for sale_id, sale in sales.items()], autocommit=False
+        )
 
-            if is_updated:
-                await self.entity_log_manager.create(
-                    obj=EntityLogCreateSchema(
-                        entity_type=EntityTypeEnum.PRODUCT_CATEGORY,
-                        old_value=serialize_for_json(old_product_category.to_dict()),
-                        new_value=serialize_for_json(product_category.to_dict()),
-                    )
-                )
-                log.info(
-                    "Updated data",
-                    product_category=product_category.to_dict(),
-                    old_product_category=old_product_category.to_dict(),
-                )
+        await self.entity_log_manager.create_batch(
+            [
+                *self._generate_entity_logs(EntityTypeEnum.GEOGRAPHY, geography_states),
+                *self._generate_entity_logs(EntityTypeEnum.MACHINE, machine_states),
+                *self._generate_entity_logs(EntityTypeEnum.PRODUCT, product_states),
+                *self._generate_entity_logs(EntityTypeEnum.SALE, sale_states),
+            ],
+            autocommit=False,
+        )
+        await self.db_session.commit()
 
-            log.info(
-                "Product category object",
-                product_category_name=product_category.name,
-                is_updated=is_updated,
-            )
+        # Other consumer processes may have cached the previous states of the updated entities.
+        if any(
+            is_written and previous_state is not None
+            for _, previous_state, is_written in (*geography_states, *machine_states, *product_states)
+        ):
+            await cache.publish()
 
-            log.info(
-                "Provided Product object",
-                product_id=product_item.product_id,
-                price=product_item.product_bruto,
-            )
+        # Only the committed states are cached.
+        for state, *_ in geography_states:
+            cache.geographies.set(state["name"], state)
 
-            product, old_product, is_updated = await self.product_manager.update_or_create(
-                obj_id=product_item.product_id,
-                obj=ProductCreateSchema(
-                    name=product_item.product_name,
-                    price=product_item.product_bruto,
-                    product_category_id=product_category.id,
-                ),
-            )
+        for state, *_ in machine_states:
+            cache.machines.set(state["id"], state)
 
-            log.info("Product object", product_id=product.id, is_updated=is_updated)
+        for product_group, category_id in product_category_ids.items():
+            cache.product_category_ids.set(product_group, category_id)
 
-            if is_updated:
-                await self.entity_log_manager.create(
-                    obj=EntityLogCreateSchema(
-                        entity_type=EntityTypeEnum.PRODUCT,
-                        old_value=serialize_for_json(old_product.to_dict()),
-                        new_value=serialize_for_json(product.to_dict()),
-                    )
-                )
-                log.info("Updated data", product=product.to_dict(), old_product=old_product.to_dict())
+        for state, *_ in product_states:
+            cache.products.set(state["id"], state)
 
-            log.info(
-                "Provided Sale object",
-                sale_id=message.transaction_id,
-                quantity=product_item.product_quantity,
-                source_system_id=message.transaction_id,
-            )
-            sale_datetime = message.machine_time or message.data.machine_au_time
-            sale, old_sale, is_updated = await self.sale_manager.update_or_create(
-                obj_id=message.transaction_id,
-                obj=SaleCreateSchema(
-                    sale_date=sale_datetime.date(),
-                    sale_time=sale_datetime.time(),
-                    quantity=product_item.product_quantity or 1,
-                    source_system_id=message.transaction_id,
-                    product_id=product.id,
-                    machine_id=machine.id,
-                ),
-            )
+        duplicates: int = sum(
+            previous_state is not None and not is_written for _, previous_state, is_written in sale_states
+        )
+
+        log.info(
+            "Messages processed",
+            messages=len(messages),
+            duplicates=duplicates,
+            cached_entities=len(cached_geographies) + len(cached_machines) + len(cached_products),
+            changed_geographies=sum(is_written for *_, is_written in geography_states),
+            changed_machines=sum(is_written for *_, is_written in machine_states),
+            changed_products=sum(is_written for *_, is_written in product_states),
+            changed_sales=sum(is_written for *_, is_written in sale_states),
+        )
 
-            log.info("Sale object", sale_id=sale.id, is_updated=is_updated)
+        await bump_data_version()
 
-            if is_updated:
-                await self.entity_log_manager.create(
-                    obj=EntityLogCreateSchema(
-                        entity_type=EntityTypeEnum.SALE,
-                        old_value=serialize_for_json(old_sale.to_dict()),
-                        new_value=serialize_for_json(sale.to_dict()),
-                    )
-                )
-                log.info("Updated data", sale=sale.to_dict(), old_sale=old_sale.to_dict())
+        return duplicates
@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import Iterable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import DBAPIError
 
+from mspy_vendi.core.exceptions.base_exception import raise_db_error
 from mspy_vendi.core.manager import CRUDManager
 from mspy_vendi.db import ProductCategory
 from mspy_vendi.domain.product_category.schemas import CreateProductCategorySchema
@@ -15,6 +17,44 @@ class ProductCategoryManager(CRUDManager):
 
         return await self.session.scalar(stmt)
 
+    async def get_or_create_ids_by_names(self, names: Iterable[str], autocommit: bool = True) -> dict[str, int]:
+        """
+        Resolve the names of product categories into their IDs, creating the missing ones, with two queries.
+        Names aren't unique, the first created category with the name is picked.
+
+        :param names: Names to resolve.
+        :param autocommit: If True, commit changes immediately, otherwise flush changes.
+
+        :return: Mapping of the names to the IDs.
+        """
+        names = set(names)
+        stmt = (
+            select(self.sql_model.name, func.min(self.sql_model.id))
+            .where(self.sql_model.name.in_(names))
+            .group_by(self.sql_model.name)
+        )
+        ids: dict[str, int] = dict((await self.session.execute(stmt)).tuples().all())
+
+        if missing_names := names - ids.keys():
+            try:
+                created = await self.session.execute(
+                    insert(self.sql_model)
+                    .values([{"name": name} for name in missing_names])
+                    .returning(self.sql_model.name, self.sql_model.id)
+                )
+                ids |= dict(created.tuples().all())
+
+                if autocommit:
+                    await self.session.commit()
+                else:
+                    await self.session.flush()
+
+            except DBAPIError as ex:
+                await self.session.rollback()
+                raise_db_error(ex)
+
+        return ids
+
     async def get_or_create(
         self, obj: CreateProductCategorySchema, name: str | None = None
     ) -> tuple[ProductCategory, bool]:
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, ForeignKey, UniqueConstraint
+from sqlalchemy import BigInteger, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from mspy_vendi.core.enums.db import CascadesEnum
@@ -32,4 +32,7 @@ class ProductUser(CommonMixin, Base):
     product: Mapped["Product"] = relationship(back_populates="product_users", uselist=False)
     user: Mapped["User"] = relationship(back_populates="product_users", uselist=False)
 
-    __table_args__ = (UniqueConstraint("product_id", "user_id", name="uq_product_user_product_id_user_id"),)
+    __table_args__ = (
+        UniqueConstraint("product_id", "user_id", name="uq_product_user_product_id_user_id"),
+        Index("ix_product_user_user_id_product_id", "user_id", "product_id"),
+    )
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from mspy_vendi.core.service import CRUDService
 from mspy_vendi.deps import get_db_session
+from mspy_vendi.domain.entitlements.manager import EntitlementManager
 from mspy_vendi.domain.product_user.manager import ProductUserManager
 from mspy_vendi.domain.products.manager import ProductManager
 from mspy_vendi.domain.user.managers import UserManager
@@ -34,6 +35,9 @@ class ProductUserService(CRUDService):
         if products_to_remove := current_products_set - new_products_set:
             await self.manager.disassociate_user_with_product(user_id, *products_to_remove)
 
+        if products_to_add or products_to_remove:
+            await EntitlementManager.invalidate(user_id)
+
     async def attach_all_products(self, user_id: int) -> None:
         """
         Attach all products to the user.
@@ -48,3 +52,4 @@ class ProductUserService(CRUDService):
 
         if products_to_add := all_products_set - current_products_set:
             await self.manager.attach_user_to_product(user_id, *products_to_add)
+            await EntitlementManager.invalidate(user_id)
@@ -1,4 +1,6 @@
-from sqlalchemy import select
+from typing import Iterable
+
+from sqlalchemy import func, select
 
 from mspy_vendi.core.manager import CRUDManager
 from mspy_vendi.db import Product
@@ -12,6 +14,23 @@ class ProductManager(CRUDManager):
 
         return await self.session.scalar(stmt)
 
+    async def get_ids_by_names(self, names: Iterable[str]) -> dict[str, int]:
+        """
+        Resolve the names of products into their IDs with one query.
+        Names aren't unique, the lowest ID of the name is picked, so every import resolves it the same way.
+
+        :param names: Names to resolve.
+
+        :return: Mapping of the found names to the IDs. Unknown names are missing.
+        """
+        stmt = (
+            select(self.sql_model.name, func.min(self.sql_model.id))
+            .where(self.sql_model.name.in_(set(names)))
+            .group_by(self.sql_model.name)
+        )
+
+        return dict((await self.session.execute(stmt)).tuples().all())
+
     async def get_all_product_ids(self) -> list[int]:
         stmt = select(self.sql_model.id)
 
@@ -1,8 +1,9 @@
+from mspy_vendi.core.mixins.entity_version import EntityVersionMixin
 from mspy_vendi.core.service import CRUDService
 from mspy_vendi.domain.products.filters import ProductFilter
 from mspy_vendi.domain.products.manager import ProductManager
 
 
-class ProductService(CRUDService):
+class ProductService(EntityVersionMixin, CRUDService):
     manager_class = ProductManager
     filter_class = ProductFilter
@@ -0,0 +1,75 @@
+from typing import Sequence
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+
+from mspy_vendi.core.exceptions.base_exception import raise_db_error
+from mspy_vendi.core.manager import CRUDManager
+from mspy_vendi.domain.quarantined_message.models import QuarantinedMessage
+from mspy_vendi.domain.quarantined_message.schemas import QuarantinedMessageCreateSchema
+
+
+class QuarantinedMessageManager(CRUDManager):
+    sql_model = QuarantinedMessage
+
+    async def quarantine(self, obj: QuarantinedMessageCreateSchema, autocommit: bool = True) -> None:
+        """
+        Store the failed message. A message which is already stored is skipped, e.g. when it's received again
+        because it wasn't deleted from the queue after the previous quarantine.
+
+        :param obj: Failed message with the error.
+        :param autocommit: If True, commit changes immediately, otherwise flush changes.
+        """
+        stmt = insert(self.sql_model).values(**obj.model_dump()).on_conflict_do_nothing(index_elements=["message_id"])
+
+        try:
+            await self.session.execute(stmt)
+
+            if autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+
+        except DBAPIError as ex:
+            await self.session.rollback()
+            raise_db_error(ex)
+
+    async def get_pending(self, obj_ids: Sequence[int] | None = None) -> list[QuarantinedMessage]:
+        """
+        Get the messages which weren't replayed yet, oldest first.
+
+        :param obj_ids: IDs of the messages, all of them by default.
+
+        :return: The quarantined messages.
+        """
+        stmt = select(self.sql_model).where(self.sql_model.replayed_at.is_(None)).order_by(self.sql_model.id)
+
+        if obj_ids:
+            stmt = stmt.where(self.sql_model.id.in_(obj_ids))
+
+        return list((await self.session.scalars(stmt)).all())
+
+    async def mark_replayed(self, obj_ids: Sequence[int], autocommit: bool = True) -> None:
+        """
+        Mark the messages as sent back to their queue, so they aren't replayed twice.
+
+        :param obj_ids: IDs of the replayed messages.
+        :param autocommit: If True, commit changes immediately, otherwise flush changes.
+        """
+        if not obj_ids:
+            return
+
+        stmt = update(self.sql_model).where(self.sql_model.id.in_(obj_ids)).values(replayed_at=func.now())
+
+        try:
+            await self.session.execute(stmt)
+
+            if autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+
+        except DBAPIError as ex:
+            await self.session.rollback()
+            raise_db_error(ex)
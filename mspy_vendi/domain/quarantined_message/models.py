@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from mspy_vendi.db.base import Base, CommonMixin
+
+
+class QuarantinedMessage(CommonMixin, Base):
+    """
+    SQS message which failed on every attempt, it's stored with the error until it's replayed.
+    """
+
+    queue_name: Mapped[str] = mapped_column(String)
+    message_id: Mapped[str] = mapped_column(String, unique=True)
+    body: Mapped[str] = mapped_column(Text)
+    attributes: Mapped[dict[str, Any]] = mapped_column(default={})
+    receive_count: Mapped[int]
+    error: Mapped[str] = mapped_column(Text)
+    replayed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
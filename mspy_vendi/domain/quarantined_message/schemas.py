@@ -0,0 +1,12 @@
+from typing import Any
+
+from mspy_vendi.core.schemas import BaseSchema
+
+
+class QuarantinedMessageCreateSchema(BaseSchema):
+    queue_name: str
+    message_id: str
+    body: str
+    attributes: dict[str, Any]
+    receive_count: int
+    error: str
@@ -0,0 +1,49 @@
+import asyncio
+import csv
+from typing import IO
+
+from mspy_vendi.core.exceptions.base_exception import BadRequestError
+from mspy_vendi.domain.data_extractor import BaseDataExtractorClient
+from mspy_vendi.domain.sales.data_extractor.excel import REQUIRED_COLUMNS
+from mspy_vendi.domain.sales.manager import SaleManager
+from mspy_vendi.domain.sales.schemas import SalesBulkCreateResponseSchema
+
+# Nayax dumps may start with a title, so the header is looked for within the first lines.
+MAX_HEADER_LINE: int = 10
+
+
+class CSVDataExtractor(BaseDataExtractorClient[IO[bytes], SalesBulkCreateResponseSchema]):
+    @staticmethod
+    def read_header(file: IO[bytes]) -> list[str]:
+        """
+        Read the lines of the file until the header with all required columns is found.
+        The file is left positioned at the first data line.
+
+        :param file: CSV file opened in binary mode.
+        :return: Column names of the file.
+        """
+        for _ in range(MAX_HEADER_LINE):
+            if not (line := file.readline()):
+                break
+
+            header: list[str] = [name.strip() for name in next(csv.reader([line.decode("utf-8-sig")]), [])]
+
+            if set(REQUIRED_COLUMNS) <= set(header):
+                return header
+
+        raise BadRequestError(f"The CSV file doesn't have a header with the {', '.join(REQUIRED_COLUMNS)} columns.")
+
+    async def extract(self, data: IO[bytes]) -> SalesBulkCreateResponseSchema:
+        """
+        Copy sales data from a CSV file into the database.
+
+        - Finds the header of the file.
+        - Calls the SaleManager to stream the rest of the file into the database and merge it into sales.
+
+        :param data: CSV file opened in binary mode.
+        :return: Result of the bulk insert operation with the count of skipped rows per reason.
+        """
+        sale_manager: SaleManager = SaleManager(self.session)
+        header: list[str] = await asyncio.to_thread(self.read_header, data)
+
+        return await sale_manager.copy_batch(data, header)
@@ -1,16 +1,21 @@
+import asyncio
 import re
-from io import BytesIO
+from typing import Any, AsyncIterator
 
-import pandas as pd
-from pandas.core.interchange.dataframe_protocol import DataFrame
+from pydantic import TypeAdapter
 
+from mspy_vendi.core.helpers import read_excel_batches
 from mspy_vendi.domain.data_extractor import BaseDataExtractorClient
-from mspy_vendi.domain.machine_impression.schemas import MachineImpressionBulkCreateResponseSchema
 from mspy_vendi.domain.sales.manager import SaleManager
 from mspy_vendi.domain.sales.schemas import ExcelSaleCreateSchema, SalesBulkCreateResponseSchema
 
+SALE_COLUMNS: set[str] = {field.alias for field in ExcelSaleCreateSchema.model_fields.values() if field.alias}
+REQUIRED_COLUMNS: list[str] = ["Transaction ID", "Product Name", "Machine Name", "Settlement Date and Time (GMT)"]
 
-class ExcelDataExtractor(BaseDataExtractorClient[bytes, MachineImpressionBulkCreateResponseSchema]):
+sales_adapter: TypeAdapter[list[ExcelSaleCreateSchema]] = TypeAdapter(list[ExcelSaleCreateSchema])
+
+
+class ExcelDataExtractor(BaseDataExtractorClient[bytes, SalesBulkCreateResponseSchema]):
     @staticmethod
     def validate_transaction_id(v: int | float | str) -> int | None:
         """
@@ -35,48 +40,40 @@ class ExcelDataExtractor(BaseDataExtractorClient[bytes, MachineImpressionBulkCre
 
         return int(v)
 
-    def _transform_data_frame(self, data_frame: DataFrame):
+    def _transform_rows(self, rows: list[dict[str, Any]]) -> list[ExcelSaleCreateSchema]:
         """
-        Transform and clean the DataFrame for sales import.
+        Clean and validate one batch of rows for sales import.
 
-        - Uses the first row as column headers.
-        - Removes columns not required by ExcelSaleCreateSchema.
-        - Normalizes the "Transaction ID" field using `validate_transaction_id`.
+        - Skips rows with missing required fields.
+        - Normalizes the "Transaction ID" column using `validate_transaction_id`.
+        - Validates the whole batch at once with a TypeAdapter.
 
-        :param data_frame: Raw DataFrame loaded from Excel.
-        :return: None.
+        :param rows: Batch of rows read from Excel.
+        :return: Validated sales of the batch.
         """
-        data_frame.columns = data_frame.iloc[0]
-        data_frame = data_frame.iloc[1:].reset_index(drop=True)
+        rows = [row for row in rows if all(row.get(column) is not None for column in REQUIRED_COLUMNS)]
+
+        for row in rows:
+            row["Transaction ID"] = self.validate_transaction_id(row["Transaction ID"])
 
-        for column in data_frame.columns:
-            if column not in [field.alias for field in ExcelSaleCreateSchema.model_fields.values()]:
-                data_frame.drop(columns=[column], inplace=True)
+        return sales_adapter.validate_python(rows)
 
-        data_frame.loc[1:, "Transaction ID"] = data_frame.loc[1:, "Transaction ID"].apply(self.validate_transaction_id)
+    async def _read_batches(self, data: bytes) -> AsyncIterator[list[ExcelSaleCreateSchema]]:
+        # The first row of the sheet is a title, the column names are in the second one.
+        async for rows in read_excel_batches(data, SALE_COLUMNS, header_row=2):
+            yield await asyncio.to_thread(self._transform_rows, rows)
 
     async def extract(self, data: bytes) -> SalesBulkCreateResponseSchema:
         """
         Extract and validate sales data from an Excel file and persist it to the database.
 
-        - Loads Excel data.
-        - Cleans and filters rows with missing required fields.
-        - Validates and transforms each row into a Pydantic schema.
-        - Calls the SaleManager to persist the records.
+        - Streams the Excel rows in batches, so the whole file is never loaded into a DataFrame.
+        - Cleans and validates every batch.
+        - Calls the SaleManager to persist the records batch by batch.
 
         :param data: Excel file as raw bytes.
         :return: Result of the bulk insert operation.
         """
         sale_manager: SaleManager = SaleManager(self.session)
-        data_frame: DataFrame = pd.read_excel(BytesIO(data))
-
-        self._transform_data_frame(data_frame)
-
-        required_columns: list = ["Transaction ID", "Product Name", "Machine Name", "Settlement Date and Time (GMT)"]
-        filtered_df: DataFrame = data_frame.iloc[1:].dropna(subset=required_columns)
-
-        sale_entities: list[ExcelSaleCreateSchema] = [
-            ExcelSaleCreateSchema.model_validate(row.to_dict()) for _, row in filtered_df.iterrows()
-        ]
 
-        return await sale_manager.create_batch(sale_entities)
+        return await sale_manager.create_batch(self._read_batches(data))
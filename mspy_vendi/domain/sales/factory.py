@@ -4,15 +4,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from mspy_vendi.core.exceptions.base_exception import BadRequestError
 from mspy_vendi.domain.data_extractor.base import BaseDataExtractorClient
+from mspy_vendi.domain.sales.data_extractor.csv import CSVDataExtractor
 from mspy_vendi.domain.sales.data_extractor.excel import ExcelDataExtractor
 
 
 class DataTransformFactory:
     @staticmethod
-    def transform(session: AsyncSession, file_type: Literal["xlsx"]) -> BaseDataExtractorClient:
+    def transform(session: AsyncSession, file_type: Literal["xlsx", "csv"]) -> BaseDataExtractorClient:
         match file_type:
             case "xlsx":
                 return ExcelDataExtractor(session)
 
+            case "csv":
+                return CSVDataExtractor(session)
+
             case _:
                 raise BadRequestError(f"Provided {file_type=} didn't acceptable yet.")
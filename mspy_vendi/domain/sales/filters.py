@@ -2,7 +2,7 @@ from fastapi_filter import FilterDepends, with_prefix
 from pydantic import PositiveInt
 
 from mspy_vendi.core.filter import BaseFilter, DateRangeFilter
-from mspy_vendi.db import Sale
+from mspy_vendi.db import Sale, SaleDailyRollup
 from mspy_vendi.domain.products.models import Product
 
 
@@ -59,3 +59,13 @@ class ExportSaleFilter(StatisticDateRangeFilter, GeographyFilter):
 
 class SaleGetAllFilter(SaleFilter):
     order_by: list[str] | None = ["-id"]
+
+
+class SaleDailyRollupFilter(SaleFilter):
+    """
+    The same filter as `SaleFilter`, but applied to the `sale_daily_rollup` table.
+    Per-sale fields (`quantity`, `source_system_id`) can't be applied to the aggregated rows.
+    """
+
+    class Constants(SaleFilter.Constants):
+        model = SaleDailyRollup
@@ -1,26 +1,73 @@
-from datetime import time, timedelta
-from typing import Any
-
-from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import CTE, ColumnClause, Date, Label, Row, Select, asc, cast, desc, func, label, select, text
+from collections import Counter
+from datetime import date, datetime
+from typing import IO, Any, AsyncIterable, Iterable, Literal, Sequence
+
+import asyncpg
+from sqlalchemy import (
+    CTE,
+    BigInteger,
+    Case,
+    Column,
+    ColumnClause,
+    ColumnElement,
+    Date,
+    DateTime,
+    Label,
+    MetaData,
+    Row,
+    RowMapping,
+    Select,
+    Table,
+    Text,
+    Time,
+    and_,
+    asc,
+    case,
+    cast,
+    column,
+    delete,
+    desc,
+    func,
+    label,
+    literal,
+    null,
+    or_,
+    select,
+    text,
+    tuple_,
+    values,
+)
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from sqlalchemy.orm import contains_eager, joinedload
+from sqlalchemy.sql.functions import FunctionElement
 
+from mspy_vendi.config import config
+from mspy_vendi.core.cache import cached_statistic
+from mspy_vendi.core.constants import CSV_SOURCE_SYSTEM
+from mspy_vendi.core.enums import ImportSkipReasonEnum
 from mspy_vendi.core.enums.date_range import DailyTimePeriodEnum, DateRangeEnum, TimePeriodEnum
-from mspy_vendi.core.exceptions.base_exception import NotFoundError
+from mspy_vendi.core.exceptions.base_exception import BadRequestError, NotFoundError, raise_db_error
 from mspy_vendi.core.filter import BaseFilter
+from mspy_vendi.core.helpers import get_previous_month_range, is_join_present, set_end_of_day_time
 from mspy_vendi.core.manager import CRUDManager, Model, Schema
-from mspy_vendi.core.pagination import Page
-from mspy_vendi.db import Sale
+from mspy_vendi.core.pagination import Page, paginate
+from mspy_vendi.core.schemas import BulkUpsertResultSchema
+from mspy_vendi.db import Sale, SaleDailyRollup
+from mspy_vendi.domain.entitlements.manager import EntitlementManager
 from mspy_vendi.domain.geographies.models import Geography
 from mspy_vendi.domain.machines.manager import MachineManager
 from mspy_vendi.domain.machines.models import Machine, MachineUser
 from mspy_vendi.domain.product_category.models import ProductCategory
-from mspy_vendi.domain.product_user.models import ProductUser
 from mspy_vendi.domain.products.manager import ProductManager
 from mspy_vendi.domain.products.models import Product
-from mspy_vendi.domain.sales.filters import ExportSaleFilter, SaleFilter, StatisticDateRangeFilter
+from mspy_vendi.domain.sales.filters import (
+    ExportSaleFilter,
+    SaleDailyRollupFilter,
+    SaleFilter,
+    StatisticDateRangeFilter,
+)
 from mspy_vendi.domain.sales.schemas import (
     CategoryProductQuantityDateSchema,
     CategoryProductQuantitySchema,
@@ -34,6 +81,8 @@ from mspy_vendi.domain.sales.schemas import (
     ProductsCountGeographySchema,
     ProductVenueSalesCountSchema,
     QuantityStatisticSchema,
+    SaleCreateSchema,
+    SaleDailyRollupDeltaSchema,
     SalesBulkCreateResponseSchema,
     TimeFrameSalesSchema,
     TimePeriodSalesCountSchema,
@@ -45,11 +94,149 @@ from mspy_vendi.domain.sales.schemas import (
 from mspy_vendi.domain.user.models import User
 from mspy_vendi.domain.user.schemas import UserScheduleSchema
 
+# Fields applied by the period statistic queries on their own, without modifying the filter object.
+PERIOD_STATISTIC_EXCLUDED_FIELDS: tuple[str, ...] = ("date_from", "date_to", "geography_id__in", "product_id__in")
+
+
+class SaleDailyRollupManager(CRUDManager):
+    sql_model = SaleDailyRollup
+
+    @staticmethod
+    def _merge_deltas(deltas: Sequence[SaleDailyRollupDeltaSchema]) -> list[dict[str, Any]]:
+        """
+        Merge deltas with the same (sale_date, machine_id, product_id) key,
+        because one `INSERT ... ON CONFLICT DO UPDATE` statement can't affect the same row twice.
+
+        :param deltas: Sale changes to apply.
+
+        :return: List of merged deltas without empty ones.
+        """
+        merged: dict[tuple[date, int, int], dict[str, Any]] = {}
+
+        for delta in deltas:
+            item = merged.setdefault(
+                (delta.sale_date, delta.machine_id, delta.product_id),
+                delta.model_dump(exclude={"quantity", "transactions_count"}) | {"quantity": 0, "transactions_count": 0},
+            )
+            item["quantity"] += delta.quantity
+            item["transactions_count"] += delta.transactions_count
+
+        return [item for item in merged.values() if item["quantity"] or item["transactions_count"]]
+
+    async def apply_deltas(self, deltas: Sequence[SaleDailyRollupDeltaSchema], autocommit: bool = False) -> None:
+        """
+        Incrementally apply sale changes to the daily rollup.
+        Rows without any sale records left are removed.
+
+        :param deltas: Sale changes to apply. Negative values revert previously applied sales.
+        :param autocommit: If True, commit changes immediately, otherwise flush changes.
+        """
+        if not (rows := self._merge_deltas(deltas)):
+            return
+
+        delta_values = values(
+            column("sale_date", Date),
+            column("machine_id", BigInteger),
+            column("product_id", BigInteger),
+            column("quantity", BigInteger),
+            column("transactions_count", BigInteger),
+            name="delta",
+        ).data([tuple(row.values()) for row in rows])
+
+        stmt = insert(self.sql_model).from_select(
+            ["sale_date", "machine_id", "product_id", "quantity", "transactions_count"],
+            select(delta_values),
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_sale_daily_rollup_sale_date_machine_id_product_id",
+            set_={
+                "quantity": self.sql_model.quantity + stmt.excluded.quantity,
+                "transactions_count": self.sql_model.transactions_count + stmt.excluded.transactions_count,
+                "updated_at": func.current_timestamp(),
+            },
+        )
+
+        try:
+            await self.session.execute(stmt)
+
+            if any(row["transactions_count"] < 0 for row in rows):
+                await self.session.execute(
+                    delete(self.sql_model)
+                    .where(self.sql_model.transactions_count <= 0)
+                    .where(
+                        tuple_(self.sql_model.sale_date, self.sql_model.machine_id, self.sql_model.product_id).in_(
+                            [(row["sale_date"], row["machine_id"], row["product_id"]) for row in rows]
+                        )
+                    )
+                )
+
+            if autocommit:
+                await self.session.commit()
+            else:
+                await self.session.flush()
+
+        except DBAPIError as ex:
+            await self.session.rollback()
+            raise_db_error(ex)
+
+    async def rebuild(self, date_from: date | None = None, date_to: date | None = None) -> int:
+        """
+        Rebuild the daily rollup from the `sale` table for the given date range (inclusive).
+        The whole table is rebuilt if no range is provided.
+
+        :param date_from: First sale date to rebuild.
+        :param date_to: Last sale date to rebuild.
+
+        :return: Count of the rebuilt rollup rows.
+        """
+        conditions: list[ColumnElement] = []
+        rollup_conditions: list[ColumnElement] = []
+
+        if date_from:
+            conditions.append(Sale.sale_date >= date_from)
+            rollup_conditions.append(self.sql_model.sale_date >= date_from)
+
+        if date_to:
+            conditions.append(Sale.sale_date <= date_to)
+            rollup_conditions.append(self.sql_model.sale_date <= date_to)
+
+        select_stmt = (
+            select(Sale.sale_date, Sale.machine_id, Sale.product_id, func.sum(Sale.quantity), func.count())
+            .where(*conditions)
+            .group_by(Sale.sale_date, Sale.machine_id, Sale.product_id)
+        )
+
+        stmt = insert(self.sql_model).from_select(
+            ["sale_date", "machine_id", "product_id", "quantity", "transactions_count"],
+            select_stmt,
+        )
+
+        try:
+            await self.session.execute(delete(self.sql_model).where(*rollup_conditions))
+            rebuilt_rows: int = (await self.session.execute(stmt)).rowcount
+            await self.session.commit()
+
+        except DBAPIError as ex:
+            await self.session.rollback()
+            raise_db_error(ex)
+
+        return rebuilt_rows
+
 
 class SaleManager(CRUDManager):
     sql_model = Sale
 
-    def _generate_geography_query(self, query_filter: BaseFilter, stmt: Select, modify_filter: bool = True) -> Select:
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+        self.entitlement_manager = EntitlementManager(session)
+
+    def _generate_geography_query(
+        self,
+        query_filter: BaseFilter,
+        stmt: Select,
+        modify_filter: bool = True,
+        source: type[Sale] | type[SaleDailyRollup] | None = None,
+    ) -> Select:
         """
         Generate query to filter by geography_id field.
         It makes a join with Machine and Geography tables to filter by geography_id field.
@@ -57,12 +244,15 @@ class SaleManager(CRUDManager):
         :param query_filter: Filter object.
         :param stmt: Current statement.
         :param modify_filter: Flag to modify the filter object.
+        :param source: Table the statement aggregates from. Default is `Sale`.
 
         :return: New statement with the filter applied.
         """
+        source = source or self.sql_model
+
         if query_filter.geography_id__in:
             stmt = (
-                stmt.join(Machine, Machine.id == self.sql_model.machine_id)
+                stmt.join(Machine, Machine.id == source.machine_id)
                 .join(Geography, Geography.id == Machine.geography_id)
                 .where(Geography.id.in_(query_filter.geography_id__in))
             )
@@ -72,7 +262,13 @@ class SaleManager(CRUDManager):
 
         return stmt
 
-    def _generate_product_query(self, query_filter: BaseFilter, stmt: Select, modify_filter: bool = True) -> Select:
+    def _generate_product_query(
+        self,
+        query_filter: BaseFilter,
+        stmt: Select,
+        modify_filter: bool = True,
+        source: type[Sale] | type[SaleDailyRollup] | None = None,
+    ) -> Select:
         """
         Generate query to filter by product_id field.
         It makes a join with Product table to filter by product_id field.
@@ -80,10 +276,13 @@ class SaleManager(CRUDManager):
         :param query_filter: Filter object.
         :param stmt: Current statement.
         :param modify_filter: Flag to modify the filter object.
+        :param source: Table the statement aggregates from. Default is `Sale`.
         :return: New statement with the filter applied.
         """
+        source = source or self.sql_model
+
         if query_filter.product_id__in:
-            stmt = stmt.join(Product, Product.id == self.sql_model.product_id).where(
+            stmt = stmt.join(Product, Product.id == source.product_id).where(
                 Product.id.in_(query_filter.product_id__in)
             )
             # We do it to ignore the field inside the filter block
@@ -92,34 +291,103 @@ class SaleManager(CRUDManager):
 
         return stmt
 
-    def _generate_user_query(self, query_filter: BaseFilter, user: User, stmt: Select) -> Select:
+    async def _generate_user_query(
+        self,
+        user: User | UserScheduleSchema,
+        stmt: Select,
+        source: type[Sale] | type[SaleDailyRollup] | None = None,
+    ) -> Select:
         """
         Generate query to filter by assigned Machines and Products.
-        It makes a join with User table to filter by assigned Machines amd Products.
+        It restricts the machine and product columns of the source to the entitlement of the user.
         If the user is a superuser, it returns the original statement.
 
-        :param query_filter: Filter object.
         :param user: Current user.
         :param stmt: Current statement.
+        :param source: Table the statement aggregates from. Default is `Sale`.
 
         :return: New statement with the filter applied.
         """
         if user.is_superuser:
             return stmt
 
-        if not query_filter.geography_id__in:
-            stmt = stmt.join(Machine, Machine.id == self.sql_model.machine_id)
+        source = source or self.sql_model
+        entitlement = await self.entitlement_manager.get_user_entitlement(user)
 
-        if not query_filter.product_id__in:
-            stmt = stmt.join(Product, Product.id == self.sql_model.product_id)
-
-        return (
-            stmt.join(MachineUser, MachineUser.machine_id == Machine.id)
-            .join(ProductUser, ProductUser.product_id == Product.id)
-            .where(MachineUser.user_id == user.id)
-            .where(ProductUser.user_id == user.id)
+        return self.entitlement_manager.generate_entitlement_query(
+            stmt, entitlement, machine_id_column=source.machine_id, product_id_column=source.product_id
         )
 
+    @staticmethod
+    def _get_source(
+        query_filter: SaleFilter,
+        time_frame: DateRangeEnum | None = None,
+    ) -> type[Sale] | type[SaleDailyRollup]:
+        """
+        Choose the table to aggregate sales from.
+        The daily rollup is used when the requested granularity is a day or coarser and the filter
+        doesn't contain per-sale fields, otherwise the raw `sale` table is used.
+
+        :param query_filter: Filter object.
+        :param time_frame: Time frame to group the data, if any.
+
+        :return: `SaleDailyRollup` or `Sale` model.
+        """
+        if not config.sale_rollup_enabled or time_frame == DateRangeEnum.HOUR:
+            return Sale
+
+        if getattr(query_filter, "quantity", None) or getattr(query_filter, "source_system_id", None):
+            return Sale
+
+        return SaleDailyRollup
+
+    @staticmethod
+    def _filter_source(
+        query_filter: SaleFilter,
+        stmt: Select,
+        source: type[Sale] | type[SaleDailyRollup],
+        exclude_fields: Iterable[str] | None = None,
+    ) -> Select:
+        """
+        Apply the filter to the table the statement aggregates from.
+
+        :param query_filter: Filter object.
+        :param stmt: Current statement.
+        :param source: `SaleDailyRollup` or `Sale` model.
+        :param exclude_fields: Fields which are already applied to the statement.
+
+        :return: New statement with the filter applied.
+        """
+        if source is SaleDailyRollup:
+            query_filter = SaleDailyRollupFilter(**query_filter.model_dump(exclude={"quantity", "source_system_id"}))
+
+        return query_filter.filter(stmt, exclude_fields=exclude_fields)
+
+    @staticmethod
+    def _avg_quantity(
+        source: type[Sale] | type[SaleDailyRollup],
+        condition: ColumnElement | None = None,
+    ) -> ColumnElement:
+        """
+        Average quantity per sale record.
+        For the daily rollup it is calculated as the total quantity divided by the number of sale records.
+
+        :param source: `SaleDailyRollup` or `Sale` model.
+        :param condition: Optional `FILTER (WHERE ...)` condition of the aggregate.
+
+        :return: Aggregate expression.
+        """
+
+        def _aggregate(function: FunctionElement) -> FunctionElement:
+            return function.filter(condition) if condition is not None else function
+
+        if source is SaleDailyRollup:
+            return _aggregate(func.sum(source.quantity)) / func.nullif(
+                _aggregate(func.sum(source.transactions_count)), 0
+            )
+
+        return _aggregate(func.avg(source.quantity))
+
     @staticmethod
     def generate_previous_month_filter(query_filter: SaleFilter) -> SaleFilter:
         """
@@ -129,11 +397,7 @@ class SaleManager(CRUDManager):
         :param query_filter: The original SaleFilter instance.
         :return: A new SaleFilter with date_from and date_to set to the previous month's range.
         """
-        current_date = query_filter.date_from
-        first_day_of_current_month = current_date.replace(day=1)
-
-        last_day_of_previous_month = first_day_of_current_month - timedelta(days=1)
-        first_day_of_previous_month = last_day_of_previous_month.replace(day=1)
+        first_day_of_previous_month, last_day_of_previous_month = get_previous_month_range(query_filter.date_from)
 
         return SaleFilter(
             date_from=first_day_of_previous_month,
@@ -141,6 +405,30 @@ class SaleManager(CRUDManager):
             **query_filter.model_dump(exclude={"date_from", "date_to"}),
         )
 
+    @staticmethod
+    def _generate_period_conditions(
+        query_filter: SaleFilter,
+        date_column: ColumnElement,
+    ) -> tuple[ColumnElement, ColumnElement, ColumnElement]:
+        """
+        Generate conditions for the requested period and the previous month,
+        so both statistics can be calculated in one query with `FILTER (WHERE ...)`.
+
+        :param query_filter: Filter object, it isn't modified.
+        :param date_column: Date column to compare.
+
+        :return: Conditions for the current period, the previous month and the range covering both.
+        """
+        date_to: datetime = set_end_of_day_time(query_filter.date_to)
+        previous_date_from, previous_date_to = get_previous_month_range(query_filter.date_from)
+        previous_date_to = set_end_of_day_time(previous_date_to)
+
+        return (
+            date_column.between(query_filter.date_from, date_to),
+            date_column.between(previous_date_from, previous_date_to),
+            date_column.between(min(previous_date_from, query_filter.date_from), max(previous_date_to, date_to)),
+        )
+
     @staticmethod
     def _generate_date_range_cte(time_frame: DateRangeEnum, query_filter: StatisticDateRangeFilter) -> CTE:
         """
@@ -161,16 +449,32 @@ class SaleManager(CRUDManager):
         ).cte()
 
     @staticmethod
-    def _get_time_periods(
+    def _generate_time_period_case(
         time_period: type[TimePeriodEnum] | type[DailyTimePeriodEnum],
-    ) -> dict[str, tuple[time, time]]:
+        sale_time: ColumnElement,
+    ) -> Case:
         """
-        Generate a dictionary mapping time period names to start and end times.
+        Generate CASE expression which maps the sale time to the time period name.
+        Period boundaries are taken from the enum and are inclusive.
+        A period whose start is greater than its end (e.g. `10 PM-2 AM`) wraps past midnight.
 
         :param time_period: An enum class defining time periods.
-        :return: A dictionary where keys are period names and values are tuples of (start_time, end_time).
+        :param sale_time: Time column to map.
+
+        :return: CASE expression with the time period name or NULL if no period matches.
         """
-        return {period.name: (period.start, period.end) for period in time_period}
+        return case(
+            *[
+                (
+                    or_(sale_time >= period.start, sale_time <= period.end)
+                    if period.start > period.end
+                    else sale_time.between(period.start, period.end),
+                    period.name,
+                )
+                for period in time_period
+            ],
+            else_=null(),
+        )
 
     @staticmethod
     def sort_additional_fields(
@@ -203,6 +507,33 @@ class SaleManager(CRUDManager):
 
         return stmt
 
+    @staticmethod
+    def _generate_rollup_delta(
+        sale: Sale | SaleCreateSchema | dict[str, Any],
+        sign: Literal[1, -1] = 1,
+    ) -> SaleDailyRollupDeltaSchema:
+        """
+        Convert a sale into the daily rollup delta.
+
+        :param sale: Sale object, schema or dictionary.
+        :param sign: 1 to add the sale to the rollup, -1 to revert it.
+
+        :return: Daily rollup delta.
+        """
+        sale_data: dict[str, Any] = (
+            sale
+            if isinstance(sale, dict)
+            else {field: getattr(sale, field) for field in ("sale_date", "machine_id", "product_id", "quantity")}
+        )
+
+        return SaleDailyRollupDeltaSchema(
+            sale_date=sale_data["sale_date"],
+            machine_id=sale_data["machine_id"],
+            product_id=sale_data["product_id"],
+            quantity=sign * sale_data["quantity"],
+            transactions_count=sign,
+        )
+
     async def get(self, obj_id: int, *, raise_error: bool = True, user: User | None = None, **_: Any) -> Sale | None:
         """
         This method retrieves an object from the database using its ID.
@@ -221,10 +552,12 @@ class SaleManager(CRUDManager):
         stmt = self.get_query().where(self.sql_model.id == obj_id)
 
         if user and not user.is_superuser:
-            stmt = (
-                stmt.join(Machine, Machine.id == self.sql_model.machine_id)
-                .join(MachineUser, MachineUser.machine_id == Machine.id)
-                .where(MachineUser.user_id == user.id)
+            entitlement = await self.entitlement_manager.get_user_entitlement(user)
+            stmt = self.entitlement_manager.generate_entitlement_query(
+                stmt,
+                entitlement,
+                machine_id_column=self.sql_model.machine_id,
+                product_id_column=self.sql_model.product_id,
             )
 
         if not (result := await self.session.scalar(stmt)) and raise_error:
@@ -243,7 +576,11 @@ class SaleManager(CRUDManager):
         stmt = self.get_query().options(joinedload(Sale.product), contains_eager(Sale.machine))
 
         stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_user_query(query_filter, user, stmt)
+
+        if not is_join_present(stmt, Machine):
+            stmt = stmt.join(Machine, Machine.id == self.sql_model.machine_id)
+
+        stmt = await self._generate_user_query(user, stmt)
 
         setattr(query_filter, "geography_id__in", None)
 
@@ -257,47 +594,42 @@ class SaleManager(CRUDManager):
 
             return (await self.session.scalars(stmt)).all()  # type: ignore
 
-        return await paginate(self.session, stmt)
+        return await self.get_page(stmt, query_filter.order_by if query_filter else None)
 
+    @cached_statistic
     async def get_sales_quantity_by_product(self, query_filter: SaleFilter, user: User) -> QuantityStatisticSchema:
         """
         Get the total quantity of sales by product|s.
-        Calculate the sum of the quantity field. If no sales are found, raise a NotFoundError.
+        Calculate the sum of the quantity field for the current period and the previous month in one query.
 
         :param query_filter: Filter object that contains the filtering parameters for the query.
         :param user: Current user.
         :return: A schema containing the total quantity of sales for the current period
                  and the previous month.
         """
-        stmt = select(func.sum(self.sql_model.quantity).label("quantity"))
-
-        stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_user_query(query_filter, user, stmt)
-
-        setattr(query_filter, "geography_id__in", None)
-        setattr(query_filter, "product_id__in", None)
-        stmt = query_filter.filter(stmt)
-
-        stmt_previous_month_stat = select(func.sum(self.sql_model.quantity).label("previous_month_statistic"))
-        query_filter = self.generate_previous_month_filter(query_filter)
+        source = self._get_source(query_filter)
+        current_period, previous_month, covering_period = self._generate_period_conditions(
+            query_filter, source.sale_date
+        )
 
-        stmt_previous_month_stat = self._generate_geography_query(query_filter, stmt_previous_month_stat)
-        stmt_previous_month_stat = self._generate_product_query(query_filter, stmt_previous_month_stat)
-        stmt_previous_month_stat = self._generate_user_query(query_filter, user, stmt_previous_month_stat)
+        stmt = select(
+            func.sum(source.quantity).filter(current_period).label("quantity"),
+            func.sum(source.quantity).filter(previous_month).label("previous_month_statistic"),
+        ).where(covering_period)
 
-        setattr(query_filter, "geography_id__in", None)
-        setattr(query_filter, "product_id__in", None)
-        stmt_previous_month_stat = query_filter.filter(stmt_previous_month_stat)
+        stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False, source=source)
+        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False, source=source)
+        stmt = await self._generate_user_query(user, stmt, source=source)
+        stmt = self._filter_source(query_filter, stmt, source, exclude_fields=PERIOD_STATISTIC_EXCLUDED_FIELDS)
 
-        current_month_result = await self.session.scalar(stmt) or 0
-        previous_month_result = await self.session.scalar(stmt_previous_month_stat) or 0
+        row: Row = (await self.session.execute(stmt)).one()
 
         return QuantityStatisticSchema(
-            quantity=current_month_result,
-            previous_month_statistic=previous_month_result,
+            quantity=row.quantity or 0,
+            previous_month_statistic=row.previous_month_statistic or 0,
         )
 
+    @cached_statistic
     async def get_sales_quantity_per_range(
         self,
         time_frame: DateRangeEnum,
@@ -315,19 +647,21 @@ class SaleManager(CRUDManager):
 
         :return: Total quantity of sales per time frame.
         """
-        stmt_time_frame = label("time_frame", func.date_trunc(time_frame.value, self.sql_model.sale_date))
-        stmt_sum_quantity = label("quantity", func.sum(self.sql_model.quantity))
+        source = self._get_source(query_filter, time_frame)
+
+        stmt_time_frame = label("time_frame", func.date_trunc(time_frame.value, source.sale_date))
+        stmt_sum_quantity = label("quantity", func.sum(source.quantity))
 
         stmt = select(stmt_time_frame, stmt_sum_quantity).group_by(stmt_time_frame).order_by(stmt_time_frame)
 
-        stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_user_query(query_filter, user, stmt)
+        stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False, source=source)
+        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False, source=source)
+        stmt = await self._generate_user_query(user, stmt, source=source)
 
         setattr(query_filter, "geography_id__in", None)
         setattr(query_filter, "product_id__in", None)
 
-        stmt = query_filter.filter(stmt)
+        stmt = self._filter_source(query_filter, stmt, source)
         stmt = stmt.subquery()
 
         date_range_cte = self._generate_date_range_cte(time_frame, query_filter)
@@ -341,42 +675,41 @@ class SaleManager(CRUDManager):
 
         return await paginate(self.session, final_stmt)
 
+    @cached_statistic
     async def get_average_sales_across_machines(
         self, query_filter: SaleFilter, user: User
     ) -> DecimalQuantityStatisticSchema:
         """
-        Get the average quantity of sales for the current period and the previous month.
+        Get the average quantity of sales for the current period and the previous month in one query.
 
         :param query_filter: Filter object that contains the filtering parameters for the query.
         :param user: Current user.
         :return: A schema containing the average quantity of sales for the current period
                  and the previous month.
         """
-        stmt = select(func.avg(self.sql_model.quantity).label("quantity"))
-
-        stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_user_query(query_filter, user, stmt)
-
-        setattr(query_filter, "geography_id__in", None)
-        setattr(query_filter, "product_id__in", None)
-
-        stmt = query_filter.filter(stmt)
+        source = self._get_source(query_filter)
+        current_period, previous_month, covering_period = self._generate_period_conditions(
+            query_filter, source.sale_date
+        )
 
-        stmt_previous_month_stat = select(func.avg(self.sql_model.quantity).label("previous_month_statistic"))
-        query_filter = self.generate_previous_month_filter(query_filter)
-        stmt_previous_month_stat = self._generate_geography_query(query_filter, stmt_previous_month_stat)
+        stmt = select(
+            self._avg_quantity(source, current_period).label("quantity"),
+            self._avg_quantity(source, previous_month).label("previous_month_statistic"),
+        ).where(covering_period)
 
-        stmt_previous_month_stat = query_filter.filter(stmt_previous_month_stat)
+        stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False, source=source)
+        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False, source=source)
+        stmt = await self._generate_user_query(user, stmt, source=source)
+        stmt = self._filter_source(query_filter, stmt, source, exclude_fields=PERIOD_STATISTIC_EXCLUDED_FIELDS)
 
-        current_month_result = await self.session.scalar(stmt) or 0
-        previous_month_result = await self.session.scalar(stmt_previous_month_stat) or 0
+        row: Row = (await self.session.execute(stmt)).one()
 
         return DecimalQuantityStatisticSchema(
-            quantity=current_month_result,
-            previous_month_statistic=previous_month_result,
+            quantity=row.quantity or 0,
+            previous_month_statistic=row.previous_month_statistic or 0,
         )
 
+    @cached_statistic
     async def get_average_sales_per_range(
         self,
         time_frame: DateRangeEnum,
@@ -394,19 +727,21 @@ class SaleManager(CRUDManager):
 
         :return: Average quantity of sales per time frame.
         """
-        stmt_time_frame = label("time_frame", func.date_trunc(time_frame.value, self.sql_model.sale_date))
-        stmt_avg_quantity = label("quantity", func.avg(self.sql_model.quantity))
+        source = self._get_source(query_filter, time_frame)
+
+        stmt_time_frame = label("time_frame", func.date_trunc(time_frame.value, source.sale_date))
+        stmt_avg_quantity = label("quantity", self._avg_quantity(source))
 
         stmt = select(stmt_time_frame, stmt_avg_quantity).group_by(stmt_time_frame)
 
-        stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_user_query(query_filter, user, stmt)
+        stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False, source=source)
+        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False, source=source)
+        stmt = await self._generate_user_query(user, stmt, source=source)
 
         setattr(query_filter, "geography_id__in", None)
         setattr(query_filter, "product_id__in", None)
 
-        stmt = query_filter.filter(stmt)
+        stmt = self._filter_source(query_filter, stmt, source)
         stmt = stmt.subquery()
 
         date_range_cte = self._generate_date_range_cte(time_frame, query_filter)
@@ -420,6 +755,7 @@ class SaleManager(CRUDManager):
 
         return await paginate(self.session, final_stmt)
 
+    @cached_statistic
     async def get_sales_quantity_per_category(
         self, query_filter: SaleFilter, user: User
     ) -> Page[CategoryProductQuantitySchema]:
@@ -431,13 +767,15 @@ class SaleManager(CRUDManager):
 
         :return: A paginated list with each product category's quantity.
         """
+        source = self._get_source(query_filter)
+
         stmt_category_name = label("category_name", ProductCategory.name)
         stmt_category_id = label("category_id", ProductCategory.id)
-        stmt_sum_category_quantity = label("quantity", func.sum(self.sql_model.quantity))
+        stmt_sum_category_quantity = label("quantity", func.sum(source.quantity))
 
         stmt = (
             select(stmt_category_id, stmt_category_name, stmt_sum_category_quantity)
-            .join(Product, Product.id == self.sql_model.product_id)
+            .join(Product, Product.id == source.product_id)
             .join(ProductCategory, ProductCategory.id == Product.product_category_id)
             .group_by(stmt_category_name, stmt_category_id)
             .order_by(stmt_sum_category_quantity.desc())
@@ -445,7 +783,7 @@ class SaleManager(CRUDManager):
 
         if query_filter.geography_id__in:
             stmt = (
-                stmt.join(Machine, Machine.id == self.sql_model.machine_id)
+                stmt.join(Machine, Machine.id == source.machine_id)
                 .join(Geography, Geography.id == Machine.geography_id)
                 .where(Geography.id.in_(query_filter.geography_id__in))
             )
@@ -455,19 +793,13 @@ class SaleManager(CRUDManager):
             stmt = stmt.where(Product.id.in_(query_filter.product_id__in))
             setattr(query_filter, "product_id__in", None)
 
-        if not user.is_superuser:
-            stmt = (
-                stmt.join(Machine, Machine.id == self.sql_model.machine_id)
-                .join(MachineUser, MachineUser.machine_id == Machine.id)
-                .join(ProductUser, ProductUser.product_id == Product.id)
-                .where(MachineUser.user_id == user.id)
-                .where(ProductUser.user_id == user.id)
-            )
+        stmt = await self._generate_user_query(user, stmt, source=source)
 
-        stmt = query_filter.filter(stmt)
+        stmt = self._filter_source(query_filter, stmt, source)
 
         return await paginate(self.session, stmt)
 
+    @cached_statistic
     async def get_sales_category_quantity(
         self,
         query_filter: SaleFilter,
@@ -481,14 +813,16 @@ class SaleManager(CRUDManager):
 
         :return: A paginated list with each product category's sales quantity over time.
         """
+        source = self._get_source(query_filter)
+
         stmt_category_name = label("category_name", ProductCategory.name)
         stmt_category_id = label("category_id", ProductCategory.id)
-        stmt_sale_date = label("time_frame", func.date_trunc("day", self.sql_model.sale_date))
-        stmt_sum_quantity = label("quantity", func.sum(self.sql_model.quantity))
+        stmt_sale_date = label("time_frame", func.date_trunc("day", source.sale_date))
+        stmt_sum_quantity = label("quantity", func.sum(source.quantity))
 
         subquery = (
             select(stmt_category_id, stmt_category_name, stmt_sale_date, stmt_sum_quantity)
-            .join(Product, Product.id == self.sql_model.product_id)
+            .join(Product, Product.id == source.product_id)
             .join(ProductCategory, ProductCategory.id == Product.product_category_id)
             .group_by(stmt_category_name, stmt_sale_date, stmt_category_id)
             .order_by(stmt_category_name, stmt_sale_date)
@@ -496,7 +830,7 @@ class SaleManager(CRUDManager):
 
         if query_filter.geography_id__in:
             subquery = (
-                subquery.join(Machine, Machine.id == self.sql_model.machine_id)
+                subquery.join(Machine, Machine.id == source.machine_id)
                 .join(Geography, Geography.id == Machine.geography_id)
                 .where(Geography.id.in_(query_filter.geography_id__in))
             )
@@ -506,16 +840,9 @@ class SaleManager(CRUDManager):
             subquery = subquery.where(Product.id.in_(query_filter.product_id__in))
             setattr(query_filter, "product_id__in", None)
 
-        if not user.is_superuser:
-            subquery = (
-                subquery.join(Machine, Machine.id == self.sql_model.machine_id)
-                .join(MachineUser, MachineUser.machine_id == Machine.id)
-                .join(ProductUser, ProductUser.product_id == Product.id)
-                .where(MachineUser.user_id == user.id)
-                .where(ProductUser.user_id == user.id)
-            )
+        subquery = await self._generate_user_query(user, subquery, source=source)
 
-        subquery = query_filter.filter(subquery).subquery()
+        subquery = self._filter_source(query_filter, subquery, source).subquery()
 
         stmt = (
             select(
@@ -536,6 +863,7 @@ class SaleManager(CRUDManager):
 
         return await paginate(self.session, stmt, unique=False)
 
+    @cached_statistic
     async def get_sales_count_per_time_period(
         self,
         time_period: type[DailyTimePeriodEnum],
@@ -545,6 +873,7 @@ class SaleManager(CRUDManager):
         """
         Get the sales count for each time frame.
         e.g (6 AM - 6 PM, 6 PM - 8 PM, 8 AM - 10 PM, 10 PM - 12 AM, 12 AM - 2 AM, 2 AM - 6 AM).
+        Sales are bucketed and counted in the database, so only one row per time period is fetched.
 
         :param time_period: Enum object to map sales.
         :param user: Current user.
@@ -552,13 +881,13 @@ class SaleManager(CRUDManager):
 
         :return: A list with sales count for each time period.
         """
-        time_periods = self._get_time_periods(time_period)
+        stmt_time_period = label("time_period", self._generate_time_period_case(time_period, self.sql_model.sale_time))
 
-        stmt = select(self.sql_model.sale_time)
+        stmt = select(stmt_time_period, func.count().label("sales")).group_by(stmt_time_period)
 
         stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False)
         stmt = self._generate_product_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_user_query(query_filter, user, stmt)
+        stmt = await self._generate_user_query(user, stmt)
 
         setattr(query_filter, "geography_id__in", None)
         setattr(query_filter, "product_id__in", None)
@@ -566,18 +895,14 @@ class SaleManager(CRUDManager):
         stmt = query_filter.filter(stmt)
 
         result = await self.session.execute(stmt)
-        sale_times = [row.sale_time for row in result.fetchall()]
-
-        sales_by_period = {period: 0 for period in time_periods.keys()}
 
-        for sale_time in sale_times:
-            for period_name, (start, end) in time_periods.items():
-                if start <= sale_time <= end:
-                    sales_by_period[period_name] += 1
-                    break
+        sales_by_period = {period.name: 0 for period in time_period} | {
+            row.time_period: row.sales for row in result.all() if row.time_period
+        }
 
         return [{"time_period": period, "sales": count} for period, count in sales_by_period.items()]  # type: ignore
 
+    @cached_statistic
     async def get_sales_revenue_per_time_period(
         self,
         time_period: type[TimePeriodEnum],
@@ -586,6 +911,7 @@ class SaleManager(CRUDManager):
     ) -> list[TimePeriodSalesRevenueSchema]:
         """
         Get the total sales revenue (quantity * price) for each time frame.
+        Sales are bucketed and summed in the database, so only one row per time period is fetched.
 
         :param time_period: Enum object to map sales.
         :param query_filter: Filter object.
@@ -593,17 +919,20 @@ class SaleManager(CRUDManager):
 
         :return: A list with sales revenue for each time period.
         """
-        time_periods = self._get_time_periods(time_period)
+        stmt_time_period = label("time_period", self._generate_time_period_case(time_period, self.sql_model.sale_time))
 
-        stmt = select(self.sql_model.sale_time, (self.sql_model.quantity * Product.price).label("revenue"))
+        stmt = select(
+            stmt_time_period,
+            func.sum(self.sql_model.quantity * Product.price).label("revenue"),
+        ).group_by(stmt_time_period)
 
         stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False)
+        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False)
 
-        if user.is_superuser:
+        if not is_join_present(stmt, Product):
             stmt = stmt.join(Product, Product.id == self.sql_model.product_id)
-        else:
-            stmt = self._generate_product_query(query_filter, stmt, modify_filter=False)
-            stmt = self._generate_user_query(query_filter, user, stmt)
+
+        stmt = await self._generate_user_query(user, stmt)
 
         setattr(query_filter, "geography_id__in", None)
         setattr(query_filter, "product_id__in", None)
@@ -611,19 +940,14 @@ class SaleManager(CRUDManager):
         stmt = query_filter.filter(stmt)
 
         result = await self.session.execute(stmt)
-        rows = result.fetchall()
-
-        revenue_by_period = {period: 0 for period in time_periods.keys()}
 
-        for row in rows:
-            sale_time, revenue = row.sale_time, row.revenue
-            for period_name, (start, end) in time_periods.items():
-                if start <= sale_time <= end:
-                    revenue_by_period[period_name] += revenue
-                    break
+        revenue_by_period = {period.name: 0 for period in time_period} | {
+            row.time_period: row.revenue for row in result.all() if row.time_period
+        }
 
         return [{"time_period": period, "revenue": total} for period, total in revenue_by_period.items()]  # type: ignore
 
+    @cached_statistic
     async def get_units_sold_per_range(
         self,
         time_frame: DateRangeEnum,
@@ -639,22 +963,26 @@ class SaleManager(CRUDManager):
 
         :return: Paginated list of units sold per each time frame.
         """
-        stmt_time_frame = label("time_frame", func.date_trunc(time_frame.value, self.sql_model.sale_date))
-        stmt_units = label("units", func.sum(self.sql_model.quantity * Product.price))
+        source = self._get_source(query_filter, time_frame)
+
+        stmt_time_frame = label("time_frame", func.date_trunc(time_frame.value, source.sale_date))
+        stmt_units = label("units", func.sum(source.quantity * Product.price))
 
         sales_subquery = select(stmt_time_frame, stmt_units).group_by(stmt_time_frame)
 
-        sales_subquery = self._generate_geography_query(query_filter, sales_subquery, modify_filter=False)
-        sales_subquery = self._generate_product_query(query_filter, sales_subquery, modify_filter=False)
-        sales_subquery = self._generate_user_query(query_filter, user, sales_subquery)
+        sales_subquery = self._generate_geography_query(
+            query_filter, sales_subquery, modify_filter=False, source=source
+        )
+        sales_subquery = self._generate_product_query(query_filter, sales_subquery, modify_filter=False, source=source)
+        sales_subquery = await self._generate_user_query(user, sales_subquery, source=source)
 
         setattr(query_filter, "geography_id__in", None)
         setattr(query_filter, "product_id__in", None)
 
-        if user.is_superuser:
-            sales_subquery = sales_subquery.join(Product, Product.id == self.sql_model.product_id)
+        if not is_join_present(sales_subquery, Product):
+            sales_subquery = sales_subquery.join(Product, Product.id == source.product_id)
 
-        sales_subquery = query_filter.filter(sales_subquery).subquery()
+        sales_subquery = self._filter_source(query_filter, sales_subquery, source).subquery()
 
         date_range_cte = self._generate_date_range_cte(time_frame, query_filter)
 
@@ -667,65 +995,45 @@ class SaleManager(CRUDManager):
 
         return await paginate(self.session, final_stmt)
 
+    @cached_statistic
     async def get_units_sold_statistic(self, query_filter: SaleFilter, user: User) -> UnitsStatisticSchema:
         """
         Get the filtered units (quantity * price) sold and statistics for the previous month.
 
-        This method calculates the total units sold (quantity * price) for the current month
-        and the previous month based on the provided filter.
+        This method calculates the total units sold (quantity * price) for the current period
+        and the previous month in one query based on the provided filter.
 
         :param query_filter: Filter object to apply time range and geographical filters.
         :param user: Current user.
         :return: Units sold statistics, including current month and previous month data.
         """
-        stmt_units = label("units", func.sum(self.sql_model.quantity * Product.price))
-        stmt_previous_month_units = label("previous_month_stat", func.sum(self.sql_model.quantity * Product.price))
-
-        stmt = select(stmt_units)
-
-        stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False)
-        stmt = self._generate_user_query(query_filter, user, stmt)
-
-        setattr(query_filter, "geography_id__in", None)
-        setattr(query_filter, "product_id__in", None)
-
-        if user.is_superuser:
-            stmt = stmt.join(Product, Product.id == self.sql_model.product_id)
-
-        stmt = query_filter.filter(stmt)
-
-        stmt_previous_month_stat = select(stmt_previous_month_units)
-
-        query_filter = self.generate_previous_month_filter(query_filter)
-        stmt_previous_month_stat = self._generate_geography_query(
-            query_filter,
-            stmt_previous_month_stat,
-            modify_filter=False,
+        source = self._get_source(query_filter)
+        current_period, previous_month, covering_period = self._generate_period_conditions(
+            query_filter, source.sale_date
         )
-        stmt_previous_month_stat = self._generate_product_query(
-            query_filter,
-            stmt_previous_month_stat,
-            modify_filter=False,
-        )
-        stmt_previous_month_stat = self._generate_user_query(query_filter, user, stmt_previous_month_stat)
 
-        setattr(query_filter, "geography_id__in", None)
-        setattr(query_filter, "product_id__in", None)
+        stmt = select(
+            func.sum(source.quantity * Product.price).filter(current_period).label("units"),
+            func.sum(source.quantity * Product.price).filter(previous_month).label("previous_month_statistic"),
+        ).where(covering_period)
 
-        if user.is_superuser:
-            stmt_previous_month_stat = stmt_previous_month_stat.join(Product, Product.id == self.sql_model.product_id)
+        stmt = self._generate_geography_query(query_filter, stmt, modify_filter=False, source=source)
+        stmt = self._generate_product_query(query_filter, stmt, modify_filter=False, source=source)
+        stmt = await self._generate_user_query(user, stmt, source=source)
+
+        if not is_join_present(stmt, Product):
+            stmt = stmt.join(Product, Product.id == source.product_id)
 
-        stmt_previous_month_stat = query_filter.filter(stmt_previous_month_stat)
+        stmt = self._filter_source(query_filter, stmt, source, exclude_fields=PERIOD_STATISTIC_EXCLUDED_FIELDS)
 
-        current_month_result = await self.session.scalar(stmt) or 0
-        previous_month_result = await self.session.scalar(stmt_previous_month_stat) or 0
+        row: Row = (await self.session.execute(stmt)).one()
 
         return UnitsStatisticSchema(
-            units=current_month_result,
-            previous_month_statistic=previous_month_result,
+            units=row.units or 0,
+            previous_month_statistic=row.previous_month_statistic or 0,
         )
 
+    @cached_statistic
     async def get_sales_quantity_per_geography(
         self,
         query_filter: SaleFilter,
@@ -739,7 +1047,9 @@ class SaleManager(CRUDManager):
 
         :return: Paginated list of sales quantity across geography locations and geography objects.
         """
-        stmt_sum_quantity = label("quantity", func.sum(self.sql_model.quantity))
+        source = self._get_source(query_filter)
+
+        stmt_sum_quantity = label("quantity", func.sum(source.quantity))
         stmt_geography_id = label("id", Geography.id)
         stmt_geography_name = label("name", Geography.name)
         stmt_geography_postcode = label("postcode", Geography.postcode)
@@ -756,7 +1066,7 @@ class SaleManager(CRUDManager):
                     stmt_geography_postcode,
                 ).label("geography"),
             )
-            .join(Machine, Machine.id == self.sql_model.machine_id)
+            .join(Machine, Machine.id == source.machine_id)
             .join(Geography, stmt_geography_id == Machine.geography_id)
             .group_by(Geography.id)
             .order_by(Geography.id)
@@ -767,21 +1077,16 @@ class SaleManager(CRUDManager):
             setattr(query_filter, "geography_id__in", None)
 
         if query_filter.product_id__in:
-            stmt = stmt.where(Product.id.in_(query_filter.product_id__in))
+            stmt = stmt.where(source.product_id.in_(query_filter.product_id__in))
             setattr(query_filter, "product_id__in", None)
 
-        if not user.is_superuser:
-            stmt = (
-                stmt.join(Product, Product.id == self.sql_model.id)
-                .join(MachineUser, MachineUser.machine_id == Machine.id)
-                .join(ProductUser, ProductUser.product_id == Product.id)
-                .where(MachineUser.user_id == user.id)
-            )
+        stmt = await self._generate_user_query(user, stmt, source=source)
 
-        stmt = query_filter.filter(stmt)
+        stmt = self._filter_source(query_filter, stmt, source)
 
         return await paginate(self.session, stmt, unique=False)
 
+    @cached_statistic
     async def get_conversion_rate(self, query_filter: SaleFilter, user: User) -> ConversionRateSchema:
         """
         Get the conversion rate.
@@ -826,6 +1131,7 @@ class SaleManager(CRUDManager):
             customers_returning=getattr(row, "customers_returning", 0),
         )
 
+    @cached_statistic
     async def get_sales_by_venue_over_time(
         self, query_filter: SaleFilter, user: User
     ) -> Page[VenueSalesQuantitySchema]:
@@ -837,13 +1143,15 @@ class SaleManager(CRUDManager):
 
         :return: Paginated list of sales quantity across venue objects.
         """
-        stmt_sum_quantity = label("quantity", func.sum(self.sql_model.quantity))
+        source = self._get_source(query_filter)
+
+        stmt_sum_quantity = label("quantity", func.sum(source.quantity))
         stmt_venue_name = label("venue", Machine.machine_name)
         stmt_venue_id = label("venue_id", Machine.id)
 
         stmt = (
             select(stmt_sum_quantity, stmt_venue_name)
-            .join(Machine, Machine.id == self.sql_model.machine_id)
+            .join(Machine, Machine.id == source.machine_id)
             .group_by(stmt_venue_id)
             .order_by(stmt_venue_id)
         )
@@ -855,21 +1163,16 @@ class SaleManager(CRUDManager):
             setattr(query_filter, "geography_id__in", None)
 
         if query_filter.product_id__in:
-            stmt = stmt.where(Product.id.in_(query_filter.product_id__in))
+            stmt = stmt.where(source.product_id.in_(query_filter.product_id__in))
             setattr(query_filter, "product_id__in", None)
 
-        if not user.is_superuser:
-            stmt = (
-                stmt.join(Product, Product.id == self.sql_model.id)
-                .join(ProductUser, ProductUser.user_id == user.id)
-                .join(MachineUser, MachineUser.machine_id == Machine.id)
-                .where(MachineUser.user_id == user.id)
-            )
+        stmt = await self._generate_user_query(user, stmt, source=source)
 
-        stmt = query_filter.filter(stmt)
+        stmt = self._filter_source(query_filter, stmt, source)
 
         return await paginate(self.session, stmt)
 
+    @cached_statistic
     async def get_products_quantity_by_venue(
         self,
         query_filter: SaleFilter,
@@ -911,13 +1214,7 @@ class SaleManager(CRUDManager):
             stmt = stmt.where(Product.id.in_(query_filter.product_id__in))
             setattr(query_filter, "product_id__in", None)
 
-        if not user.is_superuser:
-            stmt = (
-                stmt.join(MachineUser, MachineUser.machine_id == Machine.id)
-                .join(ProductUser, ProductUser.product_id == Product.id)
-                .where(MachineUser.user_id == user.id)
-                .where(ProductUser.id == user.id)
-            )
+        stmt = await self._generate_user_query(user, stmt)
 
         stmt = query_filter.filter(stmt)
 
@@ -932,6 +1229,7 @@ class SaleManager(CRUDManager):
 
         return await paginate(self.session, stmt)
 
+    @cached_statistic
     async def get_sales_quantity_by_category(
         self, query_filter: SaleFilter, user: User
     ) -> Page[CategoryProductQuantityDateSchema]:
@@ -983,14 +1281,7 @@ class SaleManager(CRUDManager):
             stmt = stmt.where(Product.id.in_(query_filter.product_id__in))
             setattr(query_filter, "product_id__in", None)
 
-        if not user.is_superuser:
-            stmt = (
-                stmt.join(Machine, Machine.id == self.sql_model.machine_id)
-                .join(MachineUser, MachineUser.machine_id == Machine.id)
-                .join(ProductUser, ProductUser.product_id == Product.id)
-                .where(MachineUser.user_id == user.id)
-                .where(ProductUser.user_id == user.id)
-            )
+        stmt = await self._generate_user_query(user, stmt)
 
         stmt = query_filter.filter(stmt)
 
@@ -1005,28 +1296,27 @@ class SaleManager(CRUDManager):
 
         return await paginate(self.session, stmt)
 
-    async def export(
-        self,
-        query_filter: ExportSaleFilter,
-        user: User | UserScheduleSchema,
-        raw_result: bool = True,
-    ) -> list[Sale] | Page[ExportSaleDetailSchema]:
+    def _get_export_column_mapping(self) -> dict[str, Label]:
         """
-        Export sales data. This method is used to export sales data in different formats.
-        It returns a list of sales objects based on the filter.
+        Columns of the extra ordering fields of the sales export.
+        """
+        return {
+            "venue": label("Machine Name", Machine.machine_name),
+            "geography": label("Geography", Geography.name),
+            "product": label("Product sold", Product.name),
+            "product_id": label("Product ID", self.sql_model.product_id),
+            "date": label("Date", self.sql_model.sale_date),
+        }
+
+    async def get_export_query(self, query_filter: ExportSaleFilter, user: User | UserScheduleSchema) -> Select:
+        """
+        Generate the statement of the sales export with the filter and ordering applied.
 
         :param query_filter: Filter object.
         :param user: Current User.
-        :param raw_result: A flag object indicating whether to export raw data.
 
-        :return: List of sales objects.
+        :return: Statement selecting the exported columns.
         """
-        venue_order_field: str = "venue"
-        geography_order_field: str = "geography"
-        product_order_field: str = "product"
-        product_id_order_field: str = "product_id"
-        date_order_field: str = "date"
-
         stmt = (
             select(
                 label("Sale ID", self.sql_model.id),
@@ -1044,13 +1334,7 @@ class SaleManager(CRUDManager):
             .join(Geography, Geography.id == Machine.geography_id)
         )
 
-        if not user.is_superuser:
-            stmt = (
-                stmt.join(MachineUser, MachineUser.machine_id == Machine.id)
-                .join(ProductUser, ProductUser.product_id == Product.id)
-                .where(MachineUser.user_id == user.id)
-                .where(ProductUser.user_id == user.id)
-            )
+        stmt = await self._generate_user_query(user, stmt)
 
         if getattr(query_filter, "geography_id__in", None):
             stmt = stmt.where(Geography.id.in_(query_filter.geography_id__in or []))
@@ -1062,21 +1346,35 @@ class SaleManager(CRUDManager):
 
         stmt = query_filter.filter(stmt)
 
-        column_mapping = {
-            venue_order_field: label("Machine Name", Machine.machine_name),
-            geography_order_field: label("Geography", Geography.name),
-            product_order_field: label("Product sold", Product.name),
-            product_id_order_field: label("Product ID", self.sql_model.product_id),
-            date_order_field: label("Date", self.sql_model.sale_date),
-        }
+        return self.sort_additional_fields(self._get_export_column_mapping(), query_filter, stmt)
 
-        stmt = self.sort_additional_fields(column_mapping, query_filter, stmt)
+    async def export(
+        self,
+        query_filter: ExportSaleFilter,
+        user: User | UserScheduleSchema,
+        raw_result: bool = True,
+    ) -> list[Sale] | Page[ExportSaleDetailSchema]:
+        """
+        Export sales data. This method is used to export sales data in different formats.
+        It returns a list of sales objects based on the filter.
+
+        :param query_filter: Filter object.
+        :param user: Current User.
+        :param raw_result: A flag object indicating whether to export raw data.
+
+        :return: List of sales objects.
+        """
+        # The extra ordering fields are removed from the filter, but cursor pagination still needs them.
+        order_by: list[str] = list(query_filter.order_by or [])
+
+        stmt = await self.get_export_query(query_filter, user)
 
         if not raw_result:
-            return await paginate(self.session, stmt)
+            return await self.get_page(stmt, order_by, self._get_export_column_mapping())
 
         return (await self.session.execute(stmt)).mappings().all()  # type: ignore
 
+    @cached_statistic
     async def get_average_products_count_per_geography(
         self, query_filter: SaleFilter, user: User
     ) -> Page[ProductsCountGeographySchema]:
@@ -1116,13 +1414,7 @@ class SaleManager(CRUDManager):
             stmt = stmt.where(Product.id.in_(query_filter.product_id__in))
             setattr(query_filter, "product_id__in", None)
 
-        if not user.is_superuser:
-            stmt = (
-                stmt.join(MachineUser, MachineUser.machine_id == Machine.id)
-                .join(ProductUser, ProductUser.product_id == Product.id)
-                .where(MachineUser.user_id == user.id)
-                .where(ProductUser.user_id == user.id)
-            )
+        stmt = await self._generate_user_query(user, stmt)
 
         stmt = stmt.subquery()
 
@@ -1136,57 +1428,334 @@ class SaleManager(CRUDManager):
 
         return await paginate(self.session, final_stmt, unique=False)
 
-    async def create_batch(self, obj: list[ExcelSaleCreateSchema]) -> SalesBulkCreateResponseSchema:
+    async def update_or_create(
+        self,
+        obj: SaleCreateSchema,
+        obj_id: int | None = None,
+    ) -> tuple[Sale, Sale | None, bool]:
+        """
+        Update or create a sale and keep the daily rollup in sync within the same transaction.
+        For updated sales the previous state is reverted from the rollup before the new one is applied.
+
+        :param obj: Sale create schema.
+        :param obj_id: Sale ID.
+
+        :return: tuple of boolean, created entity and optional previous state of entity.
+        """
+        rollup_manager = SaleDailyRollupManager(self.session)
+
+        if result := await self.get(obj_id, raise_error=False):
+            # The ORM object is refreshed in place on update, so the previous state is captured beforehand.
+            previous_delta = self._generate_rollup_delta(result, sign=-1)
+            updated_result = await self.update(obj_id, obj, autocommit=False)
+
+            await rollup_manager.apply_deltas([previous_delta, self._generate_rollup_delta(updated_result)])
+            await self.session.commit()
+
+            return result, updated_result, True
+
+        created_result = await self.create(obj, obj_id=obj_id, autocommit=False)
+
+        await rollup_manager.apply_deltas([self._generate_rollup_delta(created_result)])
+        await self.session.commit()
+
+        return created_result, None, False
+
+    async def bulk_update_or_create(
+        self,
+        rows: Sequence[SaleCreateSchema | dict[str, Any]],
+        conflict_target: str | Sequence[str] = ("id",),
+        *,
+        autocommit: bool = True,
+    ) -> list[tuple[dict[str, Any], dict[str, Any] | None, bool]]:
         """
-        Create a batch of sales records in the database.
+        Update or create several sales and keep the daily rollup in sync within the same transaction.
+        The previous states of the updated sales are reverted from the rollup before the new ones are applied,
+        unchanged sales aren't touched.
+
+        :param rows: Sales to store, including their IDs.
+        :param conflict_target: Name of the unique constraint or the columns of the unique index.
+        :param autocommit: If True, commit changes at the end, otherwise flush changes.
 
-        - Each Excel row is converted to a sale entry with resolved `product_id` and `machine_id`
-          (based on their names).
+        :return: The current state, the previous state and whether the sale is written, for every sale.
+        """
+        states = await super().bulk_update_or_create(rows, conflict_target, autocommit=False)
+        deltas: list[SaleDailyRollupDeltaSchema] = []
+
+        for current_state, previous_state, is_written in states:
+            if not is_written:
+                continue
+
+            if previous_state is not None:
+                deltas.append(self._generate_rollup_delta(previous_state, sign=-1))
+
+            deltas.append(self._generate_rollup_delta(current_state))
+
+        await SaleDailyRollupManager(self.session).apply_deltas(deltas, autocommit=autocommit)
+
+        return states
+
+    async def create_batch(self, batches: AsyncIterable[list[ExcelSaleCreateSchema]]) -> SalesBulkCreateResponseSchema:
+        """
+        Create sales records in the database batch by batch, as they are parsed from Excel.
+
+        - Machine and product names are resolved into IDs with one query each per batch,
+          names resolved by the previous batches aren't queried again.
         - Rows with missing or unresolvable references are skipped.
-        - Duplicate entries (based on unique constraints) are ignored using `ON CONFLICT DO NOTHING`.
         - Invalid rows (with empty required fields) are skipped.
+        - Rows are inserted by `bulk_upsert` within one transaction.
+          Duplicate entries (based on the ID) are ignored using `ON CONFLICT DO NOTHING`.
+        - Inserted rows are applied to the daily rollup chunk by chunk.
 
-        :param obj: List of validated sales data parsed from Excel.
+        :param batches: Batches of validated sales data parsed from Excel.
         :return: SalesBulkCreateResponseSchema.
         """
-        count_stmt: Select = select(func.count()).select_from(self.sql_model)
-        existing_records: list[int] = await self.session.scalar(count_stmt)
+        machine_ids: dict[str, int] = {}
+        product_ids: dict[str, int] = {}
+        queried_machine_names: set[str] = set()
+        queried_product_names: set[str] = set()
+
+        created_records: int = 0
+        skipped: Counter[ImportSkipReasonEnum] = Counter()
+        machine_manager = MachineManager(self.session)
+        product_manager = ProductManager(self.session)
+        rollup_manager = SaleDailyRollupManager(self.session)
+
+        async def _apply_to_rollup(inserted: Sequence[RowMapping]) -> None:
+            await rollup_manager.apply_deltas([self._generate_rollup_delta(dict(row)) for row in inserted])
+
+        try:
+            async for batch in batches:
+                items: list[ExcelSaleCreateSchema] = [
+                    item for item in batch if all(item.model_dump(exclude_defaults=True).values())
+                ]
+
+                if machine_names := {item.machine_name for item in items} - queried_machine_names:
+                    machine_ids |= await machine_manager.get_ids_by_names(machine_names)
+                    queried_machine_names |= machine_names
+
+                if product_names := {item.product_name for item in items} - queried_product_names:
+                    product_ids |= await product_manager.get_ids_by_names(product_names)
+                    queried_product_names |= product_names
+
+                skipped[ImportSkipReasonEnum.INVALID] += len(batch) - len(items)
+                rows: list[dict[str, Any]] = []
+
+                for item in items:
+                    if item.machine_name not in machine_ids:
+                        skipped[ImportSkipReasonEnum.UNKNOWN_MACHINE] += 1
+
+                    elif item.product_name not in product_ids:
+                        skipped[ImportSkipReasonEnum.UNKNOWN_PRODUCT] += 1
+
+                    else:
+                        rows.append(
+                            {
+                                **item.model_dump(exclude={"machine_name", "product_name", "sale_date_and_time"}),
+                                "machine_id": machine_ids[item.machine_name],
+                                "product_id": product_ids[item.product_name],
+                            }
+                        )
+
+                batch_result: BulkUpsertResultSchema = await self.bulk_upsert(
+                    rows,
+                    ["id"],
+                    returning=[
+                        self.sql_model.sale_date,
+                        self.sql_model.machine_id,
+                        self.sql_model.product_id,
+                        self.sql_model.quantity,
+                    ],
+                    on_chunk=_apply_to_rollup,
+                    autocommit=False,
+                )
 
-        for item in obj:
-            dict_item: dict = item.model_dump()
+                created_records += batch_result.created_records
+                skipped[ImportSkipReasonEnum.DUPLICATE] += batch_result.skipped_records
 
-            if not all(item.model_dump(exclude_defaults=True).values()):
-                continue
+            await self.session.commit()
+
+        except Exception as ex:
+            await self.session.rollback()
+            raise ex
+
+        return SalesBulkCreateResponseSchema(
+            created_records=created_records,
+            skipped_records=sum(skipped.values()),
+            skipped_by_reason={reason: count for reason, count in skipped.items() if count},
+        )
+
+    async def copy_batch(self, source: IO[bytes], header: Sequence[str]) -> SalesBulkCreateResponseSchema:
+        """
+        Create sales records in the database from a CSV file with set-based statements.
+
+        - The file is streamed into a temporary staging table with `COPY`, the rows never reach Python.
+        - Columns are picked from the staging table by the names of the `ExcelSaleCreateSchema` aliases in the header,
+          the "Transaction ID" and the "Settlement Date and Time (GMT)" values are parsed the same way as in Excel.
+          Values which can't be parsed are checked with `pg_input_is_valid` (PostgreSQL 16), such rows are invalid
+          instead of failing the whole statement.
+        - Machine and product names are resolved into IDs by joins.
+        - Sales are merged with one `INSERT ... SELECT ... ON CONFLICT DO NOTHING` statement,
+          the inserted rows are aggregated in the same statement and applied to the daily rollup.
+        - Everything, including the staging table, lives in one transaction.
+
+        :param source: CSV file positioned at the first data line, i.e. right after the header.
+        :param header: Column names of the file.
+        :return: SalesBulkCreateResponseSchema with the count of skipped rows per reason.
+        """
+        staging = Table(
+            "sale_import_staging",
+            MetaData(),
+            *(Column(f"column_{position}", Text) for position in range(len(header))),
+            prefixes=["TEMPORARY"],
+            postgresql_on_commit="DROP",
+        )
+
+        def _get_value(field: str) -> ColumnElement[str]:
+            staging_column = staging.c[f"column_{header.index(ExcelSaleCreateSchema.model_fields[field].alias)}"]
+
+            return func.nullif(func.trim(staging_column), "")
+
+        transaction_id = _get_value("id")
+        # The same as in Excel, e.g. "1111 (123456789)" stands for 123456789.
+        transaction_digits = func.coalesce(
+            func.substring(transaction_id, r"^(\d+)$"), func.substring(transaction_id, r"\((\d+)\)")
+        )
+        # "DD/MM/YYYY HH24:MI:SS" is rewritten into ISO 8601, which is parsed regardless of `DateStyle`.
+        settlement_date_and_time = func.substring(
+            _get_value("sale_date_and_time"), r"^\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2}:\d{2}$"
+        ).regexp_replace(r"^(\d+)/(\d+)/(\d+) (.+)$", r"\3-\2-\1 \4")
+
+        parsed = select(
+            # Values which can't be cast, e.g. out of range numbers or dates like 31/02, are NULL, i.e. invalid rows.
+            case(
+                (func.pg_input_is_valid(transaction_digits, "bigint"), cast(transaction_digits, BigInteger)),
+            ).label("id"),
+            case(
+                (
+                    func.pg_input_is_valid(settlement_date_and_time, "timestamp"),
+                    cast(settlement_date_and_time, DateTime),
+                ),
+            ).label("sale_date_and_time"),
+            _get_value("machine_name").label("machine_name"),
+            _get_value("product_name").label("product_name"),
+        ).subquery("parsed")
+
+        # Names aren't unique, the lowest ID is picked, the same as by `get_ids_by_names` of the Excel import.
+        machines = select(Machine.name, func.min(Machine.id).label("id")).group_by(Machine.name).subquery("machines")
+        products = select(Product.name, func.min(Product.id).label("id")).group_by(Product.name).subquery("products")
+
+        resolved = (
+            select(parsed, machines.c.id.label("machine_id"), products.c.id.label("product_id"))
+            .outerjoin(machines, machines.c.name == parsed.c.machine_name)
+            .outerjoin(products, products.c.name == parsed.c.product_name)
+            .subquery("resolved")
+        )
+
+        is_valid: ColumnElement[bool] = and_(
+            resolved.c.id.is_not(None),
+            resolved.c.sale_date_and_time.is_not(None),
+            resolved.c.machine_name.is_not(None),
+            resolved.c.product_name.is_not(None),
+        )
+        is_resolved: ColumnElement[bool] = and_(resolved.c.machine_id.is_not(None), resolved.c.product_id.is_not(None))
+
+        count_stmt = select(
+            func.count().label("total"),
+            func.count().filter(~is_valid).label(ImportSkipReasonEnum.INVALID),
+            func.count().filter(is_valid, resolved.c.machine_id.is_(None)).label(ImportSkipReasonEnum.UNKNOWN_MACHINE),
+            func.count()
+            .filter(is_valid, resolved.c.machine_id.is_not(None), resolved.c.product_id.is_(None))
+            .label(ImportSkipReasonEnum.UNKNOWN_PRODUCT),
+        )
+
+        inserted = (
+            insert(self.sql_model)
+            .from_select(
+                [
+                    "id",
+                    "sale_date",
+                    "sale_time",
+                    "quantity",
+                    "source_system",
+                    "source_system_id",
+                    "machine_id",
+                    "product_id",
+                ],
+                select(
+                    resolved.c.id,
+                    cast(resolved.c.sale_date_and_time, Date),
+                    cast(resolved.c.sale_date_and_time, Time),
+                    literal(1),
+                    literal(CSV_SOURCE_SYSTEM),
+                    resolved.c.id,
+                    resolved.c.machine_id,
+                    resolved.c.product_id,
+                ).where(is_valid, is_resolved),
+            )
+            .on_conflict_do_nothing()
+            .returning(
+                self.sql_model.sale_date,
+                self.sql_model.machine_id,
+                self.sql_model.product_id,
+                self.sql_model.quantity,
+            )
+            .cte("inserted")
+        )
+        delta_stmt = select(
+            inserted.c.sale_date,
+            inserted.c.machine_id,
+            inserted.c.product_id,
+            func.sum(inserted.c.quantity).label("quantity"),
+            func.count().label("transactions_count"),
+        ).group_by(inserted.c.sale_date, inserted.c.machine_id, inserted.c.product_id)
+
+        rollup_manager = SaleDailyRollupManager(self.session)
+
+        try:
+            connection: AsyncConnection = await self.session.connection()
+            await connection.run_sync(staging.create)
+
+            raw_connection = await connection.get_raw_connection()
 
             try:
-                machine: Machine = await MachineManager(self.session).get_by_name(name=dict_item.pop("machine_name"))
-                product: Product = await ProductManager(self.session).get_by_name(name=dict_item.pop("product_name"))
-
-                dict_item.pop("sale_date_and_time")
-                dict_item.update(
-                    {
-                        "machine_id": machine.id,
-                        "product_id": product.id,
-                    }
+                await raw_connection.driver_connection.copy_to_table(
+                    staging.name, source=source, format="csv", encoding="utf-8"
                 )
 
-            except AttributeError:
-                continue
+            except asyncpg.DataError as ex:
+                # Malformed lines are reported by the driver, so they aren't wrapped into DBAPIError.
+                raise BadRequestError(f"Invalid CSV file: {ex}") from ex
 
-            try:
-                stmt = insert(self.sql_model).values(**dict_item).on_conflict_do_nothing()
+            counts: RowMapping = (await self.session.execute(count_stmt.select_from(resolved))).mappings().one()
+            deltas: list[SaleDailyRollupDeltaSchema] = [
+                SaleDailyRollupDeltaSchema.model_validate(row)
+                for row in (await self.session.execute(delta_stmt)).mappings().all()
+            ]
 
-                await self.session.execute(stmt)
-                await self.session.commit()
+            for start in range(0, len(deltas), config.db.import_chunk_size):
+                await rollup_manager.apply_deltas(deltas[start : start + config.db.import_chunk_size])
 
-            except IntegrityError:
-                await self.session.rollback()
-                continue
+            await self.session.commit()
 
-            except Exception as ex:
-                await self.session.rollback()
-                raise ex
+        except Exception as ex:
+            await self.session.rollback()
+            raise ex
 
-        updated_records: list[int] = await self.session.scalar(count_stmt)
+        created_records: int = sum(delta.transactions_count for delta in deltas)
+        skipped: dict[ImportSkipReasonEnum, int] = {
+            reason: counts[reason]
+            for reason in (
+                ImportSkipReasonEnum.INVALID,
+                ImportSkipReasonEnum.UNKNOWN_MACHINE,
+                ImportSkipReasonEnum.UNKNOWN_PRODUCT,
+            )
+        }
+        # Rows with IDs that already exist, in the table or earlier in the file.
+        skipped[ImportSkipReasonEnum.DUPLICATE] = counts["total"] - sum(skipped.values()) - created_records
 
-        return SalesBulkCreateResponseSchema(initial_records=existing_records, final_records=updated_records)
+        return SalesBulkCreateResponseSchema(
+            created_records=created_records,
+            skipped_records=counts["total"] - created_records,
+            skipped_by_reason={reason: count for reason, count in skipped.items() if count},
+        )
@@ -1,7 +1,7 @@
 from datetime import date, time
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, ForeignKey, String
+from sqlalchemy import BigInteger, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from mspy_vendi.core.enums.db import CascadesEnum, ORMRelationshipCascadeTechniqueEnum
@@ -13,6 +13,28 @@ if TYPE_CHECKING:
 
 
 class Sale(CommonMixin, Base):
+    __table_args__ = (
+        Index(
+            "ix_sale_sale_date_machine_id_product_id",
+            "sale_date",
+            "machine_id",
+            "product_id",
+            postgresql_include=["quantity"],
+        ),
+        Index(
+            "ix_sale_machine_id_sale_date",
+            "machine_id",
+            "sale_date",
+            postgresql_include=["product_id", "quantity", "sale_time"],
+        ),
+        Index(
+            "ix_sale_product_id_sale_date",
+            "product_id",
+            "sale_date",
+            postgresql_include=["machine_id", "quantity"],
+        ),
+    )
+
     sale_date: Mapped[date]
     sale_time: Mapped[time]
     quantity: Mapped[int]
@@ -46,3 +68,42 @@ class Sale(CommonMixin, Base):
         uselist=False,
         passive_deletes=ORMRelationshipCascadeTechniqueEnum.all.value,
     )
+
+
+class SaleDailyRollup(CommonMixin, Base):
+    """
+    Pre-aggregated sales per (sale_date, machine_id, product_id).
+    It is kept up to date incrementally on every sale write and can be rebuilt from the `sale` table.
+    """
+
+    __table_args__ = (
+        UniqueConstraint(
+            "sale_date",
+            "machine_id",
+            "product_id",
+            name="uq_sale_daily_rollup_sale_date_machine_id_product_id",
+        ),
+    )
+
+    sale_date: Mapped[date]
+    quantity: Mapped[int] = mapped_column(BigInteger, default=0, comment="Total quantity of sold units")
+    transactions_count: Mapped[int] = mapped_column(BigInteger, default=0, comment="Number of sale records")
+
+    product_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey(
+            "product.id",
+            ondelete=CascadesEnum.CASCADE.value,
+            onupdate=CascadesEnum.CASCADE.value,
+        ),
+        index=True,
+    )
+    machine_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey(
+            "machine.id",
+            ondelete=CascadesEnum.CASCADE.value,
+            onupdate=CascadesEnum.CASCADE.value,
+        ),
+        index=True,
+    )
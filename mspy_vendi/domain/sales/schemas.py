@@ -4,10 +4,10 @@ from typing import Any
 from pydantic import Field, NonNegativeInt, PositiveInt, model_validator
 
 from mspy_vendi.core.constants import DEFAULT_SOURCE_SYSTEM
-from mspy_vendi.core.schemas import BaseSchema
+from mspy_vendi.core.enums import ImportSkipReasonEnum
+from mspy_vendi.core.schemas import BaseSchema, BulkUpsertResultSchema
 from mspy_vendi.core.validators import DecimalFloat
 from mspy_vendi.domain.geographies.schemas import GeographyDetailSchema
-from mspy_vendi.domain.machine_impression.schemas import MachineImpressionBulkCreateResponseSchema
 from mspy_vendi.domain.machines.schemas import MachineDetailSchema
 from mspy_vendi.domain.products.schemas import ProductDetailSchema
 
@@ -168,4 +168,13 @@ class ExcelSaleCreateSchema(BaseSchema):
         return data
 
 
-class SalesBulkCreateResponseSchema(MachineImpressionBulkCreateResponseSchema): ...
+class SalesBulkCreateResponseSchema(BulkUpsertResultSchema):
+    skipped_by_reason: dict[ImportSkipReasonEnum, NonNegativeInt] = Field(default_factory=dict)
+
+
+class SaleDailyRollupDeltaSchema(BaseSchema):
+    sale_date: date
+    machine_id: PositiveInt
+    product_id: PositiveInt
+    quantity: int
+    transactions_count: int = 1
@@ -1,12 +1,14 @@
 import datetime
-from typing import Annotated
+from typing import IO, Annotated
 
 from fastapi import Depends, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from mspy_vendi.core.cache import bump_data_version
 from mspy_vendi.core.email import MailGunService
-from mspy_vendi.core.enums import ExportEntityTypeEnum
+from mspy_vendi.core.enums import ExportEntityTypeEnum, SaleDashboardWidgetEnum
 from mspy_vendi.core.enums.date_range import DailyTimePeriodEnum, DateRangeEnum, TimePeriodEnum
+from mspy_vendi.core.mixins.dashboard import DashboardMixin
 from mspy_vendi.core.mixins.export import ExportMixin
 from mspy_vendi.core.pagination import Page
 from mspy_vendi.core.service import CRUDService
@@ -43,9 +45,27 @@ from mspy_vendi.domain.sales.schemas import (
 from mspy_vendi.domain.user.models import User
 
 
-class SaleService(CRUDService, ExportMixin):
+class SaleService(CRUDService, ExportMixin, DashboardMixin):
     manager_class = SaleManager
     filter_class = SaleGetAllFilter
+    dashboard_widgets = {
+        SaleDashboardWidgetEnum.QUANTITY_BY_PRODUCTS: "get_sales_quantity_by_product",
+        SaleDashboardWidgetEnum.QUANTITY_PER_RANGE: "get_sales_quantity_per_range",
+        SaleDashboardWidgetEnum.AVERAGE_SALES: "get_average_sales_across_machines",
+        SaleDashboardWidgetEnum.AVERAGE_SALES_PER_RANGE: "get_average_sales_per_range",
+        SaleDashboardWidgetEnum.QUANTITY_PER_PRODUCT: "get_sales_quantity_per_category",
+        SaleDashboardWidgetEnum.QUANTITY_PER_CATEGORY: "get_sales_category_quantity_per_time_frame",
+        SaleDashboardWidgetEnum.SALES_REVENUE_PER_TIME_PERIOD: "get_sales_revenue_per_time_period",
+        SaleDashboardWidgetEnum.UNITS_SOLD_PER_RANGE: "get_units_sold_per_range",
+        SaleDashboardWidgetEnum.UNITS_SOLD_STATISTIC: "get_units_sold_statistic",
+        SaleDashboardWidgetEnum.QUANTITY_PER_GEOGRAPHY: "get_sales_quantity_per_geography",
+        SaleDashboardWidgetEnum.CONVERSION_RATE: "get_conversion_rate",
+        SaleDashboardWidgetEnum.FREQUENCY_OF_SALES: "get_daily_sales_count_per_time_period",
+        SaleDashboardWidgetEnum.SALES_QUANTITY_BY_VENUE: "get_sales_by_venue_over_time",
+        SaleDashboardWidgetEnum.SALES_QUANTITY_BY_CATEGORY: "get_sales_quantity_by_category",
+        SaleDashboardWidgetEnum.AVERAGE_PRODUCTS_PER_GEOGRAPHY: "get_average_products_count_per_geography",
+        SaleDashboardWidgetEnum.PRODUCTS_QUANTITY_BY_VENUE: "get_products_quantity_by_venue",
+    }
 
     def __init__(
         self,
@@ -148,9 +168,14 @@ class SaleService(CRUDService, ExportMixin):
 
     async def upload(self, file: UploadFile) -> SalesBulkCreateResponseSchema:
         *_, file_type = file.filename.partition(".")
-        binary_data: bytes = await file.read()
 
         data_extractor: BaseDataExtractorClient = DataTransformFactory.transform(
             session=self.db_session, file_type=file_type
         )
-        return await data_extractor.extract(binary_data)
+        # CSV files are copied into the database straight from the spooled upload, without reading them into memory.
+        data: bytes | IO[bytes] = file.file if file_type == "csv" else await file.read()
+        result: SalesBulkCreateResponseSchema = await data_extractor.extract(data)
+
+        await bump_data_version()
+
+        return result
@@ -1,4 +1,11 @@
+import asyncio
+import contextlib
+import json
+import signal
 import time
+import traceback
+from collections import Counter
+from typing import Any, Awaitable, Callable
 
 import sentry_sdk
 from sentry_sdk.integrations.logging import ignore_logger
@@ -7,10 +14,15 @@ from mspy_vendi.config import log
 from mspy_vendi.db.engine import get_db_session
 from mspy_vendi.domain.nayax.schemas import NayaxTransactionSchema
 from mspy_vendi.domain.nayax.service import NayaxService
+from mspy_vendi.domain.quarantined_message.manager import QuarantinedMessageManager
+from mspy_vendi.domain.quarantined_message.schemas import QuarantinedMessageCreateSchema
 from mspy_vendi.domain.sqs.manager import SQSManager
 
 ignore_logger(__name__)
 
+# Interval in seconds the completed messages are deleted at, up to 10 messages per request.
+ACKNOWLEDGEMENT_INTERVAL: float = 1.0
+
 
 class SQSConsumer:
     """
@@ -21,7 +33,14 @@ class SQSConsumer:
         sqs_max_number_of_messages (int): Maximum number of messages to retrieve per call.
         sqs_visibility_timeout (int): Duration (in seconds) messages are hidden from subsequent retrieve calls.
         sqs_long_poll_time (int): Wait time (in seconds) for messages if the queue is empty.
-        sqs_dlq_enabled (bool): Flag indicating whether a Dead Letter Queue is enabled.
+        sqs_dlq_enabled (bool): Flag indicating whether the queue routes failed messages to a Dead Letter Queue.
+        max_in_flight (int): Maximum number of messages processed at the same time by `consume_concurrently`.
+        batch_mode (bool): Flag indicating whether the messages of one receive call are processed together.
+        metrics_interval (int): Interval (in seconds) the consumer metrics are logged at.
+        max_attempts (int): Number of receives after which a failed message is quarantined.
+        retry_base_delay (int): Delay (in seconds) before the first retry of a failed message.
+        retry_max_delay (int): Maximum delay (in seconds) before a retry of a failed message.
+        workers (int): Number of workers the messages are partitioned between by their machine.
         logger (structlog.BoundLogger): Logger instance for logging activities.
     """
 
@@ -34,6 +53,14 @@ class SQSConsumer:
         sqs_long_poll_time: int = 5,
         sqs_dlq_enabled: bool = False,
         sqs_auto_ack: bool = False,
+        sqs_endpoint_url: str | None = None,
+        max_in_flight: int = 1,
+        batch_mode: bool = False,
+        metrics_interval: int = 60,
+        max_attempts: int = 5,
+        retry_base_delay: int = 30,
+        retry_max_delay: int = 15 * 60,
+        workers: int = 1,
         is_enabled: bool = True,
     ):
         """
@@ -43,8 +70,21 @@ class SQSConsumer:
         :param sqs_max_number_of_messages: int: Maximum number of messages to retrieve per call. Defaults to 10.
         :param sqs_visibility_timeout: int: Duration in seconds messages are hidden from queue. Defaults to 30.
         :param sqs_long_poll_time: int: Wait time in seconds for messages if queue is empty. Defaults to 5.
-        :param sqs_dlq_enabled: bool: If True, enables Dead Letter Queue handling. Defaults to False.
-        :param sqs_auto_ack: bool: If True, deletes messages upon retrieval. Defaults to False.
+        :param sqs_dlq_enabled: bool: If True, failed messages are left to the redrive policy of the queue
+                                instead of the quarantine table. Defaults to False.
+        :param sqs_auto_ack: bool: If True, deletes failed messages as well, otherwise they're received again
+                             after the visibility timeout. Processed messages are always deleted. Defaults to False.
+        :param sqs_endpoint_url: str | None: URL of an SQS compatible service, e.g. ElasticMQ. Defaults to AWS.
+        :param max_in_flight: int: Maximum number of messages processed at the same time. Defaults to 1.
+        :param batch_mode: bool: If True, the messages of one receive call are processed in one transaction.
+                           Defaults to False.
+        :param metrics_interval: int: Interval in seconds the consumer metrics are logged at. Defaults to 60.
+        :param max_attempts: int: Number of receives after which a failed message is quarantined. Defaults to 5.
+        :param retry_base_delay: int: Delay in seconds before the first retry, doubled on every next one.
+                                 Defaults to 30.
+        :param retry_max_delay: int: Maximum delay in seconds before a retry. Defaults to 15 minutes.
+        :param workers: int: If more than 1, the messages are partitioned between the workers by their machine,
+                        so the messages of one machine are processed in order. Defaults to 1.
         :param is_enabled: bool: If True, enables the consumer. Defaults to True.
         :param logger: structlog.BoundLogger: Logger instance for logging. Defaults to structlog.get_logger().
         """
@@ -55,56 +95,421 @@ class SQSConsumer:
         self.sqs_long_poll_time = sqs_long_poll_time
         self.sqs_dlq_enabled = sqs_dlq_enabled
         self.sqs_auto_ack = sqs_auto_ack
+        self.max_in_flight = max_in_flight
+        self.batch_mode = batch_mode
+        self.metrics_interval = metrics_interval
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.workers = workers
         self.is_enabled = is_enabled
+        self.stop_event = asyncio.Event()
+        # Set every time a message is completed, so the next messages can be received.
+        self.completion_event = asyncio.Event()
 
-        self.consumer = SQSManager(sqs_queue_name, logger=log)
+        # Received messages by their IDs until they are processed, their visibility is extended meanwhile.
+        self.in_flight: dict[str, dict] = {}
+        # Messages waiting for their worker, one queue per worker.
+        self.partitions: list[asyncio.Queue[dict]] = [asyncio.Queue() for _ in range(workers if workers > 1 else 0)]
+        # Messages to delete with the next batch request.
+        self.pending_acknowledgements: list[dict] = []
+        # Counters since the metrics were logged last time.
+        self.metrics: Counter[str] = Counter()
 
-    async def consume(self):
+        self.consumer = SQSManager(sqs_queue_name, endpoint_url=sqs_endpoint_url, logger=log)
+
+    async def process_message(self, message: dict) -> int:
         """
-        Continuously polls an SQS queue for messages and processes them.
+        Process one message within its own DB session.
 
-        Retrieves and processes messages from the SQS queue, using the specified message handler factory.
-        Deletes messages after successful processing or routes them to a Dead Letter Queue if enabled.
+        :param message: dict: The message received from the queue.
 
-        :raise: Exception: Raised if errors occur during message retrieval or processing.
+        :return: int: 1 if the message is a duplicate of an already processed one, 0 otherwise.
         """
-        if not self.is_enabled:
-            while True:
-                log.info(
-                    "SQS Consumer is disabled. To enable it set 'NAYAX_CONSUMER_ENABLED' to True. "
-                    "Will sleep for 1 hour."
+        async with get_db_session() as session:
+            nayax_message = NayaxTransactionSchema.model_validate_json(message["Body"])
+            return await NayaxService(session).process_message(message=nayax_message)
+
+    @staticmethod
+    def get_receive_count(message: dict) -> int:
+        """
+        :param message: dict: The message received from the queue.
+
+        :return: int: How many times the message was received, including the current receive.
+        """
+        return int(message.get("Attributes", {}).get("ApproximateReceiveCount", 1))
+
+    def get_retry_delay(self, attempt: int) -> int:
+        """
+        :param attempt: int: Number of the failed attempt, starting from 1.
+
+        :return: int: Delay in seconds before the next attempt, doubled after every failed one.
+        """
+        return min(self.retry_base_delay * 2 ** (attempt - 1), self.retry_max_delay)
+
+    def _receive(self, message: dict) -> None:
+        self.in_flight[message["MessageId"]] = message
+        self.metrics["received"] += 1
+
+        # Retried messages and the ones which weren't deleted before their visibility timeout expired.
+        if self.get_receive_count(message) > 1:
+            self.metrics["redelivered"] += 1
+
+    def _complete(self, message: dict, *, is_processed: bool, duplicates: int = 0) -> None:
+        self.in_flight.pop(message["MessageId"], None)
+        self.completion_event.set()
+        self.metrics["processed" if is_processed else "failed"] += 1
+        self.metrics["duplicates"] += duplicates
+
+        if is_processed or self.sqs_auto_ack:
+            self.pending_acknowledgements.append(message)
+
+    async def quarantine(self, message: dict, error: str) -> None:
+        """
+        Store the failed message with the error in its own DB session, so it can be replayed later.
+
+        :param message: dict: The message received from the queue.
+        :param error: str: The traceback of the last attempt.
+        """
+        async with get_db_session() as session:
+            await QuarantinedMessageManager(session).quarantine(
+                QuarantinedMessageCreateSchema(
+                    queue_name=self.sqs_queue_name,
+                    message_id=message["MessageId"],
+                    body=message["Body"],
+                    attributes=message.get("Attributes", {}),
+                    receive_count=self.get_receive_count(message),
+                    error=error,
                 )
+            )
 
-                time.sleep(60 * 60)
+    async def retry_or_quarantine(self, message: dict, exc: Exception) -> None:
+        """
+        Hide the failed message for an exponentially growing delay, so it doesn't compete with healthy messages.
+        After `max_attempts` receives the message is quarantined and deleted from the queue,
+        unless `sqs_dlq_enabled` is set and the redrive policy of the queue takes care of it.
+
+        :param message: dict: The message received from the queue.
+        :param exc: Exception: The error of the last attempt.
+        """
+        receive_count: int = self.get_receive_count(message)
+
+        if receive_count >= self.max_attempts and not self.sqs_dlq_enabled:
+            try:
+                await self.quarantine(message, "".join(traceback.format_exception(exc)))
+
+            except Exception as quarantine_exc:
+                log.error(f"Error quarantining message {message['MessageId']}", exc_info=True)
+
+                sentry_sdk.capture_exception(quarantine_exc)
+
+            else:
+                log.warning("Message quarantined.", message_id=message["MessageId"], receive_count=receive_count)
+
+                self.metrics["quarantined"] += 1
+                self.pending_acknowledgements.append(message)
+                return
+
+        delay: int = self.get_retry_delay(receive_count)
+
+        log.info("Message will be retried.", message_id=message["MessageId"], receive_count=receive_count, delay=delay)
+
+        self.metrics["retried"] += 1
+        await self.consumer.achange_message_visibility(message, visibility_timeout=delay)
 
-        log.info(f"Checking SQS '{self.sqs_queue_name}' for messages ...")
+    async def handle_message(self, message: dict) -> None:
+        """
+        Process the message and report the error if it fails, so one message never stops the others.
+        The processed message is deleted with the next batch request. The failed one is deleted as well if
+        `sqs_auto_ack` is set, otherwise it's retried with a backoff, see `retry_or_quarantine`.
+
+        :param message: dict: The message received from the queue.
+        """
+        log.info(f"Handling message '{message['MessageId']}'.")
 
         try:
-            for message in self.consumer.receive_messages(
-                max_number_of_messages=self.sqs_max_number_of_messages,
-                wait_time_seconds=self.sqs_long_poll_time,
-                visibility_timeout=self.sqs_visibility_timeout,
-                auto_ack=self.sqs_auto_ack,  # Enable for PRD environment
-            ):
-                try:
-                    async with get_db_session() as session:
-                        log.info(f"Handling message '{message['MessageId']}'.")
+            duplicates: int = await self.process_message(message)
+
+        except Exception as exc:
+            log.error(f"Error processing message {message['MessageId']}", exc_info=True)
+
+            sentry_sdk.capture_exception(exc)
+            self._complete(message, is_processed=False)
+
+            if not self.sqs_auto_ack:
+                await self.retry_or_quarantine(message, exc)
+
+        else:
+            log.info("Message processed successfully.", message_id=message["MessageId"], is_duplicate=bool(duplicates))
+            self._complete(message, is_processed=True, duplicates=duplicates)
+
+    async def process_batch(self, messages: list[dict]) -> int:
+        """
+        Process several messages within one DB session and transaction.
+
+        :param messages: list[dict]: The messages received from the queue.
+
+        :return: int: Count of the messages which are duplicates of already processed ones.
+        """
+        nayax_messages: list[NayaxTransactionSchema] = [
+            NayaxTransactionSchema.model_validate_json(message["Body"]) for message in messages
+        ]
+
+        async with get_db_session() as session:
+            return await NayaxService(session).process_batch(nayax_messages)
+
+    async def handle_batch(self, messages: list[dict]) -> None:
+        """
+        Process the messages of one receive call together, they are deleted with the next batch request.
+
+        If the batch fails, e.g. because of one malformed message, its transaction is rolled back and the messages
+        are handled one by one, so the failure is reported for the broken message only.
+
+        :param messages: list[dict]: The messages received from the queue.
+        """
+        message_ids: list[str] = [message["MessageId"] for message in messages]
+
+        log.info("Handling messages.", message_ids=message_ids)
+
+        try:
+            duplicates: int = await self.process_batch(messages)
+
+        except Exception:
+            log.warning("Error processing messages together, handling them one by one.", exc_info=True)
+
+            for message in messages:
+                await self.handle_message(message)
+
+            return
+
+        log.info("Messages processed successfully.", message_ids=message_ids, duplicates=duplicates)
+
+        for message in messages:
+            self._complete(message, is_processed=True)
+
+        self.metrics["duplicates"] += duplicates
+
+    async def acknowledge(self) -> None:
+        """
+        Delete the completed messages from the queue with batch requests.
+        """
+        if not self.pending_acknowledgements:
+            return
+
+        messages, self.pending_acknowledgements = self.pending_acknowledgements, []
+        failed_messages: list[dict] = await self.consumer.adelete_message_batch(messages)
+
+        self.metrics["acknowledged"] += len(messages) - len(failed_messages)
+        self.metrics["acknowledgement_failed"] += len(failed_messages)
+
+    async def extend_visibility(self) -> None:
+        """
+        Extend the visibility timeout of the messages in flight, so they aren't received again while processed.
+        """
+        if not self.in_flight:
+            return
+
+        failed_messages: list[dict] = await self.consumer.achange_message_visibility_batch(
+            list(self.in_flight.values()), visibility_timeout=self.sqs_visibility_timeout
+        )
+
+        self.metrics["visibility_extension_failed"] += len(failed_messages)
+
+    async def report_metrics(self) -> None:
+        """
+        Log the counters since the previous report, they are aggregated by the log collector.
+        """
+        log.info("SQS Consumer metrics.", queue=self.sqs_queue_name, in_flight=len(self.in_flight), **self.metrics)
+
+        self.metrics.clear()
+
+    @staticmethod
+    async def _run_periodically(interval: float, function: Callable[[], Awaitable[Any]]) -> None:
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                await function()
+
+            except Exception as exc:
+                log.error(f"Error running {function.__name__}", exc_info=True)
+
+                sentry_sdk.capture_exception(exc)
+
+    def get_partition(self, message: dict) -> int:
+        """
+        Get the partition of the message by its machine, the messages without a machine are spread by their IDs.
+
+        :param message: dict: The message received from the queue.
+
+        :return: int: Index of the worker the message is processed by.
+        """
+        try:
+            machine_id: Any = json.loads(message["Body"]).get("MachineId")
+
+        except (ValueError, AttributeError):
+            machine_id = None
+
+        return hash(message["MessageId"] if machine_id is None else machine_id) % self.workers
+
+    async def run_worker(self, partition: asyncio.Queue[dict]) -> None:
+        """
+        Process the messages of one partition one after another, in the order they were received.
+        In the batch mode the messages waiting in the partition are processed together.
+
+        :param partition: asyncio.Queue[dict]: The messages of the worker.
+        """
+        while True:
+            messages: list[dict] = [await partition.get()]
+
+            while self.batch_mode and len(messages) < self.sqs_max_number_of_messages and not partition.empty():
+                messages.append(partition.get_nowait())
+
+            try:
+                if self.batch_mode:
+                    await self.handle_batch(messages)
+                else:
+                    await self.handle_message(messages[0])
+
+            except Exception as exc:
+                log.error("Error handling messages", exc_info=True)
+
+                sentry_sdk.capture_exception(exc)
+
+            finally:
+                for _ in messages:
+                    partition.task_done()
+
+    def stop(self) -> None:
+        """
+        Stop receiving messages, `consume_concurrently` returns once the messages in flight are processed.
+        """
+        log.info("Stopping SQS Consumer.")
+
+        self.stop_event.set()
+
+    async def consume_concurrently(self) -> None:
+        """
+        Poll the SQS queue and process up to `max_in_flight` messages at the same time.
+
+        SQS calls don't block the event loop, so the next batch is received while the previous messages are
+        processed. Only as many messages as there are free slots are received, so the messages never wait
+        in memory while their visibility timeout runs out.
+        In the batch mode the messages of every receive call are processed together by `handle_batch`.
 
-                        nayax_message = NayaxTransactionSchema.model_validate_json(message["Body"])
-                        await NayaxService(session).process_message(message=nayax_message)
+        With several workers the messages are partitioned between them by their machine, see `get_partition`.
+        Every worker processes its messages one after another, so the updates of one machine are applied in the order
+        they were received and never lock the same rows at the same time, while different machines proceed in parallel.
+        Failed receive calls are retried with the same backoff as the failed messages, see `get_retry_delay`.
+        On SIGTERM or SIGINT no more messages are received, and the messages in flight are completed before return.
+        """
+        if not self.is_enabled:
+            return await self.consume()
+
+        log.info(f"Checking SQS '{self.sqs_queue_name}' for messages ...", max_in_flight=self.max_in_flight)
+
+        loop = asyncio.get_running_loop()
+
+        for signal_number in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signal_number, self.stop)
+
+        # Tasks handling the messages without workers, they're kept until done.
+        tasks: set[asyncio.Task] = set()
+        worker_tasks: list[asyncio.Task] = [
+            asyncio.create_task(self.run_worker(partition)) for partition in self.partitions
+        ]
+        periodic_tasks: list[asyncio.Task] = [
+            asyncio.create_task(self._run_periodically(ACKNOWLEDGEMENT_INTERVAL, self.acknowledge)),
+            # The visibility is extended well before it expires.
+            asyncio.create_task(
+                self._run_periodically(max(self.sqs_visibility_timeout / 2, 1), self.extend_visibility)
+            ),
+            asyncio.create_task(self._run_periodically(self.metrics_interval, self.report_metrics)),
+        ]
+
+        # Receive calls failed in a row, e.g. because of a network error or throttling.
+        failed_receives: int = 0
+
+        try:
+            while not self.stop_event.is_set():
+                if (in_flight := len(self.in_flight)) >= self.max_in_flight:
+                    self.completion_event.clear()
+                    await self.completion_event.wait()
+                    continue
 
-                        log.info("Message processed successfully.", message_id=message["MessageId"])
+                try:
+                    # The long poll isn't cancelled on stop: the messages it receives would stay invisible
+                    # until their visibility timeout expires.
+                    messages: list[dict] = await self.consumer.areceive_message_batch(
+                        max_number_of_messages=min(self.sqs_max_number_of_messages, self.max_in_flight - in_flight),
+                        wait_time_seconds=self.sqs_long_poll_time,
+                        visibility_timeout=self.sqs_visibility_timeout,
+                    )
 
                 except Exception as exc:
-                    log.error(f"Error processing message {message['MessageId']}", exc_info=True)
+                    failed_receives += 1
+                    delay: int = self.get_retry_delay(failed_receives)
+
+                    log.error("Error receiving messages from SQS", exc_info=True, attempt=failed_receives, delay=delay)
 
                     sentry_sdk.capture_exception(exc)
+                    self.metrics["receive_failed"] += 1
 
-                    if self.sqs_dlq_enabled:
-                        # Place the message in the Dead Letter Queue for further analysis
-                        continue
+                    # Sleep until the next attempt unless the consumer is stopped meanwhile.
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(self.stop_event.wait(), timeout=delay)
 
-        except Exception as exc:
-            log.error("Error receiving messages from SQS", exc_info=True)
+                    continue
 
-            sentry_sdk.capture_exception(exc)
+                failed_receives = 0
+
+                for message in messages:
+                    self._receive(message)
+
+                if self.partitions:
+                    for message in messages:
+                        self.partitions[self.get_partition(message)].put_nowait(message)
+
+                elif self.batch_mode and messages:
+                    tasks.add(task := asyncio.create_task(self.handle_batch(messages)))
+                    task.add_done_callback(tasks.discard)
+
+                else:
+                    for message in messages:
+                        tasks.add(task := asyncio.create_task(self.handle_message(message)))
+                        task.add_done_callback(tasks.discard)
+
+        finally:
+            if self.in_flight:
+                log.info("Waiting for the messages in flight.", count=len(self.in_flight))
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(*(partition.join() for partition in self.partitions))
+
+            for task in [*worker_tasks, *periodic_tasks]:
+                task.cancel()
+
+            await asyncio.gather(*worker_tasks, *periodic_tasks, return_exceptions=True)
+            await self.acknowledge()
+            await self.report_metrics()
+
+            for signal_number in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(signal_number)
+
+    async def consume(self):
+        """
+        Continuously polls an SQS queue for messages and processes them, see `consume_concurrently`.
+
+        Processed messages are deleted in batches after their transaction is committed. Failed messages are received
+        again after an exponential backoff and quarantined after `max_attempts` receives, see `retry_or_quarantine`.
+        """
+        if not self.is_enabled:
+            while True:
+                log.info(
+                    "SQS Consumer is disabled. To enable it set 'NAYAX_CONSUMER_ENABLED' to True. "
+                    "Will sleep for 1 hour."
+                )
+
+                time.sleep(60 * 60)
+
+        await self.consume_concurrently()
@@ -1,8 +1,12 @@
+import asyncio
 import logging
-from typing import Generator
+from typing import Any, Generator
 
 import boto3
 
+# Maximum number of entries of one batch request.
+SQS_BATCH_SIZE: int = 10
+
 
 class SQSManager:
     """
@@ -23,6 +27,7 @@ class SQSManager:
         queue_name,
         *,
         create_queue: bool = False,
+        endpoint_url: str | None = None,
         logger=logging.getLogger(),
     ):
         """
@@ -32,12 +37,13 @@ class SQSManager:
 
         :param queue_name: str: The name of the SQS queue to manage.
         :param create_queue: bool: If True, creates the queue if it does not exist. Defaults to False.
+        :param endpoint_url: str | None: URL of an SQS compatible service, e.g. ElasticMQ. Defaults to AWS.
         :param logger: The logger instance to use for logging. Defaults to structlog.getLogger().
         """
 
         self.logger = logger
         # we provide creds for AWS implicitly through the ENV
-        self.sqs = boto3.client("sqs")
+        self.sqs = boto3.client("sqs", endpoint_url=endpoint_url)
         self.queue_name = queue_name
         self.queue_url = self.get_queue(create_queue=create_queue)
 
@@ -126,6 +132,24 @@ class SQSManager:
                 self.logger.warning(f"An error occurred while receiving messages: {e}")
                 raise
 
+    def send_message(self, body: str) -> bool:
+        """
+        Sends a message with the specified body to the SQS queue.
+
+        :param body: str: The body of the message.
+
+        :return: bool: True if the message was successfully sent, False otherwise.
+        """
+
+        try:
+            message_id: str = self.sqs.send_message(QueueUrl=self.queue_url, MessageBody=body)["MessageId"]
+            self.logger.info(f"Message '{message_id}' sent successfully.")
+            return True
+
+        except self.sqs.exceptions.ClientError as e:
+            self.logger.error(f"Failed to send message: {e}")
+            return False
+
     def delete_message(self, message: dict) -> bool:
         """
         Deletes a specified message from the SQS queue.
@@ -146,6 +170,68 @@ class SQSManager:
             self.logger.error(f"Failed to delete message '{message['MessageId']}': {e}")
             return False
 
+    def _send_message_batch(self, action: str, messages: list[dict], **entry_arguments: Any) -> list[dict]:
+        """
+        Sends the batch request of the given action for the messages, up to 10 messages per request.
+
+        :param action: str: Name of the batch action of the client, e.g. 'delete_message_batch'.
+        :param messages: list[dict]: The message dictionaries containing the 'MessageId' and 'ReceiptHandle'.
+        :param entry_arguments: Additional arguments of every entry.
+
+        :return: list[dict]: The messages the action failed for.
+        """
+        failed_messages: list[dict] = []
+
+        for start in range(0, len(messages), SQS_BATCH_SIZE):
+            chunk: dict[str, dict] = {
+                message["MessageId"]: message for message in messages[start : start + SQS_BATCH_SIZE]
+            }
+
+            try:
+                response = getattr(self.sqs, action)(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {"Id": message_id, "ReceiptHandle": message["ReceiptHandle"], **entry_arguments}
+                        for message_id, message in chunk.items()
+                    ],
+                )
+
+            except self.sqs.exceptions.ClientError as e:
+                self.logger.error(f"Failed to {action} for messages {list(chunk)}: {e}")
+                failed_messages.extend(chunk.values())
+                continue
+
+            for failure in response.get("Failed", []):
+                self.logger.error(f"Failed to {action} for message '{failure['Id']}': {failure.get('Message')}")
+                failed_messages.append(chunk[failure["Id"]])
+
+            self.logger.info(f"{action} succeeded for {len(chunk) - len(response.get('Failed', []))} messages.")
+
+        return failed_messages
+
+    def delete_message_batch(self, messages: list[dict]) -> list[dict]:
+        """
+        Deletes the specified messages from the SQS queue, up to 10 messages per request.
+
+        :param messages: list[dict]: The message dictionaries containing the 'MessageId' and 'ReceiptHandle'.
+
+        :return: list[dict]: The messages which were not deleted.
+        """
+        return self._send_message_batch("delete_message_batch", messages)
+
+    def change_message_visibility_batch(self, messages: list[dict], *, visibility_timeout: int) -> list[dict]:
+        """
+        Changes the visibility timeout of the specified messages, up to 10 messages per request.
+
+        :param messages: list[dict]: The message dictionaries containing the 'MessageId' and 'ReceiptHandle'.
+        :param visibility_timeout: int: The new visibility timeout in seconds for the messages.
+
+        :return: list[dict]: The messages whose visibility timeout was not changed.
+        """
+        return self._send_message_batch(
+            "change_message_visibility_batch", messages, VisibilityTimeout=visibility_timeout
+        )
+
     def change_message_visibility(self, message: dict, *, visibility_timeout: int) -> bool:
         """
         Changes the visibility timeout of a specified message in the queue.
@@ -171,3 +257,91 @@ class SQSManager:
         except self.sqs.exceptions.ClientError as e:
             self.logger.error(f"Failed to change visibility timeout of message '{message['MessageId']}': {e}")
             return False
+
+    async def areceive_message_batch(
+        self,
+        max_number_of_messages: int = 10,
+        wait_time_seconds: int | None = None,
+        visibility_timeout: int | None = None,
+    ) -> list[dict]:
+        """
+        Retrieves one batch of messages from the SQS queue without blocking the event loop.
+
+        boto3 clients are thread-safe, so the long poll runs in a thread while other coroutines keep working.
+
+        :param max_number_of_messages: The maximum number of messages to retrieve, defaults to 10.
+        :param wait_time_seconds: The duration (in seconds) the call will wait for messages if the queue is empty,
+                                  defaults to None. This value must be between 0 and 20 seconds.
+        :param visibility_timeout: The duration (in seconds) that the received messages are hidden from queue.
+
+        :return: The messages received from the queue, an empty list if there were none.
+
+        :raise: Exception: Raised if message retrieval fails.
+        """
+        arguments: dict[str, Any] = {
+            "QueueUrl": self.queue_url,
+            "AttributeNames": ["All"],
+            "MessageAttributeNames": ["All"],
+            "MaxNumberOfMessages": max_number_of_messages,
+        }
+
+        if wait_time_seconds is not None:
+            arguments["WaitTimeSeconds"] = wait_time_seconds
+
+        if visibility_timeout is not None:
+            arguments["VisibilityTimeout"] = visibility_timeout
+
+        try:
+            response = await asyncio.to_thread(self.sqs.receive_message, **arguments)
+
+        except self.sqs.exceptions.ClientError as e:
+            self.logger.warning(f"An error occurred while receiving messages: {e}")
+            raise
+
+        return response.get("Messages", [])
+
+    async def adelete_message(self, message: dict) -> bool:
+        """
+        Deletes a specified message from the SQS queue without blocking the event loop, see `delete_message`.
+
+        :param message: dict: The message dictionary containing the 'ReceiptHandle'.
+
+        :return: bool: True if the message was successfully deleted, False otherwise.
+        """
+        return await asyncio.to_thread(self.delete_message, message)
+
+    async def achange_message_visibility(self, message: dict, *, visibility_timeout: int) -> bool:
+        """
+        Changes the visibility timeout of a specified message without blocking the event loop,
+        see `change_message_visibility`.
+
+        :param message: dict: The message dictionary containing the 'ReceiptHandle'.
+        :param visibility_timeout: int: The new visibility timeout in seconds for the message.
+
+        :return: bool: True if the visibility timeout was successfully changed, False otherwise.
+        """
+        return await asyncio.to_thread(self.change_message_visibility, message, visibility_timeout=visibility_timeout)
+
+    async def adelete_message_batch(self, messages: list[dict]) -> list[dict]:
+        """
+        Deletes the specified messages from the SQS queue without blocking the event loop, see `delete_message_batch`.
+
+        :param messages: list[dict]: The message dictionaries containing the 'MessageId' and 'ReceiptHandle'.
+
+        :return: list[dict]: The messages which were not deleted.
+        """
+        return await asyncio.to_thread(self.delete_message_batch, messages)
+
+    async def achange_message_visibility_batch(self, messages: list[dict], *, visibility_timeout: int) -> list[dict]:
+        """
+        Changes the visibility timeout of the specified messages without blocking the event loop,
+        see `change_message_visibility_batch`.
+
+        :param messages: list[dict]: The message dictionaries containing the 'MessageId' and 'ReceiptHandle'.
+        :param visibility_timeout: int: The new visibility timeout in seconds for the messages.
+
+        :return: list[dict]: The messages whose visibility timeout was not changed.
+        """
+        return await asyncio.to_thread(
+            self.change_message_visibility_batch, messages, visibility_timeout=visibility_timeout
+        )
@@ -1,12 +1,11 @@
 from typing import Any
 
-from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlalchemy import CTE, ColumnClause, Select, asc, desc, func, label, or_, select, update
 from sqlalchemy.orm import joinedload
 
 from mspy_vendi.core.exceptions.base_exception import BadRequestError, NotFoundError
 from mspy_vendi.core.manager import CRUDManager, UpdateSchema
-from mspy_vendi.core.pagination import Page
+from mspy_vendi.core.pagination import Page, paginate
 from mspy_vendi.domain.machines.models import Machine, MachineUser
 from mspy_vendi.domain.product_user.models import ProductUser
 from mspy_vendi.domain.products.models import Product
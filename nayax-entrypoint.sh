@@ -2,5 +2,6 @@
 
 echo "Starting Nayax consumer..."
 
-# Start Nayax consumer
+# Start Nayax consumer, SQS_WORKERS sets the number of its workers partitioned by machine,
+# SQS_MAX_IN_FLIGHT defaults to it and SQS_POOL_SIZE sizes the DB pool shared by them
 exec python -m mspy_vendi.consumers.nayax_consumer
@@ -0,0 +1,149 @@
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Generator
+
+import asyncpg
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from mspy_vendi.config import config
+from mspy_vendi.db import Geography, Machine, Product, ProductCategory
+from mspy_vendi.db.engine import AsyncSessionLocal, get_db_session
+
+ALEMBIC_INI_PATH: Path = Path(__file__).parents[2] / "mspy_vendi" / "db" / "migrations" / "alembic.ini"
+
+
+async def _recreate_database(name: str) -> None:
+    connection: asyncpg.Connection = await asyncpg.connect(
+        host=config.db.host,
+        port=config.db.port,
+        user=config.db.user,
+        password=config.db.password,
+        database=config.db.name,
+        timeout=5,
+    )
+
+    try:
+        await connection.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+        await connection.execute(f'CREATE DATABASE "{name}"')
+
+    finally:
+        await connection.close()
+
+
+async def _truncate_tables() -> None:
+    async with get_db_session() as session:
+        tables: list[str] = list(
+            await session.scalars(
+                text("SELECT tablename FROM pg_tables WHERE schemaname = 'public' AND tablename != 'alembic_version'")
+            )
+        )
+
+        quoted_tables: str = ", ".join(f'"{table}"' for table in tables)
+
+        await session.execute(text(f"TRUNCATE {quoted_tables} RESTART IDENTITY CASCADE"))
+        await session.commit()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database() -> Generator[None, None, None]:
+    """
+    Create a separate database next to the configured one and apply the migrations to it.
+    The sessions of the application are bound to it for the whole run.
+    The tests are skipped if PostgreSQL isn't available.
+    """
+    name: str = f"{config.db.name}-test"
+
+    try:
+        asyncio.run(_recreate_database(name))
+
+    except (OSError, asyncpg.PostgresError) as exc:
+        pytest.skip(f"PostgreSQL isn't available: {exc}")
+
+    config.db.name = name
+    command.upgrade(Config(str(ALEMBIC_INI_PATH)), "head")
+
+    # Connections of a pool can't be shared between the event loops of the tests.
+    AsyncSessionLocal.configure(bind=create_async_engine(config.db.db_url, poolclass=NullPool))
+
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clean_database() -> Generator[None, None, None]:
+    yield
+
+    asyncio.run(_truncate_tables())
+
+
+async def _create_catalog() -> dict[str, Any]:
+    async with get_db_session() as session:
+        geography_id: int = await session.scalar(insert(Geography).values(name="London").returning(Geography.id))
+        category_id: int = await session.scalar(
+            insert(ProductCategory).values(name="Snacks").returning(ProductCategory.id)
+        )
+        machine_ids: list[int] = list(
+            await session.scalars(
+                insert(Machine)
+                .values(
+                    [
+                        {"name": "Machine 1", "geography_id": geography_id},
+                        {"name": "Machine 2", "geography_id": geography_id},
+                    ]
+                )
+                .returning(Machine.id)
+            )
+        )
+        product_ids: list[int] = list(
+            await session.scalars(
+                insert(Product)
+                .values(
+                    [
+                        {"name": "Crisps", "price": Decimal("1.50"), "product_category_id": category_id},
+                        {"name": "Chocolate", "price": Decimal("2.00"), "product_category_id": category_id},
+                    ]
+                )
+                .returning(Product.id)
+            )
+        )
+
+        await session.commit()
+
+    return {
+        "geography_id": geography_id,
+        "category_id": category_id,
+        "machine_ids": machine_ids,
+        "product_ids": product_ids,
+    }
+
+
+@pytest.fixture
+def catalog() -> dict[str, Any]:
+    """
+    One geography with two machines, one product category with two products.
+    """
+    return asyncio.run(_create_catalog())
+
+
+async def _create_duplicates(catalog: dict[str, Any]) -> None:
+    async with get_db_session() as session:
+        await session.execute(insert(Machine).values(name="Machine 1", geography_id=catalog["geography_id"]))
+        await session.execute(
+            insert(Product).values(name="Crisps", price=Decimal("1.50"), product_category_id=catalog["category_id"])
+        )
+        await session.commit()
+
+
+@pytest.fixture
+def duplicate_names(catalog: dict[str, Any]) -> dict[str, Any]:
+    """
+    The catalog with one more machine named "Machine 1" and one more product named "Crisps", their IDs are higher.
+    """
+    asyncio.run(_create_duplicates(catalog))
+
+    return catalog
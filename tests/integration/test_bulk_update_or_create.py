@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, insert
+
+from mspy_vendi.config import config
+from mspy_vendi.db import Geography
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.geographies.manager import GeographyManager
+
+CONFLICT_TARGET: str = "uq_geography_name"
+
+
+async def _store_geographies(rows: list[dict]) -> list[tuple[dict, dict | None, bool]]:
+    async with get_db_session() as session:
+        return await GeographyManager(session).bulk_update_or_create(rows, CONFLICT_TARGET)
+
+
+def _summarize(states: list[tuple[dict, dict | None, bool]]) -> dict[str, tuple[str | None, str | None, bool]]:
+    return {
+        current["name"]: (current["postcode"], previous and previous["postcode"], is_written)
+        for current, previous, is_written in states
+    }
+
+
+def test_bulk_update_or_create_classifies_rows():
+    asyncio.run(_store_geographies([{"name": "London", "postcode": "E1"}, {"name": "Leeds", "postcode": "LS1"}]))
+
+    states = asyncio.run(
+        _store_geographies(
+            [
+                {"name": "London", "postcode": "E2"},
+                {"name": "Leeds", "postcode": "LS1"},
+                {"name": "York", "postcode": "YO1"},
+                # Duplicates are merged, the last one wins.
+                {"name": "York", "postcode": "YO2"},
+            ]
+        )
+    )
+
+    assert _summarize(states) == {
+        "London": ("E2", "E1", True),
+        "Leeds": ("LS1", "LS1", False),
+        "York": ("YO2", None, True),
+    }
+
+
+async def _count_statements(rows: list[dict]) -> int:
+    statements: list[str] = []
+
+    def on_execute(*args) -> None:
+        statements.append(args[2])
+
+    async with get_db_session() as session:
+        sync_engine = session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", on_execute)
+
+        try:
+            await GeographyManager(session).bulk_update_or_create(rows, CONFLICT_TARGET)
+
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", on_execute)
+
+    return len(statements)
+
+
+def test_bulk_update_or_create_writes_chunk_by_one_statement(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config.db, "import_chunk_size", 2)
+    asyncio.run(_store_geographies([{"name": "London", "postcode": "E1"}, {"name": "Leeds", "postcode": "LS1"}]))
+
+    statements: int = asyncio.run(
+        _count_statements(
+            [
+                {"name": "London", "postcode": "E2"},
+                {"name": "York", "postcode": "YO1"},
+                {"name": "Leeds", "postcode": "LS1"},
+            ]
+        )
+    )
+
+    assert statements == 2
+
+
+async def _store_during_concurrent_insert() -> list[tuple[dict, dict | None, bool]]:
+    async with get_db_session() as session:
+        await session.execute(insert(Geography).values(name="London", postcode="E1"))
+
+        # The insert of the task waits for the uncommitted row of the other transaction.
+        task = asyncio.create_task(_store_geographies([{"name": "London", "postcode": "E2"}]))
+        await asyncio.sleep(0.5)
+
+        assert not task.done()
+
+        await session.commit()
+
+    return await task
+
+
+def test_bulk_update_or_create_reports_concurrent_insert_as_update():
+    states = asyncio.run(_store_during_concurrent_insert())
+
+    assert _summarize(states) == {"London": ("E2", "E1", True)}
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, Sequence
+
+from sqlalchemy import RowMapping, insert, select
+
+from mspy_vendi.core.schemas import BulkUpsertResultSchema
+from mspy_vendi.db import Geography
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.geographies.manager import GeographyManager
+
+CONFLICT_TARGET: str = "uq_geography_name"
+
+
+def _geography(name: str, postcode: str | None = None) -> dict[str, Any]:
+    return {"name": name, "postcode": postcode}
+
+
+async def _bulk_upsert(
+    rows: list[dict[str, Any]], update_columns: Sequence[str] | None = None
+) -> tuple[BulkUpsertResultSchema, list[list[tuple[bool, str]]], dict[str, str | None]]:
+    returned_chunks: list[list[tuple[bool, str]]] = []
+
+    async def on_chunk(returned_rows: Sequence[RowMapping]) -> None:
+        returned_chunks.append([(row["inserted"], row["name"]) for row in returned_rows])
+
+    async with get_db_session() as session:
+        await session.execute(insert(Geography).values(_geography("Existing", "E1")))
+        await session.commit()
+
+        result: BulkUpsertResultSchema = await GeographyManager(session).bulk_upsert(
+            rows, CONFLICT_TARGET, update_columns, chunk_size=2, returning=[Geography.name], on_chunk=on_chunk
+        )
+        postcodes = await session.execute(select(Geography.name, Geography.postcode))
+
+        return result, returned_chunks, dict(postcodes.tuples().all())
+
+
+def test_bulk_upsert_skips_conflicts():
+    result, returned_chunks, postcodes = asyncio.run(
+        _bulk_upsert(
+            [
+                # Duplicates within a chunk.
+                _geography("A"),
+                _geography("A"),
+                _geography("B"),
+                _geography("Existing", "E2"),
+                # Duplicate across the chunks.
+                _geography("B"),
+                _geography("C"),
+            ]
+        )
+    )
+
+    assert result == BulkUpsertResultSchema(created_records=3, updated_records=0, skipped_records=3)
+    assert returned_chunks == [[(True, "A")], [(True, "B")], [(True, "C")]]
+    assert postcodes["Existing"] == "E1"
+
+
+def test_bulk_upsert_updates_conflicts():
+    result, returned_chunks, postcodes = asyncio.run(
+        _bulk_upsert(
+            [
+                # Duplicates within a chunk, the last one wins.
+                _geography("A", "A1"),
+                _geography("A", "A2"),
+                _geography("B", "B1"),
+                _geography("Existing", "E2"),
+                # Duplicate across the chunks, the row created by the previous chunk is updated.
+                _geography("B", "B2"),
+                _geography("C", "C1"),
+            ],
+            update_columns=["postcode"],
+        )
+    )
+
+    assert result == BulkUpsertResultSchema(created_records=3, updated_records=2, skipped_records=1)
+    assert returned_chunks == [[(True, "A")], [(True, "B"), (False, "Existing")], [(False, "B"), (True, "C")]]
+    assert postcodes == {"Existing": "E2", "A": "A2", "B": "B2", "C": "C1"}
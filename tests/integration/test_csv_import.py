@@ -0,0 +1,78 @@
+import asyncio
+import io
+from datetime import date, time
+from typing import Any
+
+from sqlalchemy import select
+
+from mspy_vendi.core.enums import ImportSkipReasonEnum
+from mspy_vendi.db import Sale
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.sales.data_extractor.csv import CSVDataExtractor
+from mspy_vendi.domain.sales.schemas import SalesBulkCreateResponseSchema
+
+CSV_CONTENT: bytes = b"""Sales report
+Transaction ID,Settlement Date and Time (GMT),Product Name,Machine Name
+101,01/02/2024 10:00:00,Crisps,Machine 1
+1111 (102),29/02/2024 23:59:59,Chocolate,Machine 2
+103,32/13/2024 10:00:00,Crisps,Machine 1
+104,31/02/2024 10:00:00,Crisps,Machine 1
+105,01/02/2024 25:00:00,Crisps,Machine 1
+99999999999999999999,01/02/2024 10:00:00,Crisps,Machine 1
+1111 (99999999999999999999),01/02/2024 10:00:00,Crisps,Machine 1
+106,01/02/2024,Crisps,Machine 1
+107,01/02/2024 10:00:00,Crisps,Unknown machine
+101,01/02/2024 10:00:00,Crisps,Machine 1
+"""
+
+
+async def _import_sales(content: bytes = CSV_CONTENT) -> SalesBulkCreateResponseSchema:
+    async with get_db_session() as session:
+        return await CSVDataExtractor(session).extract(io.BytesIO(content))
+
+
+async def _get_sales() -> set[tuple[int, date, time]]:
+    async with get_db_session() as session:
+        return set((await session.execute(select(Sale.id, Sale.sale_date, Sale.sale_time))).tuples().all())
+
+
+def test_csv_import_counts_unparsable_rows_as_invalid(catalog: dict[str, Any]):
+    result: SalesBulkCreateResponseSchema = asyncio.run(_import_sales())
+
+    # Impossible dates and times, out of range transaction IDs and a missing time are invalid.
+    assert result == SalesBulkCreateResponseSchema(
+        created_records=2,
+        skipped_records=8,
+        skipped_by_reason={
+            ImportSkipReasonEnum.INVALID: 6,
+            ImportSkipReasonEnum.UNKNOWN_MACHINE: 1,
+            ImportSkipReasonEnum.DUPLICATE: 1,
+        },
+    )
+    assert asyncio.run(_get_sales()) == {
+        (101, date(2024, 2, 1), time(10, 0)),
+        (102, date(2024, 2, 29), time(23, 59, 59)),
+    }
+
+
+async def _get_sale_references() -> set[tuple[int, int, int]]:
+    async with get_db_session() as session:
+        return set((await session.execute(select(Sale.id, Sale.machine_id, Sale.product_id))).tuples())
+
+
+def test_csv_import_resolves_duplicate_names_to_lowest_id(duplicate_names: dict[str, Any]):
+    machine_1, machine_2 = duplicate_names["machine_ids"]
+    crisps, chocolate = duplicate_names["product_ids"]
+    content: bytes = b"""Transaction ID,Settlement Date and Time (GMT),Product Name,Machine Name
+101,01/02/2024 10:00:00,Crisps,Machine 1
+102,01/02/2024 11:00:00,Chocolate,Machine 1
+103,01/02/2024 12:00:00,Crisps,Machine 2
+"""
+
+    asyncio.run(_import_sales(content))
+
+    assert asyncio.run(_get_sale_references()) == {
+        (101, machine_1, crisps),
+        (102, machine_1, chocolate),
+        (103, machine_2, crisps),
+    }
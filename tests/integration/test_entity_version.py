@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from mspy_vendi.core.mixins import entity_version
+from mspy_vendi.db import Geography
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.geographies.schemas import GeographyUpdateSchema
+from mspy_vendi.domain.geographies.service import GeographyService
+
+
+async def _get_committed_map_location(geography_id: int) -> str | None:
+    async with get_db_session() as session:
+        return await session.scalar(select(Geography.map_location).where(Geography.id == geography_id))
+
+
+@pytest.mark.parametrize("autocommit", [True, False])
+def test_entity_version_is_bumped_after_commit(catalog: dict, monkeypatch: pytest.MonkeyPatch, autocommit: bool):
+    # The states a consumer would cache right after every bump.
+    cached_map_locations: list[str | None] = []
+
+    async def bump_entity_version() -> int | None:
+        cached_map_locations.append(await _get_committed_map_location(catalog["geography_id"]))
+        return len(cached_map_locations)
+
+    monkeypatch.setattr(entity_version, "bump_entity_version", bump_entity_version)
+
+    async def _update_geography() -> None:
+        async with get_db_session() as session:
+            await GeographyService(session).update(
+                catalog["geography_id"], GeographyUpdateSchema(map_location="51.5,-0.1"), autocommit=autocommit
+            )
+
+            if not autocommit:
+                assert cached_map_locations == []
+
+                await session.commit()
+                # The bump runs in a task scheduled by the commit.
+                await asyncio.sleep(0.1)
+
+    asyncio.run(_update_geography())
+
+    assert cached_map_locations == ["51.5,-0.1"]
+
+
+def test_entity_version_is_not_bumped_after_rollback(catalog: dict, monkeypatch: pytest.MonkeyPatch):
+    bumps: list[None] = []
+
+    async def bump_entity_version() -> int | None:
+        bumps.append(None)
+        return len(bumps)
+
+    monkeypatch.setattr(entity_version, "bump_entity_version", bump_entity_version)
+
+    async def _update_geography() -> None:
+        async with get_db_session() as session:
+            await GeographyService(session).update(
+                catalog["geography_id"], GeographyUpdateSchema(map_location="51.5,-0.1"), autocommit=False
+            )
+            await session.rollback()
+
+            # The next, unrelated transaction of the session doesn't bump the version.
+            await session.execute(select(Geography.id))
+            await session.commit()
+            await asyncio.sleep(0.1)
+
+    asyncio.run(_update_geography())
+
+    assert bumps == []
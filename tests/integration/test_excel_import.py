@@ -0,0 +1,171 @@
+import asyncio
+import io
+from typing import Any
+
+import pytest
+from openpyxl import Workbook
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from mspy_vendi.config import config
+from mspy_vendi.core.enums import ImportSkipReasonEnum
+from mspy_vendi.db import MachineImpression, Sale
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.machine_impression.data_extractor.excel import (
+    ExcelDataExtractor as MachineImpressionExcelDataExtractor,
+)
+from mspy_vendi.domain.sales.data_extractor.excel import ExcelDataExtractor as SaleExcelDataExtractor
+
+SALE_HEADER: tuple[str, ...] = ("Transaction ID", "Settlement Date and Time (GMT)", "Product Name", "Machine Name")
+MACHINE_IMPRESSION_HEADER: tuple[str, ...] = ("Nayax Code", "DJ  NAME", "Venue Name")
+
+
+def _generate_workbook(header: tuple[str, ...], rows: list[tuple[Any, ...]]) -> bytes:
+    workbook = Workbook()
+    worksheet = workbook.active
+
+    # The first row is a title, the column names are in the second one.
+    worksheet.append(("Report",))
+    worksheet.append(header)
+
+    for row in rows:
+        worksheet.append(row)
+
+    file = io.BytesIO()
+    workbook.save(file)
+
+    return file.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config.db, "import_chunk_size", 2)
+
+
+async def _import_sales(content: bytes) -> Any:
+    async with get_db_session() as session:
+        return await SaleExcelDataExtractor(session).extract(content)
+
+
+async def _get_sale_ids() -> set[int]:
+    async with get_db_session() as session:
+        return set(await session.scalars(select(Sale.id)))
+
+
+def test_sale_import_skips_rows(catalog: dict[str, Any]):
+    content: bytes = _generate_workbook(
+        SALE_HEADER,
+        [
+            (101, "01/02/2024 10:00:00", "Crisps", "Machine 1"),
+            ("1111 (102)", "01/02/2024 11:00:00", "Chocolate", "Machine 2"),
+            # Missing required column.
+            (103, "01/02/2024 12:00:00", None, "Machine 1"),
+            (104, "01/02/2024 13:00:00", "Crisps", "Unknown machine"),
+            (105, "01/02/2024 14:00:00", "Unknown product", "Machine 1"),
+            # Duplicate of a row of the previous batch.
+            (101, "01/02/2024 10:00:00", "Crisps", "Machine 1"),
+        ],
+    )
+
+    result = asyncio.run(_import_sales(content))
+
+    assert result.created_records == 2
+    assert result.skipped_by_reason == {
+        ImportSkipReasonEnum.UNKNOWN_MACHINE: 1,
+        ImportSkipReasonEnum.UNKNOWN_PRODUCT: 1,
+        ImportSkipReasonEnum.DUPLICATE: 1,
+    }
+    assert asyncio.run(_get_sale_ids()) == {101, 102}
+
+
+def test_sale_import_is_rolled_back_on_invalid_batch(catalog: dict[str, Any]):
+    content: bytes = _generate_workbook(
+        SALE_HEADER,
+        [
+            (101, "01/02/2024 10:00:00", "Crisps", "Machine 1"),
+            (102, "01/02/2024 11:00:00", "Chocolate", "Machine 2"),
+            # The second batch fails the validation after the first one is written.
+            (103, "32/13/2024 10:00:00", "Crisps", "Machine 1"),
+        ],
+    )
+
+    with pytest.raises(ValidationError):
+        asyncio.run(_import_sales(content))
+
+    assert asyncio.run(_get_sale_ids()) == set()
+
+
+async def _get_sale_references() -> set[tuple[int, int, int]]:
+    async with get_db_session() as session:
+        return set((await session.execute(select(Sale.id, Sale.machine_id, Sale.product_id))).tuples())
+
+
+def test_sale_import_resolves_duplicate_names_to_lowest_id(duplicate_names: dict[str, Any]):
+    machine_1, machine_2 = duplicate_names["machine_ids"]
+    crisps, chocolate = duplicate_names["product_ids"]
+    content: bytes = _generate_workbook(
+        SALE_HEADER,
+        [
+            (101, "01/02/2024 10:00:00", "Crisps", "Machine 1"),
+            (102, "01/02/2024 11:00:00", "Chocolate", "Machine 1"),
+            (103, "01/02/2024 12:00:00", "Crisps", "Machine 2"),
+        ],
+    )
+
+    asyncio.run(_import_sales(content))
+
+    assert asyncio.run(_get_sale_references()) == {
+        (101, machine_1, crisps),
+        (102, machine_1, chocolate),
+        (103, machine_2, crisps),
+    }
+
+
+async def _import_machine_impressions(content: bytes) -> Any:
+    async with get_db_session() as session:
+        return await MachineImpressionExcelDataExtractor(session).extract(content)
+
+
+async def _get_machine_impressions() -> set[tuple[int, str]]:
+    async with get_db_session() as session:
+        rows = await session.execute(select(MachineImpression.machine_id, MachineImpression.impression_device_number))
+
+        return set(rows.tuples())
+
+
+def test_machine_impression_import_skips_rows(catalog: dict[str, Any]):
+    machine_1, machine_2 = catalog["machine_ids"]
+    content: bytes = _generate_workbook(
+        MACHINE_IMPRESSION_HEADER,
+        [
+            (machine_1, "DJ-1", "Venue 1"),
+            (f"Machine ({machine_2})", "DJ-2", "Venue 2"),
+            # Missing device number.
+            (machine_1, None, "Venue 1"),
+            (machine_2 + 100, "DJ-3", "Unknown venue"),
+            # Duplicate of a row of the previous batch.
+            (machine_1, "DJ-1", "Venue 1"),
+        ],
+    )
+
+    result = asyncio.run(_import_machine_impressions(content))
+
+    assert (result.created_records, result.skipped_records) == (2, 3)
+    assert asyncio.run(_get_machine_impressions()) == {(machine_1, "DJ-1"), (machine_2, "DJ-2")}
+
+
+def test_machine_impression_import_is_rolled_back_on_invalid_batch(catalog: dict[str, Any]):
+    machine_1, machine_2 = catalog["machine_ids"]
+    content: bytes = _generate_workbook(
+        MACHINE_IMPRESSION_HEADER,
+        [
+            (machine_1, "DJ-1", "Venue 1"),
+            (machine_2, "DJ-2", "Venue 2"),
+            ("Not a number", "DJ-3", "Venue 3"),
+        ],
+    )
+
+    with pytest.raises(ValueError):
+        asyncio.run(_import_machine_impressions(content))
+
+    assert asyncio.run(_get_machine_impressions()) == set()
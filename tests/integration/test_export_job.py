@@ -0,0 +1,194 @@
+import asyncio
+import csv
+import io
+from datetime import date, datetime, time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from starlette.datastructures import URL
+
+from mspy_vendi.config import config
+from mspy_vendi.core.enums import ExportJobStatusEnum, ExportTypeEnum
+from mspy_vendi.core.enums.export import ExportEntityTypeEnum
+from mspy_vendi.core.exceptions.base_exception import NotFoundError
+from mspy_vendi.core.mixins import export
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.sales.filters import ExportSaleFilter
+from mspy_vendi.domain.sales.manager import SaleManager
+from mspy_vendi.domain.sales.service import SaleService
+from mspy_vendi.domain.sales.tasks import export_sale_job_task
+
+SUPERUSER = SimpleNamespace(id=1, email="admin@example.com", firstname="Admin", lastname="Admin", is_superuser=True)
+DOWNLOAD_URL = URL("http://testserver/api/v1/sale/export/jobs/download")
+SALES_COUNT: int = 50
+
+
+class FakeRedis:
+    """
+    The commands of Redis used by the export jobs, without the expiration.
+    """
+
+    def __init__(self):
+        self.values: dict[str, Any] = {}
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> None:
+        self.values[key] = value
+
+    async def get(self, key: str) -> Any:
+        return self.values.get(key)
+
+    async def getdel(self, key: str) -> Any:
+        return self.values.pop(key, None)
+
+    async def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.values)
+
+    async def rpush(self, key: str, value: bytes) -> None:
+        self.values.setdefault(key, []).append(value)
+
+    async def expire(self, key: str, seconds: int) -> None:
+        pass
+
+    async def llen(self, key: str) -> int:
+        return len(self.values.get(key, []))
+
+    async def lindex(self, key: str, index: int) -> bytes | None:
+        values: list[bytes] = self.values.get(key, [])
+        return values[index] if index < len(values) else None
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    redis = FakeRedis()
+    monkeypatch.setattr(export, "redis_client", redis)
+    monkeypatch.setattr(export, "binary_redis_client", redis)
+    # Several chunks per file.
+    monkeypatch.setattr(config.redis, "export_file_chunk_size", 256)
+
+    return redis
+
+
+@pytest.fixture
+def enqueued_jobs(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    enqueued_jobs: list[dict[str, Any]] = []
+
+    async def kiq(**kwargs: Any) -> None:
+        enqueued_jobs.append(kwargs)
+
+    monkeypatch.setattr(export_sale_job_task, "kiq", kiq)
+
+    return enqueued_jobs
+
+
+async def _store_sales(catalog: dict[str, Any]) -> None:
+    async with get_db_session() as session:
+        await SaleManager(session).bulk_update_or_create(
+            [
+                {
+                    "id": sale_id,
+                    "sale_date": date(2024, 2, 1),
+                    "sale_time": time(12, 0),
+                    "quantity": 1,
+                    "source_system": "Nayax",
+                    "source_system_id": sale_id,
+                    "machine_id": catalog["machine_ids"][0],
+                    "product_id": catalog["product_ids"][0],
+                }
+                for sale_id in range(1, SALES_COUNT + 1)
+            ]
+        )
+
+
+async def _run_export_job(enqueued_jobs: list[dict[str, Any]]) -> tuple[str, Any]:
+    query_filter = ExportSaleFilter(date_from=datetime(2024, 2, 1), date_to=datetime(2024, 2, 29), product=None)
+
+    async with get_db_session() as session:
+        job = await SaleService(session).create_export_job(
+            query_filter, ExportTypeEnum.CSV, SUPERUSER, entity=ExportEntityTypeEnum.SALE
+        )
+
+    # The worker part of the job.
+    async with get_db_session() as session:
+        await SaleService(session).run_export_job(**enqueued_jobs.pop(), entity=ExportEntityTypeEnum.SALE)
+
+    return job.job_id, await _get_export_job(job.job_id, SUPERUSER)
+
+
+async def _get_export_job(job_id: str, user: SimpleNamespace) -> Any:
+    async with get_db_session() as session:
+        return await SaleService(session).get_export_job(job_id, user, DOWNLOAD_URL, entity=ExportEntityTypeEnum.SALE)
+
+
+async def _download(job_id: str, token: str) -> bytes:
+    async with get_db_session() as session:
+        response = await SaleService(session).download_export_job(job_id, token, entity=ExportEntityTypeEnum.SALE)
+
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def test_export_job_lifecycle(catalog: dict[str, Any], redis: FakeRedis, enqueued_jobs: list[dict[str, Any]]):
+    asyncio.run(_store_sales(catalog))
+
+    job_id, job = asyncio.run(_run_export_job(enqueued_jobs))
+
+    assert (job.status, job.processed_rows) == (ExportJobStatusEnum.COMPLETED, SALES_COUNT)
+    assert len(redis.values[export.EXPORT_JOB_FILE_KEY_TEMPLATE.format(job_id=job_id)]) > 1
+
+    token: str = URL(job.download_url).query.removeprefix("token=")
+    content: bytes = asyncio.run(_download(job_id, token))
+
+    assert len(list(csv.reader(io.StringIO(content.decode())))) == SALES_COUNT + 1
+
+    # The link is one-off.
+    with pytest.raises(NotFoundError):
+        asyncio.run(_download(job_id, token))
+
+
+def test_download_requires_token_of_job(catalog: dict[str, Any], redis: FakeRedis, enqueued_jobs: list[dict[str, Any]]):
+    asyncio.run(_store_sales(catalog))
+
+    job_id, job = asyncio.run(_run_export_job(enqueued_jobs))
+    token: str = URL(job.download_url).query.removeprefix("token=")
+
+    # No link is issued to other users.
+    with pytest.raises(NotFoundError):
+        asyncio.run(_get_export_job(job_id, SimpleNamespace(id=2, is_superuser=False)))
+
+    with pytest.raises(NotFoundError):
+        asyncio.run(_download(job_id, "invalid-token"))
+
+    # The token of another job doesn't fit, and it's spent by the attempt.
+    with pytest.raises(NotFoundError):
+        asyncio.run(_download("another-job-id", token))
+
+    with pytest.raises(NotFoundError):
+        asyncio.run(_download(job_id, token))
+
+
+def test_export_job_fails_if_file_is_too_large(
+    catalog: dict[str, Any], redis: FakeRedis, enqueued_jobs: list[dict[str, Any]], monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(config.redis, "export_file_max_size", 1024)
+    asyncio.run(_store_sales(catalog))
+
+    job_id, job = asyncio.run(_run_export_job(enqueued_jobs))
+
+    assert (job.status, job.download_url) == (ExportJobStatusEnum.FAILED, None)
+    assert export.EXPORT_JOB_FILE_KEY_TEMPLATE.format(job_id=job_id) not in redis.values
+
+
+def test_export_job_expires_with_its_file(
+    catalog: dict[str, Any], redis: FakeRedis, enqueued_jobs: list[dict[str, Any]]
+):
+    asyncio.run(_store_sales(catalog))
+
+    job_id, _ = asyncio.run(_run_export_job(enqueued_jobs))
+    # The file expires earlier than the state of the job.
+    del redis.values[export.EXPORT_JOB_FILE_KEY_TEMPLATE.format(job_id=job_id)]
+    job = asyncio.run(_get_export_job(job_id, SUPERUSER))
+
+    assert (job.status, job.download_url) == (ExportJobStatusEnum.EXPIRED, None)
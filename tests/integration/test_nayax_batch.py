@@ -0,0 +1,77 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+
+from mspy_vendi.db import EntityLog, Geography, Machine, Product, Sale
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.nayax import cache as cache_module
+from mspy_vendi.domain.nayax import service as service_module
+from mspy_vendi.domain.nayax.cache import NayaxEntityCache
+from mspy_vendi.domain.nayax.schemas import NayaxTransactionSchema
+from mspy_vendi.domain.nayax.service import NayaxService
+
+NAYAX_DATA_PATH: Path = Path(__file__).parents[1] / "mocking" / "nayax" / "nayax-data.json"
+
+
+def _load_messages() -> list[NayaxTransactionSchema]:
+    return [NayaxTransactionSchema.model_validate(item) for item in json.loads(NAYAX_DATA_PATH.read_text())]
+
+
+@pytest.fixture(autouse=True)
+def disable_versions(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def get_entity_version() -> str | None:
+        return "0"
+
+    async def bump_version() -> None:
+        pass
+
+    monkeypatch.setattr(cache_module, "get_entity_version", get_entity_version)
+    monkeypatch.setattr(cache_module, "bump_entity_version", bump_version)
+    monkeypatch.setattr(service_module, "bump_data_version", bump_version)
+
+
+async def _process_batch(messages: list[NayaxTransactionSchema]) -> int:
+    async with get_db_session() as session:
+        return await NayaxService(session, NayaxEntityCache(max_size=100, ttl=60)).process_batch(messages)
+
+
+async def _count_rows() -> dict[str, int]:
+    async with get_db_session() as session:
+        return {
+            model.__tablename__: await session.scalar(select(func.count()).select_from(model))
+            for model in (Geography, Machine, Product, Sale, EntityLog)
+        }
+
+
+def test_process_batch_stores_deduplicated_entities():
+    messages: list[NayaxTransactionSchema] = _load_messages()
+
+    assert asyncio.run(_process_batch(messages)) == 0
+    assert asyncio.run(_count_rows()) == {
+        "geography": len({message.data.area_description for message in messages}),
+        "machine": len({message.machine_id for message in messages}),
+        "product": len({product.product_id for message in messages for product in message.data.products}),
+        "sale": len(messages),
+        "entity_log": 0,
+    }
+
+    # Redelivered messages are duplicates, a renamed machine is updated and logged.
+    messages[0].data.machine_name = "Renamed machine"
+
+    assert asyncio.run(_process_batch(messages[:3])) == 3
+    assert asyncio.run(_count_rows())["entity_log"] == 1
+
+
+def test_process_batch_is_rolled_back_if_a_message_fails():
+    messages: list[NayaxTransactionSchema] = _load_messages()
+    # The name doesn't fit the column of the product, geographies and machines are already written by then.
+    messages[-1].data.products[0].product_name = "A" * 300
+
+    with pytest.raises(DBAPIError):
+        asyncio.run(_process_batch(messages))
+
+    assert set(asyncio.run(_count_rows()).values()) == {0}
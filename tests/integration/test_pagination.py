@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any
+
+import pytest
+from fastapi_pagination.api import set_page, set_params
+from sqlalchemy import insert, select
+
+from mspy_vendi.core.pagination import CursorPage, Page, paginate, paginate_by_cursor
+from mspy_vendi.db import Geography
+from mspy_vendi.db.engine import get_db_session
+
+PAGE_SIZE: int = 2
+# Duplicates and NULLs of the nullable sort column.
+POSTCODES: list[str | None] = [None, "B", "A", None, "B", "A", "C"]
+
+
+async def _store_geographies() -> list[tuple[int, str | None]]:
+    async with get_db_session() as session:
+        rows = await session.execute(
+            insert(Geography)
+            .values(
+                [{"name": f"Geography {number}", "postcode": postcode} for number, postcode in enumerate(POSTCODES)]
+            )
+            .returning(Geography.id, Geography.postcode)
+        )
+        keys: list[tuple[int, str | None]] = list(rows.tuples())
+        await session.commit()
+
+    return keys
+
+
+def _sort_keys(keys: list[tuple[int, str | None]], descending: bool) -> list[int]:
+    # NULLs are the smallest values, see `paginate_by_cursor`.
+    ordered = sorted(keys, key=lambda key: (key[1] is not None, key[1] or "", key[0]), reverse=descending)
+
+    return [obj_id for obj_id, _ in ordered]
+
+
+async def _get_cursor_page(cursor: str | None, descending: bool) -> Any:
+    async with get_db_session() as session:
+        with set_page(CursorPage), set_params(CursorPage.__params_type__(size=PAGE_SIZE, cursor=cursor)):
+            return await paginate_by_cursor(
+                session, select(Geography), Geography.id, Geography.postcode, descending=descending
+            )
+
+
+async def _walk(descending: bool) -> tuple[list[int], list[int]]:
+    """
+    Walk all pages forward with the next cursors, then back with the previous cursors.
+
+    :return: IDs in the order of the forward walk and of the backward walk.
+    """
+    forward_pages: list[list[int]] = []
+    page = await _get_cursor_page(None, descending)
+    forward_pages.append([item.id for item in page.items])
+
+    while page.next_page:
+        page = await _get_cursor_page(page.next_page, descending)
+        forward_pages.append([item.id for item in page.items])
+
+    backward_pages: list[list[int]] = [forward_pages[-1]]
+
+    while page.previous_page:
+        page = await _get_cursor_page(page.previous_page, descending)
+        backward_pages.insert(0, [item.id for item in page.items])
+
+    return sum(forward_pages, []), sum(backward_pages, [])
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_paginate_by_cursor_walks_both_directions(descending: bool):
+    keys: list[tuple[int, str | None]] = asyncio.run(_store_geographies())
+
+    forward, backward = asyncio.run(_walk(descending))
+
+    assert forward == _sort_keys(keys, descending)
+    assert backward == forward
+
+
+async def _get_page(page: int, include_total: bool) -> Any:
+    async with get_db_session() as session:
+        with set_page(Page), set_params(Page.__params_type__(page=page, size=PAGE_SIZE, include_total=include_total)):
+            return await paginate(session, select(Geography).order_by(Geography.id))
+
+
+@pytest.mark.parametrize(
+    ("page", "include_total", "total", "items_count"),
+    [(1, True, 7, 2), (4, True, 7, 1), (10, True, 7, 0), (1, False, None, 2)],
+)
+def test_paginate_counts_total(page: int, include_total: bool, total: int | None, items_count: int):
+    asyncio.run(_store_geographies())
+
+    result = asyncio.run(_get_page(page, include_total))
+
+    assert (result.total, len(result.items)) == (total, items_count)
+
+    if not include_total:
+        assert result.pages is None
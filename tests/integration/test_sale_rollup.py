@@ -0,0 +1,233 @@
+import asyncio
+from datetime import date, datetime, time
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import pytest
+from sqlalchemy import select
+
+from mspy_vendi.config import config
+from mspy_vendi.core.enums import ImportSkipReasonEnum
+from mspy_vendi.core.enums.date_range import DailyTimePeriodEnum
+from mspy_vendi.db import SaleDailyRollup
+from mspy_vendi.db.engine import get_db_session
+from mspy_vendi.domain.sales.filters import SaleFilter
+from mspy_vendi.domain.sales.manager import SaleDailyRollupManager, SaleManager
+from mspy_vendi.domain.sales.schemas import ExcelSaleCreateSchema, SalesBulkCreateResponseSchema
+
+SUPERUSER = SimpleNamespace(id=1, is_superuser=True)
+
+
+def _sale(sale_id: int, sale_date: date, sale_time: time, quantity: int, machine_id: int, product_id: int) -> dict:
+    return {
+        "id": sale_id,
+        "sale_date": sale_date,
+        "sale_time": sale_time,
+        "quantity": quantity,
+        "source_system": "Nayax",
+        "source_system_id": sale_id,
+        "machine_id": machine_id,
+        "product_id": product_id,
+    }
+
+
+def _generate_sales(catalog: dict[str, Any]) -> list[dict]:
+    """
+    Sales of January and February 2024 around the month boundary and around midnight.
+    """
+    (machine_1, machine_2), (crisps, chocolate) = catalog["machine_ids"], catalog["product_ids"]
+
+    return [
+        _sale(1, date(2024, 1, 15), time(12, 0), 2, machine_1, crisps),
+        _sale(2, date(2024, 1, 31), time(23, 30), 1, machine_1, chocolate),
+        _sale(3, date(2024, 1, 31), time(23, 59, 59), 3, machine_2, crisps),
+        _sale(4, date(2024, 2, 1), time(0, 0), 1, machine_1, crisps),
+        _sale(5, date(2024, 2, 1), time(1, 59, 59), 4, machine_2, chocolate),
+        _sale(6, date(2024, 2, 1), time(2, 0), 1, machine_2, chocolate),
+        _sale(7, date(2024, 2, 15), time(22, 0), 2, machine_1, chocolate),
+        _sale(8, date(2024, 2, 29), time(21, 59, 59), 5, machine_2, crisps),
+        _sale(9, date(2024, 3, 1), time(0, 30), 7, machine_1, crisps),
+    ]
+
+
+async def _store_sales(sales: list[dict]) -> None:
+    async with get_db_session() as session:
+        await SaleManager(session).bulk_update_or_create(sales)
+
+
+async def _get_rollup() -> set[tuple]:
+    async with get_db_session() as session:
+        rows = await session.execute(
+            select(
+                SaleDailyRollup.sale_date,
+                SaleDailyRollup.machine_id,
+                SaleDailyRollup.product_id,
+                SaleDailyRollup.quantity,
+                SaleDailyRollup.transactions_count,
+            )
+        )
+
+        return set(rows.tuples())
+
+
+async def _rebuild_rollup() -> None:
+    async with get_db_session() as session:
+        await SaleDailyRollupManager(session).rebuild()
+
+
+def _generate_filter(
+    date_from: datetime = datetime(2024, 2, 1), date_to: datetime = datetime(2024, 2, 29)
+) -> SaleFilter:
+    # The nested filter is resolved by FastAPI in the requests.
+    return SaleFilter(date_from=date_from, date_to=date_to, product=None)
+
+
+async def _get_period_statistics() -> dict[str, Any]:
+    async with get_db_session() as session:
+        manager = SaleManager(session)
+
+        return {
+            "quantity": await manager.get_sales_quantity_by_product(_generate_filter(), SUPERUSER),
+            "average": await manager.get_average_sales_across_machines(_generate_filter(), SUPERUSER),
+            "units": await manager.get_units_sold_statistic(_generate_filter(), SUPERUSER),
+        }
+
+
+@pytest.fixture(autouse=True)
+def disable_statistic_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "statistic_cache_enabled", False)
+
+
+def test_incremental_rollup_matches_rebuild(catalog: dict[str, Any]):
+    sales: list[dict] = _generate_sales(catalog)
+    asyncio.run(_store_sales(sales))
+
+    # Change the quantity of one sale and move two sales to other days and products,
+    # the groups of sales 1 and 4 are left without sales and their rollup rows have to be removed.
+    (_, machine_2), (_, chocolate) = catalog["machine_ids"], catalog["product_ids"]
+    asyncio.run(
+        _store_sales(
+            [
+                sales[0] | {"sale_date": date(2024, 1, 16), "product_id": chocolate},
+                sales[3] | {"machine_id": machine_2},
+                sales[6] | {"quantity": 9},
+                # Unchanged sale, it mustn't be applied twice.
+                sales[7],
+            ]
+        )
+    )
+
+    incremental_rollup: set[tuple] = asyncio.run(_get_rollup())
+    asyncio.run(_rebuild_rollup())
+
+    assert incremental_rollup == asyncio.run(_get_rollup())
+    assert (date(2024, 1, 15), sales[0]["machine_id"], sales[0]["product_id"]) not in {
+        row[:3] for row in incremental_rollup
+    }
+
+
+def test_period_statistics_match_raw_sales(catalog: dict[str, Any], monkeypatch: pytest.MonkeyPatch):
+    asyncio.run(_store_sales(_generate_sales(catalog)))
+
+    rollup_statistics: dict[str, Any] = asyncio.run(_get_period_statistics())
+
+    monkeypatch.setattr(config, "sale_rollup_enabled", False)
+    raw_statistics: dict[str, Any] = asyncio.run(_get_period_statistics())
+
+    assert rollup_statistics == raw_statistics
+
+    # February: sales 4-8, the previous month: sales 1-3. The sale of March is out of both periods.
+    assert (raw_statistics["quantity"].quantity, raw_statistics["quantity"].previous_month_statistic) == (13, 6)
+    assert (raw_statistics["average"].quantity, raw_statistics["average"].previous_month_statistic) == (
+        Decimal("2.6"),
+        2,
+    )
+    # Crisps cost 1.50 and chocolate costs 2.00.
+    assert (raw_statistics["units"].units, raw_statistics["units"].previous_month_statistic) == (23, Decimal("9.5"))
+
+
+async def _get_sales_count_per_time_period() -> dict[str, int]:
+    async with get_db_session() as session:
+        result = await SaleManager(session).get_sales_count_per_time_period(
+            DailyTimePeriodEnum, _generate_filter(datetime(2024, 1, 1), datetime(2024, 3, 31)), SUPERUSER
+        )
+
+        return {item["time_period"]: item["sales"] for item in result}
+
+
+def test_sales_count_per_time_period_wraps_past_midnight(catalog: dict[str, Any]):
+    sales: list[dict] = _generate_sales(catalog)
+    asyncio.run(_store_sales(sales))
+
+    expected: dict[str, int] = {period.name: 0 for period in DailyTimePeriodEnum}
+
+    for sale in sales:
+        for period in DailyTimePeriodEnum:
+            if (
+                period.start <= sale["sale_time"] or sale["sale_time"] <= period.end
+                if period.start > period.end
+                else period.start <= sale["sale_time"] <= period.end
+            ):
+                expected[period.name] += 1
+
+    assert asyncio.run(_get_sales_count_per_time_period()) == expected
+    # 22:00, 23:30, 23:59:59, 00:00, 00:30 and 01:59:59 belong to `10 PM-2 AM`.
+    assert expected[DailyTimePeriodEnum.MIDNIGHT.name] == 6
+
+
+def _excel_sale(sale_id: int, sale_datetime: str, product_name: str, machine_name: str) -> ExcelSaleCreateSchema:
+    return ExcelSaleCreateSchema.model_validate(
+        {
+            "Transaction ID": sale_id,
+            "Settlement Date and Time (GMT)": sale_datetime,
+            "Product Name": product_name,
+            "Machine Name": machine_name,
+        }
+    )
+
+
+async def _create_batch(batches: list[list[ExcelSaleCreateSchema]]) -> SalesBulkCreateResponseSchema:
+    async def _iterate_batches() -> AsyncIterator[list[ExcelSaleCreateSchema]]:
+        for batch in batches:
+            yield batch
+
+    async with get_db_session() as session:
+        return await SaleManager(session).create_batch(_iterate_batches())
+
+
+def test_create_batch_applies_inserted_sales_to_rollup(catalog: dict[str, Any], monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(config.db, "import_chunk_size", 2)
+    asyncio.run(_store_sales(_generate_sales(catalog)))
+
+    result: SalesBulkCreateResponseSchema = asyncio.run(
+        _create_batch(
+            [
+                [
+                    _excel_sale(101, "01/02/2024 10:00:00", "Crisps", "Machine 1"),
+                    # Duplicate within a chunk.
+                    _excel_sale(101, "01/02/2024 10:00:00", "Crisps", "Machine 1"),
+                    _excel_sale(102, "01/02/2024 11:00:00", "Chocolate", "Machine 2"),
+                    # Existing sale.
+                    _excel_sale(4, "01/02/2024 00:00:00", "Crisps", "Machine 1"),
+                ],
+                [
+                    # Duplicate across the batches.
+                    _excel_sale(102, "01/02/2024 11:00:00", "Chocolate", "Machine 2"),
+                    _excel_sale(103, "29/02/2024 23:00:00", "Chocolate", "Machine 1"),
+                    _excel_sale(104, "29/02/2024 23:00:00", "Chocolate", "Unknown machine"),
+                ],
+            ]
+        )
+    )
+
+    assert result == SalesBulkCreateResponseSchema(
+        created_records=3,
+        skipped_records=4,
+        skipped_by_reason={ImportSkipReasonEnum.DUPLICATE: 3, ImportSkipReasonEnum.UNKNOWN_MACHINE: 1},
+    )
+
+    incremental_rollup: set[tuple] = asyncio.run(_get_rollup())
+    asyncio.run(_rebuild_rollup())
+
+    assert incremental_rollup == asyncio.run(_get_rollup())
@@ -0,0 +1,97 @@
+import asyncio
+import io
+import os
+import time
+from typing import Any, Iterator
+from zipfile import BadZipFile
+
+import pytest
+from openpyxl import Workbook
+
+from mspy_vendi.core.helpers import iter_excel_rows, read_excel_batches
+from mspy_vendi.core.process_pool import iterate_in_subprocess
+
+# Maximum delay of the event loop while the file is parsed, in seconds.
+# Parsing in a thread delays it by about 0.1 second, in a subprocess by a few milliseconds.
+MAX_LOOP_LAG: float = 0.05
+COLUMNS: list[str] = ["Transaction ID", "Product Name"]
+
+
+def _generate_workbook(rows: list[tuple[Any, ...]]) -> bytes:
+    workbook = Workbook()
+    worksheet = workbook.active
+
+    # The first row is a title, the column names are in the second one.
+    worksheet.append(("Sales report",))
+    worksheet.append(("Transaction ID", "Ignored", "Product Name"))
+
+    for row in rows:
+        worksheet.append(row)
+
+    file = io.BytesIO()
+    workbook.save(file)
+
+    return file.getvalue()
+
+
+async def _read_all(content: bytes, **kwargs: Any) -> list[list[dict[str, Any]]]:
+    return [batch async for batch in read_excel_batches(content, COLUMNS, header_row=2, **kwargs)]
+
+
+def test_iter_excel_rows_reads_columns_after_header():
+    content: bytes = _generate_workbook([(1, "x", "Crisps"), (None, None, None), (2, "y", None), (3, None, "Tea")])
+
+    batches = list(iter_excel_rows(content, COLUMNS, header_row=2, chunk_size=2))
+
+    assert batches == [
+        [{"Transaction ID": 1, "Product Name": "Crisps"}, {"Transaction ID": 2, "Product Name": None}],
+        [{"Transaction ID": 3, "Product Name": "Tea"}],
+    ]
+
+
+def test_read_excel_batches_in_subprocess():
+    content: bytes = _generate_workbook([(number, None, f"Product {number}") for number in range(5)])
+
+    batches = asyncio.run(_read_all(content, chunk_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[-1] == [{"Transaction ID": 4, "Product Name": "Product 4"}]
+
+
+def test_read_excel_batches_raises_errors_of_subprocess():
+    with pytest.raises(BadZipFile):
+        asyncio.run(_read_all(b"not an excel file"))
+
+
+def _exit_abruptly() -> Iterator[int]:
+    os._exit(1)
+    yield 0
+
+
+async def _iterate_exiting_subprocess() -> list[int]:
+    return [item async for item in iterate_in_subprocess(_exit_abruptly)]
+
+
+def test_iterate_in_subprocess_detects_exit():
+    with pytest.raises(ChildProcessError):
+        asyncio.run(_iterate_exiting_subprocess())
+
+
+async def _measure_loop_lag(content: bytes, interval: float = 0.01) -> float:
+    task: asyncio.Task = asyncio.create_task(_read_all(content))
+    max_lag: float = 0.0
+
+    while not task.done():
+        started: float = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - started - interval)
+
+    task.result()
+
+    return max_lag
+
+
+def test_read_excel_batches_does_not_block_event_loop():
+    content: bytes = _generate_workbook([(number, None, f"Product {number % 500}") for number in range(20_000)])
+
+    assert asyncio.run(_measure_loop_lag(content)) < MAX_LOOP_LAG
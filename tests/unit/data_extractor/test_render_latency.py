@@ -0,0 +1,60 @@
+import asyncio
+import io
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from mspy_vendi.domain.data_extractor import CSVDataExtractor, ExcelDataExtractor
+
+# Maximum delay of the event loop while the file is rendered, in seconds.
+MAX_LOOP_LAG: float = 0.2
+ROWS: int = 10_000
+
+
+def _generate_data_frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Sale ID": range(rows),
+            "Product sold": [f"Product {number % 500}" for number in range(rows)],
+            "Machine Name": [f"Machine {number % 200}" for number in range(rows)],
+            "Date": [date(2024, 1, 1) + timedelta(days=number % 365) for number in range(rows)],
+        }
+    )
+
+
+async def _measure_loop_lag(task: asyncio.Task, interval: float = 0.01) -> float:
+    max_lag: float = 0.0
+
+    while not task.done():
+        started: float = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - started - interval)
+
+    return max_lag
+
+
+async def _render(extractor: CSVDataExtractor | ExcelDataExtractor, data: pd.DataFrame) -> tuple[float, bytes]:
+    task: asyncio.Task = asyncio.create_task(extractor.extract(data))
+
+    max_lag: float = await _measure_loop_lag(task)
+
+    return max_lag, task.result().getvalue()
+
+
+def test_excel_rendering_does_not_block_event_loop():
+    data: pd.DataFrame = _generate_data_frame(ROWS)
+
+    max_lag, content = asyncio.run(_render(ExcelDataExtractor(), data))
+
+    assert max_lag < MAX_LOOP_LAG
+    assert pd.read_excel(io.BytesIO(content)).shape == data.shape
+
+
+def test_csv_rendering_does_not_block_event_loop():
+    data: pd.DataFrame = _generate_data_frame(ROWS)
+
+    max_lag, content = asyncio.run(_render(CSVDataExtractor(), data))
+
+    assert max_lag < MAX_LOOP_LAG
+    assert content == data.to_csv(index=False).encode()
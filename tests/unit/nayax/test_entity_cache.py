@@ -0,0 +1,121 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from mspy_vendi.core.cache import LocalCache
+from mspy_vendi.domain.nayax import cache as cache_module
+from mspy_vendi.domain.nayax.cache import NayaxEntityCache
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache: LocalCache[int, str] = LocalCache(max_size=2, ttl=60)
+
+    cache.set(1, "first")
+    cache.set(2, "second")
+    cache.get(1)
+    cache.set(3, "third")
+
+    assert cache.get(1) == "first"
+    assert cache.get(2) is None
+    assert cache.get(3) == "third"
+
+
+def test_local_cache_expires_values():
+    cache: LocalCache[int, str] = LocalCache(max_size=2, ttl=0)
+
+    cache.set(1, "first")
+
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_split_changed():
+    cache = NayaxEntityCache(max_size=10, ttl=60)
+    cache.products.set(1, {"id": 1, "name": "Water", "price": Decimal("1.50"), "updated_at": None})
+    cache.products.set(2, {"id": 2, "name": "Juice", "price": Decimal("2.00"), "updated_at": None})
+
+    cached_states, changed_rows = cache.split_changed(
+        cache.products,
+        {
+            1: {"id": 1, "name": "Water", "price": Decimal("1.5")},
+            2: {"id": 2, "name": "Juice", "price": Decimal("2.5")},
+            3: {"id": 3, "name": "Tea", "price": Decimal("1")},
+        },
+    )
+
+    assert list(cached_states) == [1]
+    assert list(changed_rows) == [2, 3]
+
+
+@pytest.mark.parametrize(("next_version", "is_cleared"), [("1", False), ("2", True), (None, True)])
+def test_refresh_clears_on_version_change(monkeypatch: pytest.MonkeyPatch, next_version: str | None, is_cleared: bool):
+    versions = iter(["1", next_version])
+
+    async def get_entity_version() -> str | None:
+        return next(versions)
+
+    monkeypatch.setattr(cache_module, "get_entity_version", get_entity_version)
+
+    cache = NayaxEntityCache(max_size=10, ttl=60)
+    asyncio.run(cache.refresh())
+    cache.machines.set(1, {"id": 1})
+    asyncio.run(cache.refresh())
+
+    assert (cache.machines.get(1) is None) == is_cleared
+
+
+class FakeEntityVersion:
+    """
+    Entity version shared by the consumer processes, stored in Redis in production.
+    """
+
+    def __init__(self):
+        self.version: int = 0
+
+    async def get(self) -> str | None:
+        return str(self.version)
+
+    async def bump(self) -> int | None:
+        self.version += 1
+        return self.version
+
+
+@pytest.fixture
+def entity_version(monkeypatch: pytest.MonkeyPatch) -> FakeEntityVersion:
+    entity_version = FakeEntityVersion()
+    monkeypatch.setattr(cache_module, "get_entity_version", entity_version.get)
+    monkeypatch.setattr(cache_module, "bump_entity_version", entity_version.bump)
+
+    return entity_version
+
+
+def test_publish_invalidates_other_processes(entity_version: FakeEntityVersion):
+    own_cache, other_cache = NayaxEntityCache(max_size=10, ttl=60), NayaxEntityCache(max_size=10, ttl=60)
+
+    for cache in (own_cache, other_cache):
+        asyncio.run(cache.refresh())
+        cache.machines.set(1, {"id": 1, "name": "Old name"})
+
+    # The machine is renamed by the own process, the other one mustn't keep the old name.
+    asyncio.run(own_cache.publish())
+    own_cache.machines.set(1, {"id": 1, "name": "New name"})
+
+    for cache in (own_cache, other_cache):
+        asyncio.run(cache.refresh())
+
+    assert own_cache.machines.get(1) == {"id": 1, "name": "New name"}
+    assert other_cache.machines.get(1) is None
+
+
+def test_publish_clears_after_concurrent_change(entity_version: FakeEntityVersion):
+    cache = NayaxEntityCache(max_size=10, ttl=60)
+    asyncio.run(cache.refresh())
+
+    # Another process has changed the entities between the refresh and the publish of this one.
+    asyncio.run(entity_version.bump())
+    asyncio.run(cache.publish())
+    cache.machines.set(1, {"id": 1, "name": "Stale name"})
+    asyncio.run(cache.refresh())
+
+    assert cache.machines.get(1) is None
@@ -0,0 +1,264 @@
+import asyncio
+import json
+from collections import defaultdict
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from mspy_vendi.domain.sqs.consumer import SQSConsumer
+
+QUEUE_NAME: str = "test-queue"
+MESSAGES: int = 25
+MAX_IN_FLIGHT: int = 4
+
+
+class RecordingConsumer(SQSConsumer):
+    """
+    Record the processed messages and the highest number of them processed at the same time.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.processed: list[str] = []
+        self.processing: int = 0
+        self.max_in_flight_seen: int = 0
+
+    async def process_message(self, message: dict) -> int:
+        self.processing += 1
+        self.max_in_flight_seen = max(self.max_in_flight_seen, self.processing)
+
+        await asyncio.sleep(0.05)
+
+        self.processing -= 1
+        self.processed.append(message["Body"])
+
+        if len(self.processed) == MESSAGES:
+            self.stop()
+
+        return 0
+
+
+def test_consume_concurrently(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sqs = boto3.client("sqs")
+        queue_url: str = sqs.create_queue(QueueName=QUEUE_NAME)["QueueUrl"]
+
+        for number in range(MESSAGES):
+            sqs.send_message(QueueUrl=queue_url, MessageBody=str(number))
+
+        # Processed messages are deleted without `sqs_auto_ack` as well.
+        consumer = RecordingConsumer(QUEUE_NAME, sqs_long_poll_time=0, max_in_flight=MAX_IN_FLIGHT)
+
+        asyncio.run(asyncio.wait_for(consumer.consume_concurrently(), timeout=30))
+
+        assert sorted(consumer.processed, key=int) == [str(number) for number in range(MESSAGES)]
+        assert 1 < consumer.max_in_flight_seen <= MAX_IN_FLIGHT
+        assert "Messages" not in sqs.receive_message(QueueUrl=queue_url, VisibilityTimeout=0)
+
+
+class RecordingBatchConsumer(RecordingConsumer):
+    """
+    Record the processed batches, the batches with the broken message fail and are processed one by one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.batches: list[list[str]] = []
+
+    async def process_batch(self, messages: list[dict]) -> int:
+        if any(message["Body"] == "broken" for message in messages):
+            raise ValueError("Broken message")
+
+        self.batches.append([message["Body"] for message in messages])
+        self.processed.extend(message["Body"] for message in messages)
+
+        if len(self.processed) == MESSAGES:
+            self.stop()
+
+        return 0
+
+    async def process_message(self, message: dict) -> int:
+        if message["Body"] == "broken":
+            raise ValueError("Broken message")
+
+        return await super().process_message(message)
+
+
+def test_consume_concurrently_in_batches(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sqs = boto3.client("sqs")
+        queue_url: str = sqs.create_queue(QueueName=QUEUE_NAME)["QueueUrl"]
+
+        for number in range(MESSAGES):
+            sqs.send_message(QueueUrl=queue_url, MessageBody=str(number))
+
+        sqs.send_message(QueueUrl=queue_url, MessageBody="broken")
+
+        consumer = RecordingBatchConsumer(
+            QUEUE_NAME, sqs_long_poll_time=0, sqs_auto_ack=True, max_in_flight=20, batch_mode=True
+        )
+
+        asyncio.run(asyncio.wait_for(consumer.consume_concurrently(), timeout=30))
+
+        assert sorted(consumer.processed, key=int) == [str(number) for number in range(MESSAGES)]
+        assert max(len(batch) for batch in consumer.batches) > 1
+        assert "Messages" not in sqs.receive_message(QueueUrl=queue_url, VisibilityTimeout=0)
+
+
+class SlowConsumer(RecordingConsumer):
+    async def process_message(self, message: dict) -> int:
+        await asyncio.sleep(2.5)
+
+        self.processed.append(message["Body"])
+        self.stop()
+
+        return 0
+
+
+def test_visibility_is_extended_while_processing(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sqs = boto3.client("sqs")
+        queue_url: str = sqs.create_queue(QueueName=QUEUE_NAME)["QueueUrl"]
+        sqs.send_message(QueueUrl=queue_url, MessageBody="slow")
+
+        # Without the heartbeat the message would be received again after 2 seconds.
+        consumer = SlowConsumer(QUEUE_NAME, sqs_long_poll_time=1, sqs_visibility_timeout=2, max_in_flight=2)
+
+        asyncio.run(asyncio.wait_for(consumer.consume_concurrently(), timeout=30))
+
+        assert consumer.processed == ["slow"]
+        assert "Messages" not in sqs.receive_message(QueueUrl=queue_url, VisibilityTimeout=0)
+
+
+class PoisonConsumer(SQSConsumer):
+    """
+    Fail on every message and record the quarantined ones instead of storing them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.attempts: int = 0
+        self.quarantined: list[tuple[str, int, str]] = []
+
+    async def process_message(self, message: dict) -> int:
+        self.attempts += 1
+
+        raise ValueError("Poison message")
+
+    async def quarantine(self, message: dict, error: str) -> None:
+        self.quarantined.append((message["Body"], self.get_receive_count(message), error))
+        self.stop()
+
+
+def test_failed_message_is_retried_and_quarantined(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sqs = boto3.client("sqs")
+        queue_url: str = sqs.create_queue(QueueName=QUEUE_NAME)["QueueUrl"]
+        sqs.send_message(QueueUrl=queue_url, MessageBody="poison")
+
+        consumer = PoisonConsumer(QUEUE_NAME, sqs_long_poll_time=1, max_attempts=3, retry_base_delay=1)
+
+        asyncio.run(asyncio.wait_for(consumer.consume_concurrently(), timeout=30))
+
+        [(body, receive_count, error)] = consumer.quarantined
+
+        assert consumer.attempts == 3
+        assert (body, receive_count) == ("poison", 3)
+        assert "ValueError: Poison message" in error
+        assert "Messages" not in sqs.receive_message(QueueUrl=queue_url, VisibilityTimeout=0)
+
+
+class PartitionedConsumer(RecordingConsumer):
+    """
+    Record the order the messages of every machine were received and processed in,
+    and the machines processed by several workers at the same time.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.received: dict[int, list[str]] = defaultdict(list)
+        self.processed_by_machine: dict[int, list[str]] = defaultdict(list)
+        self.machines_in_flight: set[int] = set()
+        self.overlapping_machines: set[int] = set()
+
+    def _receive(self, message: dict) -> None:
+        super()._receive(message)
+
+        self.received[json.loads(message["Body"])["MachineId"]].append(message["MessageId"])
+
+    async def process_message(self, message: dict) -> int:
+        machine_id: int = json.loads(message["Body"])["MachineId"]
+
+        if machine_id in self.machines_in_flight:
+            self.overlapping_machines.add(machine_id)
+
+        self.machines_in_flight.add(machine_id)
+        self.processed_by_machine[machine_id].append(message["MessageId"])
+
+        await super().process_message(message)
+
+        self.machines_in_flight.discard(machine_id)
+
+        return 0
+
+
+def test_consume_partitioned_by_machine(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sqs = boto3.client("sqs")
+        queue_url: str = sqs.create_queue(QueueName=QUEUE_NAME)["QueueUrl"]
+
+        for number in range(MESSAGES):
+            sqs.send_message(QueueUrl=queue_url, MessageBody=json.dumps({"MachineId": number % 5}))
+
+        consumer = PartitionedConsumer(QUEUE_NAME, sqs_long_poll_time=0, max_in_flight=12, workers=3)
+
+        asyncio.run(asyncio.wait_for(consumer.consume_concurrently(), timeout=30))
+
+        assert len(consumer.processed) == MESSAGES
+        assert consumer.processed_by_machine == consumer.received
+        assert not consumer.overlapping_machines
+        assert consumer.max_in_flight_seen > 1
+        assert "Messages" not in sqs.receive_message(QueueUrl=queue_url, VisibilityTimeout=0)
+
+
+def test_receive_errors_are_retried(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with mock_aws():
+        sqs = boto3.client("sqs")
+        queue_url: str = sqs.create_queue(QueueName=QUEUE_NAME)["QueueUrl"]
+
+        for number in range(MESSAGES):
+            sqs.send_message(QueueUrl=queue_url, MessageBody=str(number))
+
+        consumer = RecordingConsumer(QUEUE_NAME, sqs_long_poll_time=0, max_in_flight=MAX_IN_FLIGHT, retry_base_delay=0)
+        receive_message_batch = consumer.consumer.areceive_message_batch
+        receive_errors: list[int] = [1, 2]
+
+        async def areceive_message_batch(**kwargs) -> list[dict]:
+            if receive_errors:
+                receive_errors.pop()
+                raise ConnectionError("Network is unreachable")
+
+            return await receive_message_batch(**kwargs)
+
+        monkeypatch.setattr(consumer.consumer, "areceive_message_batch", areceive_message_batch)
+
+        asyncio.run(asyncio.wait_for(consumer.consume_concurrently(), timeout=30))
+
+        assert sorted(consumer.processed, key=int) == [str(number) for number in range(MESSAGES)]
@@ -0,0 +1,13 @@
+import pytest
+from pydantic import ValidationError
+
+from mspy_vendi.config import SQSSettings
+
+
+def test_max_in_flight_defaults_to_workers():
+    assert SQSSettings(workers=4).max_in_flight == 4
+
+
+def test_max_in_flight_less_than_workers_is_rejected():
+    with pytest.raises(ValidationError):
+        SQSSettings(workers=4, max_in_flight=2)